@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    프로세스 메모리 TTL 캐시
+    - 만료된 항목은 조회 시 제거
+    - maxsize 초과 시 가장 먼저 들어온 항목부터 제거
+    """
+    def __init__(self, ttl: float, maxsize: int = 10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = {}  # key -> (만료 시각(monotonic), 값)
+
+    def get(self, key, default=None):
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            return default
+        return value
+
+    def set(self, key, value, ttl: float | None = None):
+        if key in self._data:
+            del self._data[key]
+        elif len(self._data) >= self.maxsize:
+            self._data.pop(next(iter(self._data)))
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def clear(self):
+        self._data.clear()
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        return len(self._data)
+
+class SWRCache:
+    """
+    stale-while-revalidate 캐시
+    - fresh_ttl 이내: 캐시 값 그대로 반환
+    - stale_ttl 이내: 캐시 값을 바로 반환하고 백그라운드에서 갱신
+    - 없거나 stale_ttl 초과: 조회가 끝날 때까지 대기
+    같은 키의 조회는 동시에 한 번만 수행하며, loader 가 None 을 반환하면 저장하지 않습니다.
+    """
+    def __init__(self, fresh_ttl: float, stale_ttl: float, maxsize: int = 10000):
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self._data = {}      # key -> (조회 시각(monotonic), 값)
+        self._inflight = {}  # key -> asyncio.Task
+
+    async def get(self, key, loader, fresh_ttl: float | None = None):
+        entry = self._data.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < (self.fresh_ttl if fresh_ttl is None else fresh_ttl):
+                return entry[1]
+            if age < self.stale_ttl:
+                self._revalidate(key, loader)
+                return entry[1]
+        # 요청이 취소되어도 진행 중인 조회는 다른 대기자를 위해 계속 수행
+        return await asyncio.shield(self._revalidate(key, loader))
+
+    def set(self, key, value):
+        if key in self._data:
+            del self._data[key]
+        elif len(self._data) >= self.maxsize:
+            self._data.pop(next(iter(self._data)))
+        self._data[key] = (time.monotonic(), value)
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def _revalidate(self, key, loader):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, loader))
+            self._inflight[key] = task
+        return task
+
+    async def _load(self, key, loader):
+        try:
+            value = await loader()
+        except Exception as e:
+            logger.error(f"⛔ 캐시 갱신 실패 [{key}]: {e}")
+            value = None
+        finally:
+            self._inflight.pop(key, None)
+
+        if value is None:
+            entry = self._data.get(key)
+            return entry[1] if entry is not None else None
+        self.set(key, value)
+        return value
+
+    def __len__(self):
+        return len(self._data)
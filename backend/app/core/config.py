@@ -28,6 +28,92 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
 
+    # 인증 사용자 상태(is_active) 캐시 유지 시간 (초)
+    USER_STATUS_CACHE_TTL: int = 30
+    # 회원가입 중복 확인 "사용 가능" 결과 캐시 유지 시간 (초)
+    AVAILABILITY_CACHE_TTL: float = 10.0
+
+    # 비밀번호 해싱 (bcrypt work factor, 전용 스레드 수, 대기열 한도)
+    BCRYPT_ROUNDS: int = 12
+    HASH_WORKERS: int = 4
+    HASH_QUEUE_LIMIT: int = 64
+
+    # KIS 시세 조회 (현재가 캐시 유지 시간(초), 초당 호출 한도)
+    QUOTE_CACHE_TTL: float = 3.0
+    KIS_RATE_LIMIT_PER_SEC: float = 15.0
+    # 호출 제한(EGW00201) 응답 재시도 횟수 / 대기 간격 (초, 재시도마다 배수)
+    KIS_THROTTLE_RETRIES: int = 2
+    KIS_THROTTLE_BACKOFF: float = 0.2
+
+    # 실시간 체결 지연 추적 (표본 비율, 전송 데이터에 수신 시각 "ts"(epoch ms) 포함 여부, /debug 엔드포인트 노출 여부)
+    TICK_TRACE_SAMPLE_RATE: float = 0.1
+    TICK_TRACE_TIMESTAMPS: bool = False
+    DEBUG_ENDPOINTS: bool = False
+
+    # 요청 단위 프로파일링 (토큰이 비어 있으면 비활성, 샘플 간격(초), 보관 개수, collapsed stack 저장 경로)
+    PROFILING_TOKEN: str = ""
+    PROFILE_SAMPLE_INTERVAL: float = 0.005
+    PROFILE_KEEP: int = 20
+    PROFILE_DIR: str = ""
+
+    # KIS 실시간 원본 프레임 기록 경로 (빈 값이면 기록 안 함, strftime 형식 / .gz 지원 예: ticks/%Y%m%d.tsv.gz, .gz 는 재시작마다 -1, -2 ... 새 파일)
+    TICK_CAPTURE_PATH: str = ""
+
+    # 순위 스냅샷 갱신 주기 (초, REST/WebSocket 공통)
+    RANKING_REFRESH_SECONDS: float = 2.0
+    # 랭킹 소켓 delta 프로토콜: 이 횟수만큼 delta 를 보낸 뒤에는 전체 스냅샷 전송
+    RANKING_DELTA_FULL_EVERY: int = 30
+    # 장외 시간 순위 갱신 주기 (초, 프리/애프터마켓 / 휴장)
+    RANKING_EXTENDED_REFRESH_SECONDS: float = 10.0
+    RANKING_CLOSED_REFRESH_SECONDS: float = 60.0
+
+    # USD/KRW 환율 (소스: open_er_api | file | static, 갱신 주기(초), 마지막 값 저장 파일)
+    FX_SOURCE: str = "open_er_api"
+    FX_API_URL: str = "https://open.er-api.com/v6/latest/USD"
+    FX_FILE_PATH: str = "fx_source.json"
+    FX_DEFAULT_RATE: float = 1460.0
+    FX_REFRESH_SECONDS: int = 3600
+    FX_CACHE_PATH: str = "fx_rate.json"
+
+    # 시장 달력 추가 휴장일 (YYYYMMDD, 쉼표 구분)
+    MARKET_EXTRA_HOLIDAYS_KRX: str = ""
+    MARKET_EXTRA_HOLIDAYS_US: str = ""
+
+    # 장 종료 후 캐시 최대 유지 시간 (초, 다음 세션 시작 시 만료)
+    QUOTE_CACHE_IDLE_TTL: float = 300.0
+    # 차트 캐시 (정규장 중 유지 시간, 장외 최대 유지 시간)
+    CHART_CACHE_TTL: float = 10.0
+    CHART_CACHE_IDLE_TTL: float = 21600.0
+
+    # 종목 상세 캐시 (기본 정보 유지 시간 / 만료 후 이전 값 허용 시간, 가격 이전 값 허용 시간) (초)
+    DETAIL_CACHE_TTL: float = 600.0
+    DETAIL_CACHE_STALE_TTL: float = 86400.0
+    DETAIL_PRICE_STALE_TTL: float = 60.0
+
+    # 만료/폐기된 Refresh Token 정리 주기 (초, 0 이면 정리 안 함), 한 번에 삭제할 행 수
+    REFRESH_TOKEN_PURGE_SECONDS: int = 3600
+    REFRESH_TOKEN_PURGE_BATCH: int = 1000
+
+    # DB 커넥션 풀 (워커당 상시 연결 수, 추가 허용 수, checkout 대기 한도(초), 연결 재생성 주기(초), 사용 전 확인)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg 연결별 prepared statement 캐시 크기 (PgBouncer transaction 모드면 0)
+    DB_STATEMENT_CACHE_SIZE: int = 500
+    # 앱 시작 시 테이블 생성/보강 여부 (기본: python -m app.migrate 로 별도 실행, SQLite 는 항상 실행)
+    DB_MIGRATE_ON_STARTUP: bool = False
+
+    # 소셜 로그인 제공자 주소 (로컬 스텁 서버로 바꿔 테스트 가능)
+    KAKAO_AUTH_BASE_URL: str = "https://kauth.kakao.com"
+    KAKAO_API_BASE_URL: str = "https://kapi.kakao.com"
+    GOOGLE_DISCOVERY_URL: str = "https://accounts.google.com/.well-known/openid-configuration"
+    # 소셜 로그인 HTTP 클라이언트 (요청 제한 시간(초), 제공자별 최대 연결 수), discovery/JWKS 캐시 유지 시간 (초)
+    OAUTH_HTTP_TIMEOUT: float = 10.0
+    OAUTH_MAX_CONNECTIONS: int = 50
+    OAUTH_METADATA_TTL: float = 3600.0
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names, values, extra=None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}  # 라벨 값 튜플 -> 값
+
+    def _key(self, labels: dict):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in list(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    """set()/inc() 로 갱신하거나, collect 함수를 주면 출력 시점에 값을 계산"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames=(), collect=None):
+        super().__init__(name, help, labelnames)
+        self._collect = collect
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self):
+        if self._collect is not None:
+            try:
+                collected = self._collect()
+            except Exception as e:
+                logger.error(f"⛔ 메트릭 수집 실패 [{self.name}]: {e}")
+                collected = {}
+            # collect() 는 숫자 또는 {라벨 값 튜플: 숫자} 반환
+            self._values = collected if isinstance(collected, dict) else {(): collected}
+        return super().render()
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            # [버킷별 개수..., +Inf 개수], 합계
+            state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, (counts, total) in list(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', bound))} {cumulative}")
+            cumulative += counts[-1]
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', '+Inf'))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+class Registry:
+    """Prometheus 텍스트 포맷(0.0.4) 메트릭 저장소"""
+    def __init__(self):
+        self._metrics = {}
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            return self._metrics[metric.name]
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames=()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames=(), collect=None) -> Gauge:
+        return self._register(Gauge(name, help, labelnames, collect))
+
+    def histogram(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+# ---------------------------------------------------------------------
+# 이벤트 루프 지연 (blocking 작업 탐지)
+# ---------------------------------------------------------------------
+LOOP_LAG_INTERVAL = 0.5  # 측정 주기 (초)
+
+loop_lag_seconds = registry.histogram(
+    "event_loop_lag_seconds", "Delay between scheduled and actual event loop wakeups",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+)
+loop_lag_max_seconds = registry.gauge(
+    "event_loop_lag_max_seconds", "Largest event loop lag observed in the last monitor window"
+)
+
+class LoopLagMonitor:
+    """LOOP_LAG_INTERVAL 마다 깨어나 예정 시각 대비 지연을 기록"""
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL, window: int = 20):
+        self.interval = interval
+        self.window = window  # 최대값을 유지할 측정 횟수
+        self._task = None
+
+    def start(self):
+        if not self._task or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        recent = []
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - expected, 0.0)
+            loop_lag_seconds.observe(lag)
+
+            recent.append(lag)
+            if len(recent) > self.window:
+                recent.pop(0)
+            loop_lag_max_seconds.set(max(recent))
+
+loop_lag_monitor = LoopLagMonitor()
@@ -0,0 +1,245 @@
+import asyncio
+import hmac
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextvars import ContextVar
+from urllib.parse import parse_qs
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile-token"
+PROFILE_QUERY = "profile_token"
+
+# backend 디렉터리 (스택 프레임 경로 축약용)
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+
+_active_profile: ContextVar["RequestProfile | None"] = ContextVar("active_profile", default=None)
+
+# upstream 호출 함수의 code 객체 (이 프레임 아래 샘플은 CPU 가 아닌 upstream 으로 분류)
+_upstream_codes = set()
+
+def upstream_boundary(func):
+    """upstream 호출 경계 함수 표시 (httpx 처리 시간을 upstream 에 포함)"""
+    _upstream_codes.add(func.__code__)
+    return func
+
+def _short_path(path: str) -> str:
+    if path.startswith(_ROOT):
+        return os.path.relpath(path, _ROOT)
+    _, sep, tail = path.rpartition("site-packages" + os.sep)
+    return tail if sep else os.path.basename(path)
+
+def _collapse(frame):
+    """프레임 -> ("바깥;...;안쪽", upstream 호출 중 여부) (이벤트 루프 내부 프레임은 제외)"""
+    codes = []
+    while frame is not None:
+        codes.append(frame.f_code)
+        frame = frame.f_back
+    codes.reverse()
+    while codes and codes[0].co_filename.startswith(_ASYNCIO_DIR):
+        codes.pop(0)
+    stack = ";".join(f"{c.co_name} ({_short_path(c.co_filename)}:{c.co_firstlineno})" for c in codes)
+    return stack, any(c in _upstream_codes for c in codes)
+
+def _union_seconds(intervals) -> float:
+    """겹치는 구간을 합친 총 길이 (동시 호출은 한 번만 계산)"""
+    total, end = 0.0, None
+    for start, stop in sorted(intervals):
+        if end is None or start > end:
+            total += stop - start
+            end = stop
+        elif stop > end:
+            total += stop - end
+            end = stop
+    return total
+
+class RequestProfile:
+    """요청 1건의 샘플(스택별 횟수)과 upstream 대기 구간"""
+    def __init__(self, method: str, path: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.wall = 0.0
+        self.stacks = Counter()
+        self.cpu = 0.0           # 샘플 간격으로 추정한 이벤트 루프 점유 시간 (upstream 호출 중 제외)
+        self.upstream = []       # [(시작, 종료)] perf_counter
+        self.upstream_calls = 0
+
+    def add_sample(self, stack: str, elapsed: float, in_upstream: bool = False):
+        self.stacks[stack] += 1
+        if not in_upstream:
+            self.cpu += elapsed
+
+    def add_upstream(self, start: float, stop: float):
+        self.upstream.append((start, stop))
+        self.upstream_calls += 1
+
+    def finish(self):
+        if not self.wall:
+            self.wall = time.perf_counter() - self._start
+
+    def breakdown(self) -> dict:
+        upstream = _union_seconds(self.upstream)
+        return {
+            "total_ms": round(self.wall * 1000, 3),
+            "cpu_ms": round(self.cpu * 1000, 3),
+            "upstream_ms": round(upstream * 1000, 3),
+            "upstream_calls": self.upstream_calls,
+            "other_wait_ms": round(max(self.wall - self.cpu - upstream, 0.0) * 1000, 3),
+            "samples": sum(self.stacks.values()),
+        }
+
+    def summary(self) -> dict:
+        return {"id": self.id, "method": self.method, "path": self.path,
+                "started_at": self.started_at, **self.breakdown()}
+
+    def collapsed(self) -> str:
+        """flamegraph.pl / speedscope 에서 읽는 collapsed stack 형식"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def server_timing(self) -> str:
+        b = self.breakdown()
+        return (f'cpu;dur={b["cpu_ms"]}, upstream;dur={b["upstream_ms"]};desc="KIS x{b["upstream_calls"]}", '
+                f'other;dur={b["other_wait_ms"]}, total;dur={b["total_ms"]}')
+
+class SamplingProfiler:
+    """
+    이벤트 루프 스레드의 스택을 주기적으로 샘플링하는 별도 스레드
+    - 실행 중인 asyncio Task 의 context 에 등록된 프로파일에만 샘플을 기록
+      (같은 루프의 다른 요청은 제외, 요청이 만든 하위 Task 는 context 를 물려받아 포함)
+    - 프로파일 중인 요청이 있을 때만 동작
+    - GIL 전환 주기(기본 5ms)보다 짧은 간격은 의미가 없으므로 기본 간격은 5ms
+    """
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._active = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._loop = None
+        self._thread_id = None
+
+    def start(self, profile: RequestProfile):
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._thread_id = threading.get_ident()
+            self._active.add(profile)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+
+    def stop(self, profile: RequestProfile):
+        with self._lock:
+            self._active.discard(profile)
+
+    def _run(self):
+        last = time.perf_counter()
+        while True:
+            time.sleep(self.interval)
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                active = set(self._active)
+            try:
+                self._sample(active, elapsed)
+            except Exception as e:
+                logger.error(f"⛔ 프로파일 샘플링 실패: {e}")
+
+    def _sample(self, active, elapsed):
+        task = asyncio.current_task(self._loop)
+        if task is None:
+            return  # 루프가 I/O 대기 중
+        profile = task.get_context().get(_active_profile)
+        if profile not in active:
+            return
+        frame = sys._current_frames().get(self._thread_id)
+        if frame is not None:
+            stack, in_upstream = _collapse(frame)
+            profile.add_sample(stack, elapsed, in_upstream)
+
+sampling_profiler = SamplingProfiler(settings.PROFILE_SAMPLE_INTERVAL)
+
+# 최근 프로파일 (메모리 보관, PROFILE_DIR 가 있으면 파일로도 저장)
+recent_profiles: deque[RequestProfile] = deque(maxlen=settings.PROFILE_KEEP)
+
+def find_profile(profile_id: str) -> RequestProfile | None:
+    return next((p for p in recent_profiles if p.id == profile_id), None)
+
+def record_upstream(start: float, stop: float):
+    """upstream(KIS) 호출 구간 기록 (프로파일 중인 요청에서만)"""
+    profile = _active_profile.get()
+    if profile is not None:
+        profile.add_upstream(start, stop)
+
+def is_authorized(token: str | None) -> bool:
+    return bool(settings.PROFILING_TOKEN) and bool(token) and hmac.compare_digest(token, settings.PROFILING_TOKEN)
+
+def _store(profile: RequestProfile):
+    recent_profiles.append(profile)
+    if settings.PROFILE_DIR:
+        try:
+            os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+            with open(os.path.join(settings.PROFILE_DIR, f"{profile.id}.collapsed"), "w", encoding="utf-8") as f:
+                f.write(profile.collapsed())
+        except OSError as e:
+            logger.error(f"⛔ 프로파일 저장 실패 [{profile.id}]: {e}")
+    logger.info(f"🔬 요청 프로파일 [{profile.id}] {profile.method} {profile.path} {profile.breakdown()}")
+
+class ProfilingMiddleware:
+    """
+    요청 단위 프로파일링 (PROFILING_TOKEN 설정 시에만 동작)
+    - X-Profile-Token 헤더 또는 ?profile_token= 쿼리가 일치하는 요청만 샘플링
+    - 응답 헤더: X-Profile-Id, Server-Timing (cpu / upstream / other / total)
+    - collapsed stack 은 GET /debug/profiles/{id} 로 조회 (PROFILE_DIR 지정 시 파일로도 저장)
+    """
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def _token(scope) -> str | None:
+        for key, value in scope.get("headers", []):
+            if key == PROFILE_HEADER.encode():
+                return value.decode("latin-1")
+        values = parse_qs(scope.get("query_string", b"").decode("latin-1")).get(PROFILE_QUERY)
+        return values[0] if values else None
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or not settings.PROFILING_TOKEN
+                or scope["path"].startswith("/debug/profiles") or not is_authorized(self._token(scope))):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"])
+        context_token = _active_profile.set(profile)
+        sampling_profiler.start(profile)
+
+        async def send_with_profile(message):
+            if message["type"] == "http.response.start":
+                # 응답 헤더 시점까지를 요청 처리 시간으로 봄
+                sampling_profiler.stop(profile)
+                profile.finish()
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile.id.encode()))
+                headers.append((b"server-timing", profile.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            sampling_profiler.stop(profile)
+            profile.finish()
+            _active_profile.reset(context_token)
+            _store(profile)
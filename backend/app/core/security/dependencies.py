@@ -1,15 +1,51 @@
+import uuid
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
 
-from app.database import get_db
+from app.database import get_db, release_connection
 from app.models.user import User
 from app.services.user_services import user_service
 from app.core.security.token import verify_access_token
+from app.core.security.user_status import user_status_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+async def get_current_user_id(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> uuid.UUID:
+    """
+    Access Token을 검증하고 현재 사용자 ID만 반환하는 의존성 (빠른 경로)
+    - 토큰 서명/만료 검증 + 사용자 활성 상태 캐시로 대부분 DB 조회 없이 응답
+    - 사용자 전체 정보가 필요한 엔드포인트는 get_current_user 사용
+    """
+    token_data = verify_access_token(token)
+    if token_data is None or token_data.user_id is None:
+        raise _credentials_exception()
+
+    is_active = user_status_cache.get(token_data.user_id)
+    if is_active is None:
+        is_active = await user_service.get_user_active_status(db, user_id=token_data.user_id)
+        # 라우트가 DB 를 쓰지 않거나 외부 API 를 먼저 기다리는 동안 커넥션을 잡고 있지 않도록 반납
+        await release_connection(db)
+        if is_active is None:
+            raise _credentials_exception()
+        user_status_cache.set(token_data.user_id, is_active)
+
+    if not is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+
+    return token_data.user_id
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme), 
     db: AsyncSession = Depends(get_db)
@@ -17,11 +53,7 @@ async def get_current_user(
     """
     Access Token을 검증하고 현재 사용자를 반환하는 의존성
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    credentials_exception = _credentials_exception()
     
     token_data = verify_access_token(token)
     if token_data is None or token_data.user_id is None:
@@ -30,6 +62,8 @@ async def get_current_user(
     user = await user_service.get_user_by_id(db, user_id=token_data.user_id)
     if user is None:
         raise credentials_exception
+
+    user_status_cache.set(user.user_id, user.is_active)
     
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -1,9 +1,42 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import settings
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+# bcrypt 는 C 확장에서 GIL을 풀고 계산하므로 스레드 풀로 이벤트 루프 밖에서 실행
+_hash_executor = ThreadPoolExecutor(max_workers=settings.HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_in_flight = 0
+
+class HashingBusyError(Exception):
+    """해싱 대기열이 가득 찬 경우 (호출 측에서 503으로 응답)"""
+    pass
 
 def hash_password(password: str):
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+async def _run_in_pool(func, *args):
+    global _hash_in_flight
+    # 실행 중 + 대기 중 작업 수 제한 (로그인 폭주 시 메모리/지연이 무한히 늘지 않도록)
+    if _hash_in_flight >= settings.HASH_WORKERS + settings.HASH_QUEUE_LIMIT:
+        raise HashingBusyError("비밀번호 처리 요청이 많습니다. 잠시 후 다시 시도해주세요.")
+
+    _hash_in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_in_flight -= 1
+
+async def hash_password_async(password: str) -> str:
+    """이벤트 루프를 막지 않는 비밀번호 해싱"""
+    return await _run_in_pool(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """이벤트 루프를 막지 않는 비밀번호 검증"""
+    return await _run_in_pool(verify_password, plain_password, hashed_password)
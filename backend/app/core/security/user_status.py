@@ -0,0 +1,7 @@
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# user_id -> is_active
+# 인증 의존성(get_current_user_id)이 매 요청 DB를 조회하지 않도록 짧게 캐싱합니다.
+# 정보 수정/탈퇴 시 user_services 에서 즉시 무효화합니다.
+user_status_cache = TTLCache(ttl=settings.USER_STATUS_CACHE_TTL)
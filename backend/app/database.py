@@ -1,14 +1,71 @@
 import logging
+import time
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from typing import AsyncGenerator
 
 from app.core.config import settings
+from app.core.metrics import registry
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+# ---------------------------------------------------------------------
+# 커넥션 풀 (대기 시간 / 타임아웃 메트릭)
+# ---------------------------------------------------------------------
+db_pool_wait_seconds = registry.histogram(
+    "db_pool_wait_seconds", "Time to check out a connection from the DB pool (including new connects)",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+)
+db_pool_timeouts_total = registry.counter(
+    "db_pool_timeouts_total", "DB pool checkouts that gave up after DB_POOL_TIMEOUT"
+)
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """checkout 대기 시간을 db_pool_wait_seconds 에 기록하는 풀"""
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            db_pool_timeouts_total.inc()
+            raise
+        finally:
+            db_pool_wait_seconds.observe(time.perf_counter() - start)
+
+def _engine_options(url: str) -> dict:
+    """DB 종류별 엔진 옵션 (SQLite 로컬 벤치마크는 기본 풀 사용)"""
+    if url.startswith("sqlite"):
+        return {}
+    options = {
+        "poolclass": MeteredQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if "+asyncpg" in url:
+        # 연결별 prepared statement 캐시 (PgBouncer transaction 모드에서는 0)
+        options["connect_args"] = {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return options
+
+engine = create_async_engine(settings.DATABASE_URL, echo=False, **_engine_options(settings.DATABASE_URL))
+
+def _pool_status() -> dict:
+    pool = engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return {}
+    return {("checked_out",): pool.checkedout(), ("idle",): pool.checkedin(), ("overflow",): max(pool.overflow(), 0)}
+
+db_pool_connections = registry.gauge(
+    "db_pool_connections", "DB pool connections by state", ("state",), collect=_pool_status
+)
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
@@ -18,14 +75,61 @@ AsyncSessionLocal = sessionmaker(
 
 Base = declarative_base()
 
+# 기존 테이블 보강 (create_all 은 이미 있는 테이블을 변경하지 않음 / PostgreSQL, 여러 번 실행해도 안전)
+SCHEMA_UPGRADES = [
+    # 관심 종목 표시 순서
+    "ALTER TABLE user_stocks ADD COLUMN IF NOT EXISTS position INTEGER NOT NULL DEFAULT 0",
+    # 관심 종목 중복 제거 (가장 먼저 추가한 행 유지) 후 (user_id, stock_code) 유니크 인덱스
+    """
+    DELETE FROM user_stocks a USING user_stocks b
+    WHERE a.user_id = b.user_id AND a.stock_code = b.stock_code
+      AND (a.created_at, a.id::text) > (b.created_at, b.id::text)
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_user_stocks_user_code ON user_stocks (user_id, stock_code)",
+    # 유효 Refresh Token 부분 인덱스
+    "CREATE INDEX IF NOT EXISTS ix_refresh_tokens_live ON refresh_tokens (user_id, expires_at) WHERE is_revoked = false",
+]
+
+# 스키마 변경 직렬화용 advisory lock 키 (여러 워커/배포 작업이 동시에 실행해도 한 번씩 순서대로)
+MIGRATION_LOCK_KEY = 7_394_021
+
+async def migrate():
+    """테이블 생성 + SCHEMA_UPGRADES 적용 (python -m app.migrate, 실패 시 예외)"""
+    async with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        await conn.run_sync(Base.metadata.create_all)
+        if conn.dialect.name == "postgresql":
+            for statement in SCHEMA_UPGRADES:
+                await conn.execute(text(statement))
+
 async def init_db():
+    """앱 시작 시 스키마 생성 (DB_MIGRATE_ON_STARTUP 또는 SQLite 로컬 실행일 때만 lifespan 에서 호출)"""
     try:
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+        await migrate()
         logger.info("✅ 데이터베이스 테이블이 성공적으로 생성되었습니다.")
     except Exception as e:
         logger.error(f"⛔ 데이터베이스 테이블을 생성하는 중 오류가 발생했습니다: {e}")
 
+def upsert_insert(db: AsyncSession, model):
+    """ON CONFLICT 절을 쓸 수 있는 INSERT (PostgreSQL / 로컬 벤치마크용 SQLite)"""
+    if db.bind.dialect.name == "sqlite":
+        return sqlite_insert(model)
+    return pg_insert(model)
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    요청 단위 세션
+    - 커넥션은 첫 쿼리 시점에 풀에서 가져옴 (DB 를 쓰지 않는 요청은 커넥션을 잡지 않음)
+    - DB 작업 후 외부 API 를 기다리는 경로는 release_connection 으로 먼저 반납
+    """
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+async def release_connection(db: AsyncSession):
+    """
+    세션이 잡고 있는 커넥션을 풀에 반납 (읽기 전용 트랜잭션 종료)
+    이미 읽은 객체는 detached 상태로 그대로 사용할 수 있고, 세션은 다음 쿼리 때 커넥션을 다시 가져옴
+    """
+    if db.in_transaction() and not (db.new or db.dirty or db.deleted):
+        await db.close()
\ No newline at end of file
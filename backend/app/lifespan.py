@@ -2,8 +2,14 @@ import logging
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 
+from app.core.config import settings
 from app.database import init_db, engine
 from app.services.kis_auth import kis_auth
+from app.services.fx import fx_service
+from app.core.metrics import loop_lag_monitor
+from app.services.tick_capture import tick_recorder
+from app.services.token_purge import refresh_token_purger
+from app.services.oauth import close_oauth_clients
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -12,9 +18,10 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     # ----- 앱 시작 -----
     logger.info("🚀 FastAPI 앱이 시작됩니다...")
-    logger.info("✅ 데이터베이스 연결 및 테이블 생성을 시도합니다.")
-
-    await init_db()
+    # 스키마 생성은 배포 단계(python -m app.migrate)에서 실행 (워커마다 create_all 경합 방지)
+    if settings.DB_MIGRATE_ON_STARTUP or engine.dialect.name == "sqlite":
+        logger.info("✅ 데이터베이스 연결 및 테이블 생성을 시도합니다.")
+        await init_db()
 
     try:
         logger.info("🔑 KIS Access Token 발급/갱신을 시도합니다...")
@@ -29,9 +36,24 @@ async def lifespan(app: FastAPI):
         # DB 저장 오류를 포함한 모든 KIS 인증 오류를 여기서 잡습니다.
         logger.error(f"⛔ 앱 시작 중 KIS 토큰 발급/저장 실패: {e}", exc_info=True)
 
+    # 만료 전 선제 갱신 (요청 경로에서 토큰 발급 대기가 생기지 않도록)
+    kis_auth.start_background_refresh()
+    # 환율 주기 갱신 (저장된 마지막 값으로 바로 시작)
+    fx_service.start_background_refresh()
+    # 이벤트 루프 지연 측정 (/metrics)
+    loop_lag_monitor.start()
+    # 만료/폐기된 Refresh Token 주기 삭제
+    refresh_token_purger.start()
+
     yield
     # ----- 앱 종료 -----
     logger.info("⏳ FastAPI 앱이 종료됩니다...")
+    await kis_auth.stop_background_refresh()
+    await fx_service.stop_background_refresh()
+    await loop_lag_monitor.stop()
+    await refresh_token_purger.stop()
+    await close_oauth_clients()
+    tick_recorder.close()
     if engine:
         logger.info("✅ 데이터베이스 엔진 연결을 종료합니다.")
         await engine.dispose()
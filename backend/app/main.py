@@ -2,7 +2,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.lifespan import lifespan
-from app.routers import ws_router, users, stock 
+from app.core.profiling import ProfilingMiddleware
+from app.routers import ws_router, users, stock, metrics
 from app.routers.auth import user_general, user_social, token
 
 app = FastAPI(lifespan=lifespan)
@@ -14,6 +15,8 @@ app.add_middleware(
     allow_methods=["*"], # 교차-출처 요청을 허용하는 HTTP 메소드의 리스트
     allow_headers=["*"], # 교차-출처를 지원하는 HTTP 요청 헤더의 리스트
 )
+# 요청 단위 프로파일링 (PROFILING_TOKEN 설정 + X-Profile-Token 헤더가 있는 요청만)
+app.add_middleware(ProfilingMiddleware)
 
 # 라우터 연결
 app.include_router(user_general.router)
@@ -22,6 +25,7 @@ app.include_router(token.router)
 app.include_router(ws_router.router)
 app.include_router(users.router)
 app.include_router(stock.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,32 @@
+"""
+DB 스키마 생성/보강 (배포 시 앱 실행 전에 1회)
+
+테이블 생성(create_all)과 기존 테이블 보강(SCHEMA_UPGRADES)을 적용합니다.
+PostgreSQL advisory lock 으로 직렬화하므로 여러 곳에서 동시에 실행해도 안전합니다.
+
+사용법 (backend 디렉터리에서):
+    python -m app.migrate
+"""
+import asyncio
+import logging
+import sys
+
+from app.database import migrate, engine
+# create_all 대상 모델 등록
+from app.models import user, social_account, refresh_token, user_stock, kis_token  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+async def main() -> int:
+    try:
+        await migrate()
+        logger.info("✅ 데이터베이스 스키마 적용 완료")
+        return 0
+    except Exception as e:
+        logger.error(f"⛔ 데이터베이스 스키마 적용 실패: {e}", exc_info=True)
+        return 1
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
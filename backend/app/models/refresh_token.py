@@ -1,5 +1,5 @@
 from uuid import uuid4
-from sqlalchemy import Column, String, DateTime, func, Boolean, ForeignKey
+from sqlalchemy import Column, String, DateTime, func, Boolean, ForeignKey, Index, false
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -20,4 +20,14 @@ class RefreshToken(Base):
     
     is_revoked = Column(Boolean, default=False, nullable=False)
 
+    __table_args__ = (
+        # 유효(폐기 안 된) 토큰만 담는 부분 인덱스 (사용자별 일괄 폐기, 폐기/만료 행이 쌓여도 크기 유지)
+        Index(
+            "ix_refresh_tokens_live",
+            "user_id", "expires_at",
+            postgresql_where=is_revoked == false(),
+            sqlite_where=is_revoked == false(),
+        ),
+    )
+
     user = relationship("User", back_populates="refresh_tokens")
\ No newline at end of file
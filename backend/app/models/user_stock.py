@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, String, ForeignKey, DateTime, Integer, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from uuid import uuid4
@@ -7,12 +7,17 @@ from app.database import Base
 class UserStock(Base):
     """사용자 관심 종목"""
     __tablename__ = "user_stocks"
+    __table_args__ = (
+        # 사용자별 종목 중복 방지 + (user_id, stock_code) 조회/ON CONFLICT 대상
+        Index("uq_user_stocks_user_code", "user_id", "stock_code", unique=True),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
     stock_code = Column(String(20), nullable=False)
     stock_name = Column(String(100), nullable=True) # 편의상 이름도 저장
     market_type = Column(String(20), default="DOMESTIC") # DOMESTIC or OVERSEAS
+    position = Column(Integer, nullable=False, default=0, server_default="0") # 관심 목록 표시 순서
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="interest_stocks")
\ No newline at end of file
@@ -24,24 +24,17 @@ async def refresh_access_token(
         )
 
     try:
-        user = await user_service.get_user_by_refresh_token(db, refresh_token)
+        # 기존 토큰 폐기 + 새 Refresh Token 저장 (한 트랜잭션)
+        app_refresh_token = create_refresh_token()
+        user_id = await user_service.rotate_refresh_token(db, refresh_token, app_refresh_token)
 
-        if not user:
+        if not user_id:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="유효하지 않거나 만료된 Refresh token입니다."
             )
 
-        # 새 토큰 생성
-        app_access_token = create_access_token(user_id=user.user_id)
-        app_refresh_token = create_refresh_token()
-
-        # 새 Refresh Token을 DB에 저장
-        await user_service.save_refresh_token(
-            db=db,
-            user_id=user.user_id,
-            token=app_refresh_token,
-        )
+        app_access_token = create_access_token(user_id=user_id)
 
         response_content = {
             "access_token": app_access_token,
@@ -61,6 +54,8 @@ async def refresh_access_token(
         )
         return response
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"⛔ 토큰 재발급 중 예외 발생: {e}", exc_info=True)
         raise HTTPException(
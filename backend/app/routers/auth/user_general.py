@@ -8,9 +8,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.schemas.user import UserCreate, UserPublic, CheckAvailabilityRequest, PhoneVerificationRequest
 from app.schemas.token import AccessTokenResponse
-from app.services.user_services import user_service
+from app.services.user_services import user_service, DuplicateUserError
 from app.core.security.token import create_access_token, create_refresh_token
-from app.core.security.hashing import verify_password
+from app.core.security.hashing import verify_password_async, HashingBusyError
 
 logger = logging.getLogger(__name__)
 
@@ -77,20 +77,8 @@ async def register_user(
     db: AsyncSession = Depends(get_db)
 ):
     """
-    일반 회원가입
+    일반 회원가입 (중복 확인은 INSERT 시 unique 인덱스로 처리)
     """
-    if await user_service.check_existence(db, "username", user_in.username):
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="이미 사용 중인 유저이름입니다."
-        )
-    
-    if await user_service.check_existence(db, "email", user_in.email):
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="이미 사용 중인 이메일입니다."
-        )
-    
     try:
         user = await user_service.create_user_general(
             db=db,
@@ -101,6 +89,16 @@ async def register_user(
             phone_number=user_in.phone_number
         )
         return user
+    except DuplicateUserError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "username": "이미 사용 중인 유저이름입니다.",
+                "email": "이미 사용 중인 이메일입니다."
+            }.get(e.field, "이미 가입된 정보입니다.")
+        )
+    except HashingBusyError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     except Exception as e:
         logger.error(f"⛔ 회원가입 중 예외 발생: {e}", exc_info=True)
         raise HTTPException(
@@ -117,8 +115,13 @@ async def login_for_access_token(
     일반 로그인 (유저이름 또는 이메일 사용)
     """
     user = await user_service.get_user_by_username_or_email(db, form_data.username)
+
+    try:
+        is_valid = bool(user and user.hashed_password) and await verify_password_async(form_data.password, user.hashed_password)
+    except HashingBusyError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     
-    if not user or not user.hashed_password or not verify_password(form_data.password, user.hashed_password):
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="유저이름 또는 비밀번호가 잘못되었습니다.",
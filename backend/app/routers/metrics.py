@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.metrics import registry, loop_lag_max_seconds
+from app.core.profiling import find_profile, is_authorized, recent_profiles
+from app.services.tick_trace import tick_tracer
+
+router = APIRouter(tags=["Metrics"])
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    """
+    Prometheus 수집용 메트릭 (text format 0.0.4)
+    - KIS REST: tr_id 별 지연 시간, 결과(HTTP 상태/rt_cd), 재시도, 응답 크기
+    - 이벤트 루프 지연, 웹소켓 전송 현황
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@router.get("/debug/ticks", include_in_schema=False)
+def get_tick_debug(limit: int = 10):
+    """
+    실시간 전송 병목 확인용 (DEBUG_ENDPOINTS=true 일 때만 노출)
+    - 전송이 느린 클라이언트 / 전체 전송 시간이 긴 종목 (표본 기준)
+    - 최근 이벤트 루프 최대 지연
+    """
+    if not settings.DEBUG_ENDPOINTS:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return {
+        "loop_lag_max_ms": round(loop_lag_max_seconds.get() * 1000, 3),
+        "slowest_clients": tick_tracer.slowest_clients(limit),
+        "slowest_codes": tick_tracer.slowest_codes(limit)
+    }
+
+@router.get("/debug/profiles", include_in_schema=False)
+def list_profiles(x_profile_token: str | None = Header(default=None)):
+    """최근 요청 프로파일 요약 (X-Profile-Token 필요)"""
+    if not is_authorized(x_profile_token):
+        raise HTTPException(status_code=404, detail="Not Found")
+    return [profile.summary() for profile in reversed(recent_profiles)]
+
+@router.get("/debug/profiles/{profile_id}", response_class=PlainTextResponse, include_in_schema=False)
+def get_profile(profile_id: str, x_profile_token: str | None = Header(default=None)):
+    """
+    요청 프로파일 collapsed stack (flamegraph.pl / speedscope 입력 형식)
+    예) curl -H "X-Profile-Token: ..." .../debug/profiles/<id> | flamegraph.pl > chart.svg
+    """
+    if not is_authorized(x_profile_token):
+        raise HTTPException(status_code=404, detail="Not Found")
+    profile = find_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(profile.collapsed())
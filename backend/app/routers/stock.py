@@ -1,100 +1,43 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
 from app.services.stock_info import stock_info_service
 from app.services.kis_data import kis_data
-import asyncio
-from datetime import datetime, timedelta
+from app.services.kis_ws import kis_ws_manager
+from app.services.ranking_service import ranking_service
+from app.services.market_calendar import calendar_for
 
 router = APIRouter(prefix="/stocks", tags=["Stocks"])
 
 # --- [날짜 계산 유틸리티 함수] ---
-def get_trading_dates():
+def get_trading_dates(market: str = "KR"):
     """
-    오늘 날짜와 직전 영업일(전날) 날짜를 계산하여 반환 (MM.DD 포맷)
+    기준 거래일(오늘 또는 직전 거래일)과 그 전 거래일 날짜를 반환 (YYYY.MM.DD 포맷)
+    주말/휴장일은 시장 달력 기준으로 건너뜁니다.
     """
-    now = datetime.now()
-    today_str = now.strftime("%Y.%m.%d")
-    
-
-    # 전날 계산 (월요일이면 금요일이 전날)
-    if now.weekday() == 0: # 월요일
-        prev_day = now - timedelta(days=3)
-    elif now.weekday() == 6: # 일요일
-        prev_day = now - timedelta(days=2)
-    else: # 화~토
-        prev_day = now - timedelta(days=1)
-        
-    prev_date_str = prev_day.strftime("%Y.%m.%d")
-    
-    return today_str, prev_date_str
+    calendar = calendar_for(market)
+    today = calendar.last_trading_day()
+    prev_day = calendar.previous_trading_day(today)
+    return today.strftime("%Y.%m.%d"), prev_day.strftime("%Y.%m.%d")
 
 @router.get("/rank/{rank_type}")
-async def get_stock_ranking(rank_type: str, market_type: str = "DOMESTIC"):
+async def get_stock_ranking(rank_type: str, request: Request, market_type: str = "DOMESTIC"):
     """
     순위 데이터 조회
     - rank_type: volume, amount, cap, rise, fall
     - market_type: DOMESTIC(기본), OVERSEAS, ALL(전체)
+    - 갱신 주기 안에서는 캐시된 스냅샷을 반환하며, ETag / If-None-Match 를 지원합니다.
     """
-    # [공통 로직] 'cap'으로 요청이 오더라도 해외 주식 로직에는 'market_cap'으로 전달되도록 변환
-    overseas_rank_type = "market_cap" if rank_type == "cap" else rank_type
-
-    if market_type == "ALL":
-        # 전체 보기: 국내/해외 병렬 조회 후 병합
-        d_task = kis_data.get_ranking_data(rank_type) # 국내는 'cap' 그대로 사용
-        o_task = kis_data.get_overseas_ranking_data(overseas_rank_type, market_code="NAS") # 해외는 변환된 값 사용
-        
-        d_data, o_data = await asyncio.gather(d_task, o_task)
-
-        # 국내 주식 이름 매핑 및 마켓 정보 추가
-        for item in d_data:
-            name = stock_info_service.get_name(item['code'])
-            if name:
-                item['name'] = name
-            item['market'] = "KR"  # [수정] 국내 주식임을 식별하기 위해 market 필드 추가
-        
-        # 해외 주식 마켓 정보 확인 (혹시 API에서 안 줄 경우를 대비해 안전장치)
-        for item in o_data:
-             if 'market' not in item:
-                 item['market'] = "NAS" # 또는 해당 해외 시장 코드
+    snapshot = await ranking_service.get_snapshot(rank_type, market_type)
+    etag = f'"{snapshot.etag}"'
+    headers = {"ETag": etag, "X-Ranking-Version": str(snapshot.version)}
 
-        # 데이터 병합
-        combined_data = d_data + o_data
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
 
-        # 정렬 로직 (수치 변환 후 비교)
-        def get_value(item, key):
-            try:
-                val = item.get(key, '0')
-                return float(val.replace(',', ''))
-            except (ValueError, AttributeError):
-                return 0.0
-
-        if rank_type == "rise":
-            combined_data.sort(key=lambda x: get_value(x, 'change_rate'), reverse=True)
-        elif rank_type == "fall":
-            combined_data.sort(key=lambda x: get_value(x, 'change_rate'), reverse=False)
-        elif rank_type in ["volume", "amount"]:
-            combined_data.sort(key=lambda x: get_value(x, rank_type), reverse=True)
-        
-        if rank_type == "cap":
-             combined_data.sort(key=lambda x: get_value(x, 'market_cap') if 'market_cap' in x else get_value(x, 'amount'), reverse=True)
-        
-        return combined_data[:30] 
-
-    elif market_type == "OVERSEAS":
-        # [수정] 해외 주식 단독 조회
-        raw_data = await kis_data.get_overseas_ranking_data(overseas_rank_type, market_code="NAS")
-        return raw_data
-
-    else:
-        # [수정] 국내 주식 단독 조회 (else block)
-        raw_data = await kis_data.get_ranking_data(rank_type)
-        final_results = []
-        for item in raw_data:
-            name = stock_info_service.get_name(item['code'])
-            if name:
-                item['name'] = name
-            item['market'] = "KR" # [수정] 단독 조회시에도 market 필드 추가 권장
-            final_results.append(item)
-        return final_results
+    return JSONResponse(content=snapshot.items, headers=headers)
 
 # [2] 종목 검색 (기존 유지)
 @router.get("/search")
@@ -103,19 +46,14 @@ async def search_stocks(keyword: str = Query(..., min_length=1)):
     if not candidates:
         return []
 
-    tasks = []
-    for item in candidates:
-        code = item['code']
-        market = item.get('market', 'KR')
-        if market == 'KR':
-            tasks.append(kis_data.get_current_price(code))
-        else:
-            tasks.append(kis_data.get_overseas_current_price(code, market_code=market))
-
-    price_infos = await asyncio.gather(*tasks)
+    quotes = await kis_data.get_quotes(
+        [item['code'] for item in candidates],
+        markets={item['code']: item.get('market', 'KR') for item in candidates}
+    )
     
     final_results = []
-    for item, price_info in zip(candidates, price_infos):
+    for item in candidates:
+        price_info = quotes.get(item['code'])
         market_cap = 0.0
         if price_info:
             item['price'] = price_info.get('price', '-')
@@ -135,7 +73,33 @@ async def search_stocks(keyword: str = Query(..., min_length=1)):
     final_results.sort(key=lambda x: (x.get('score', 999), -x['market_cap']))
     return final_results[:10]
 
-# [3] 상세 정보 조회 (날짜 로직 적용)
+# [3] 다종목 현재가 일괄 조회 (검색 결과 / 관심종목)
+MAX_QUOTE_CODES = 100
+
+@router.get("/quotes")
+async def get_stock_quotes(codes: str = Query(..., min_length=1, description="쉼표로 구분한 종목코드")):
+    code_list = list(dict.fromkeys(c.strip() for c in codes.split(",") if c.strip()))
+    if len(code_list) > MAX_QUOTE_CODES:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_QUOTE_CODES}종목까지 조회할 수 있습니다.")
+
+    quotes = await kis_data.get_quotes(code_list)
+
+    results = []
+    for code in code_list:
+        quote = quotes.get(code)
+        results.append({
+            "code": code,
+            "name": stock_info_service.get_name(code),
+            "market": stock_info_service.code_to_market.get(code, "KR"),
+            "price": quote.get('price') if quote else None,
+            "diff": quote.get('diff') if quote else None,
+            "change_rate": quote.get('change_rate') if quote else None,
+            "volume": quote.get('volume') if quote else None,
+            "amount": quote.get('amount') if quote else None
+        })
+    return results
+
+# [4] 상세 정보 조회 (날짜 로직 적용)
 @router.get("/{market}/{code}/detail")
 async def get_stock_detail(market: str, code: str):
     # 1. API 데이터 조회
@@ -147,7 +111,7 @@ async def get_stock_detail(market: str, code: str):
         detail_data["name"] = name
 
     # 3. 날짜 정보 추가 (오늘, 전날)
-    today_str, prev_date_str = get_trading_dates()
+    today_str, prev_date_str = get_trading_dates(market)
     detail_data["date"] = today_str      # 오늘 (예: 11.24)
     detail_data["prev_date"] = prev_date_str # 전날 (예: 11.22)
 
@@ -166,17 +130,20 @@ async def get_stock_detail(market: str, code: str):
 
     return detail_data
 
-# [4] 차트 데이터 조회 (기존 유지)
+# [5] 차트 데이터 조회 (기존 유지)
 @router.get("/{market}/{code}/chart")
 async def get_stock_chart(market: str, code: str, period: str = "day"):
     return await kis_data.get_stock_chart(market, code, period)
 
 @router.get("/{market}/{code}/hoga")
 async def get_stock_hoga(market: str, code: str):
-    """호가 데이터 조회"""
+    """호가 데이터 조회 (실시간 호가 구독 중이면 메모리 호가 반환)"""
+    book = kis_ws_manager.order_books.get(code)
+    if book is not None:
+        return book.snapshot()
     return await kis_data.get_hoga(market, code)
 
 @router.get("/{market}/{code}/trades")
 async def get_stock_trades(market: str, code: str):
-    """체결 내역 조회"""
-    return await kis_data.get_recent_trades(market, code)
\ No newline at end of file
+    """체결 내역 조회 (실시간 구독 중이면 체결 링버퍼에서 반환)"""
+    return await kis_ws_manager.get_recent_trades(market, code)
\ No newline at end of file
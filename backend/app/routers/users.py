@@ -1,22 +1,27 @@
+import uuid
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import case, delete, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sqlalchemy.future import select
-from app.database import get_db
+from app.database import get_db, upsert_insert, release_connection
 from app.models.user import User
 from app.models.user_stock import UserStock
-from app.schemas.user import UserPublic, UserUpdate, MessageResponse
+from app.schemas.user import UserPublic, UserUpdate, MessageResponse, FavoriteCodes
 from app.services.user_services import user_service
 from app.services.stock_info import stock_info_service
-from app.core.security.dependencies import get_current_user
+from app.services.kis_data import kis_data
+from app.core.security.dependencies import get_current_user, get_current_user_id
+from app.core.security.hashing import HashingBusyError
 
 logger = logging.getLogger(__name__)
 
+# 인증은 라우트별로 선언 (프로필 라우트는 get_current_user, 관심 종목 라우트는 get_current_user_id)
+# 라우터 공통 의존성을 두면 /me 에서 JWT 검증과 사용자 조회가 두 번 실행됨
 router = APIRouter(
     prefix="/users", 
     tags=["User-Profile"],
-    dependencies=[Depends(get_current_user)] 
 )
 
 @router.get("/me", response_model=UserPublic)
@@ -44,6 +49,8 @@ async def update_users_me(
         return updated_user
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except HashingBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"⛔ 사용자 정보 수정 중 예외: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="서버 오류 발생")
@@ -64,47 +71,172 @@ async def delete_users_me(
 
 @router.get("/me/favorites")
 async def get_my_favorites(
-    current_user: User = Depends(get_current_user),
+    with_quotes: bool = False,
+    user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
-    """내 관심 종목 조회"""
-    result = await db.execute(select(UserStock).where(UserStock.user_id == current_user.user_id))
+    """
+    내 관심 종목 조회
+    - with_quotes=true: 종목별 현재가/등락률/거래량을 함께 반환 (시세는 한 번에 일괄 조회)
+    """
+    result = await db.execute(
+        select(UserStock)
+        .where(UserStock.user_id == user_id)
+        .order_by(UserStock.position, UserStock.created_at)
+    )
     stocks = result.scalars().all()
-    return stocks
+    if not with_quotes:
+        return stocks
 
-@router.post("/me/favorites/{code}")
-async def add_favorite(
-    code: str,
-    current_user: User = Depends(get_current_user),
+    # 시세 조회(KIS) 동안 커넥션을 잡고 있지 않도록 반납
+    await release_connection(db)
+    quotes = await kis_data.get_quotes([stock.stock_code for stock in stocks])
+
+    results = []
+    for stock in stocks:
+        quote = quotes.get(stock.stock_code) or {}
+        results.append({
+            "id": stock.id,
+            "user_id": stock.user_id,
+            "stock_code": stock.stock_code,
+            "stock_name": stock.stock_name,
+            "market_type": stock.market_type,
+            "position": stock.position,
+            "created_at": stock.created_at,
+            "price": quote.get('price'),
+            "diff": quote.get('diff'),
+            "change_rate": quote.get('change_rate'),
+            "volume": quote.get('volume')
+        })
+    return results
+
+def _next_position(user_id: uuid.UUID):
+    """사용자 관심 목록 맨 뒤 순서 (INSERT 안의 스칼라 서브쿼리)"""
+    return (
+        select(func.coalesce(func.max(UserStock.position), -1) + 1)
+        .where(UserStock.user_id == user_id)
+        .scalar_subquery()
+    )
+
+def _insert_favorites(db: AsyncSession, user_id: uuid.UUID, codes: list[str]):
+    """관심 종목 INSERT ... ON CONFLICT DO NOTHING RETURNING stock_code (이미 있는 종목은 건너뜀)"""
+    next_position = _next_position(user_id)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "stock_code": code,
+            "stock_name": stock_info_service.get_name(code),
+            "position": next_position + offset,
+        }
+        for offset, code in enumerate(codes)
+    ]
+    return (
+        upsert_insert(db, UserStock)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["user_id", "stock_code"])
+        .returning(UserStock.stock_code, UserStock.stock_name)
+    )
+
+def _unique_codes(codes: list[str]) -> list[str]:
+    """공백 제거 + 순서 유지 중복 제거"""
+    return list(dict.fromkeys(code.strip() for code in codes if code.strip()))
+
+@router.post("/me/favorites")
+async def add_favorites(
+    body: FavoriteCodes,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """관심 종목 일괄 추가 (목록 순서대로 맨 뒤에 추가, 이미 있는 종목은 skipped)"""
+    codes = _unique_codes(body.codes)
+    if not codes:
+        raise HTTPException(status_code=400, detail="종목코드가 없습니다.")
+    result = await db.execute(_insert_favorites(db, user_id, codes))
+    added = {row.stock_code: row.stock_name for row in result}
+    await db.commit()
+    return {
+        "message": "Added",
+        "added": [{"code": code, "name": added[code]} for code in codes if code in added],
+        "skipped": [code for code in codes if code not in added],
+    }
+
+@router.delete("/me/favorites")
+async def remove_favorites(
+    body: FavoriteCodes,
+    user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
-    """관심 종목 추가"""
-    # 중복 체크
+    """관심 종목 일괄 삭제 (없는 종목은 not_found)"""
+    codes = _unique_codes(body.codes)
     result = await db.execute(
-        select(UserStock).where(UserStock.user_id == current_user.user_id, UserStock.stock_code == code)
+        delete(UserStock)
+        .where(UserStock.user_id == user_id, UserStock.stock_code.in_(codes))
+        .returning(UserStock.stock_code)
     )
-    if result.scalars().first():
-        return {"message": "Already added"}
+    deleted = set(result.scalars().all())
+    await db.commit()
+    return {
+        "message": "Deleted",
+        "deleted": [code for code in codes if code in deleted],
+        "not_found": [code for code in codes if code not in deleted],
+    }
 
-    name = stock_info_service.get_name(code)
-    new_fav = UserStock(user_id=current_user.user_id, stock_code=code, stock_name=name)
-    db.add(new_fav)
+@router.put("/me/favorites/order")
+async def reorder_favorites(
+    body: FavoriteCodes,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    관심 종목 순서 변경 (UPDATE 1회)
+    - codes 순서대로 0, 1, 2 ... 부여
+    - 목록에 없는 종목은 기존 순서를 유지한 채 뒤로 이동
+    """
+    codes = _unique_codes(body.codes)
+    if not codes:
+        raise HTTPException(status_code=400, detail="종목코드가 없습니다.")
+    result = await db.execute(
+        update(UserStock)
+        .where(UserStock.user_id == user_id)
+        .values(position=case(
+            {code: index for index, code in enumerate(codes)},
+            value=UserStock.stock_code,
+            else_=len(codes) + UserStock.position,
+        ))
+        .execution_options(synchronize_session=False)
+    )
     await db.commit()
-    return {"message": "Added", "code": code, "name": name}
+    return {"message": "Reordered", "count": result.rowcount}
+
+@router.post("/me/favorites/{code}")
+async def add_favorite(
+    code: str,
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """관심 종목 추가 (INSERT ... ON CONFLICT DO NOTHING, 동시 요청에도 중복 없음)"""
+    result = await db.execute(_insert_favorites(db, user_id, [code]))
+    row = result.first()
+    await db.commit()
+    if row is None:
+        return {"message": "Already added"}
+    return {"message": "Added", "code": code, "name": row.stock_name}
 
 @router.delete("/me/favorites/{code}")
 async def remove_favorite(
     code: str,
-    current_user: User = Depends(get_current_user),
+    user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
-    """관심 종목 삭제"""
+    """관심 종목 삭제 (DELETE ... RETURNING)"""
     result = await db.execute(
-        select(UserStock).where(UserStock.user_id == current_user.user_id, UserStock.stock_code == code)
+        delete(UserStock)
+        .where(UserStock.user_id == user_id, UserStock.stock_code == code)
+        .returning(UserStock.id)
     )
-    fav = result.scalars().first()
-    if fav:
-        await db.delete(fav)
-        await db.commit()
+    deleted = result.first()
+    await db.commit()
+    if deleted:
         return {"message": "Deleted"}
-    return {"message": "Not found"}
\ No newline at end of file
+    return {"message": "Not found"}
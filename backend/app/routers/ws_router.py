@@ -1,8 +1,10 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from app.services.kis_data import kis_data
-from app.services.stock_info import stock_info_service
 from app.services.kis_ws import kis_ws_manager
+from app.services.ranking_service import ranking_service
+from app.services.ranking import diff_rankings
+from app.core.config import settings
 import asyncio
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,77 +27,85 @@ async def stock_ws(websocket: WebSocket, code: str):
         await kis_ws_manager.disconnect_client(websocket, code)
 
 # ---------------------------------------------------------------------
-# [2] 실시간 랭킹 웹소켓 (신규 추가)
+# [2] 종목별 실시간 호가 (접속 시 전체 호가, 이후 변경분만 전송)
 # ---------------------------------------------------------------------
+@router.websocket("/hoga/{code}")
+async def hoga_ws(websocket: WebSocket, code: str):
+    await kis_ws_manager.connect_hoga_client(websocket, code)
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        await kis_ws_manager.disconnect_hoga_client(websocket, code)
+    except Exception as e:
+        logger.error(f"⛔ 호가 소켓 에러 [{code}]: {e}")
+        await kis_ws_manager.disconnect_hoga_client(websocket, code)
+
+# ---------------------------------------------------------------------
+# [3] 실시간 랭킹 웹소켓 (신규 추가)
+# ---------------------------------------------------------------------
+def _is_snapshot_request(message: str) -> bool:
+    """클라이언트의 전체 스냅샷 재요청 여부 ("snapshot" 또는 {"type": "snapshot"})"""
+    if message.strip() == "snapshot":
+        return True
+    try:
+        data = json.loads(message)
+    except ValueError:
+        return False
+    return isinstance(data, dict) and data.get("type") == "snapshot"
+
 @router.websocket("/rankings")
-async def ranking_ws(websocket: WebSocket, rank_type: str = "volume", market_type: str = "ALL"):
+async def ranking_ws(websocket: WebSocket, rank_type: str = "volume", market_type: str = "ALL", protocol: str = "full"):
     """
     실시간 랭킹 데이터 스트림
     - rank_type: volume(거래량), amount(거래대금), cap(시가총액), rise(급상승), fall(급하락)
     - market_type: ALL, DOMESTIC, OVERSEAS
+    - protocol:
+        full(기본)  변경 시마다 순위 배열 전체 전송
+        delta       연결 시 {"type": "snapshot"} 1회, 이후 {"type": "delta"} 로 변경분만 전송
+                    (RANKING_DELTA_FULL_EVERY 회마다, 또는 클라이언트가 "snapshot" 을 보내면 전체 스냅샷)
     """
     await websocket.accept()
-    logger.info(f"📊 랭킹 소켓 연결: {rank_type} / {market_type}")
-    
+    logger.info(f"📊 랭킹 소켓 연결: {rank_type} / {market_type} ({protocol})")
+    delta_mode = protocol == "delta"
+
     try:
+        last_sent = None
+        deltas_since_full = 0
+        force_full = False
         while True:
-            # 1. 데이터 조회 및 병합 로직
-            overseas_rank_type = "market_cap" if rank_type == "cap" else rank_type
-            final_data = []
-
-            if market_type == "ALL":
-                # 국내/해외 병렬 조회
-                d_task = kis_data.get_ranking_data(rank_type)
-                o_task = kis_data.get_overseas_ranking_data(overseas_rank_type, market_code="NAS")
-                d_data, o_data = await asyncio.gather(d_task, o_task)
-
-                # 국내 데이터 보정 (마켓명, 한글명)
-                for item in d_data:
-                    item['market'] = "KR"
-                    name = stock_info_service.get_name(item['code'])
-                    if name: item['name'] = name
-                
-                # 해외 데이터 보정
-                for item in o_data:
-                    if 'market' not in item: item['market'] = "NAS"
-
-                combined = d_data + o_data
-                
-                # 정렬을 위한 헬퍼 함수 (문자열 -> 숫자 변환)
-                def get_val(x, key):
-                    try: return float(str(x.get(key, '0')).replace(',', ''))
-                    except: return 0.0
-
-                # 타입별 정렬 로직
-                if rank_type == "rise":
-                    combined.sort(key=lambda x: get_val(x, 'change_rate'), reverse=True)
-                elif rank_type == "fall":
-                    combined.sort(key=lambda x: get_val(x, 'change_rate'), reverse=False)
-                elif rank_type == "cap":
-                    combined.sort(key=lambda x: get_val(x, 'market_cap') if 'market_cap' in x else get_val(x, 'amount'), reverse=True)
-                else: # volume, amount
-                    combined.sort(key=lambda x: get_val(x, rank_type), reverse=True)
-                
-                final_data = combined[:30]
-
-            elif market_type == "OVERSEAS":
-                # 해외 단독
-                final_data = await kis_data.get_overseas_ranking_data(overseas_rank_type, market_code="NAS")
-
-            else: # DOMESTIC
-                # 국내 단독
-                raw_data = await kis_data.get_ranking_data(rank_type)
-                for item in raw_data:
-                    item['market'] = "KR"
-                    name = stock_info_service.get_name(item['code'])
-                    if name: item['name'] = name
-                final_data = raw_data
+            # 1. 공유 스냅샷 조회 (갱신 주기 안이면 KIS 호출 없음)
+            snapshot = await ranking_service.get_snapshot(rank_type, market_type)
 
-            # 2. 클라이언트로 전송
-            await websocket.send_json(final_data)
+            # 2. 내용이 바뀌었거나 재요청이 있을 때만 전송
+            if last_sent is None or snapshot.version != last_sent.version or force_full:
+                if not delta_mode:
+                    await websocket.send_json(snapshot.items)
+                elif last_sent is None or force_full or deltas_since_full >= settings.RANKING_DELTA_FULL_EVERY:
+                    await websocket.send_json({
+                        "type": "snapshot",
+                        "version": snapshot.version,
+                        "items": snapshot.items
+                    })
+                    deltas_since_full = 0
+                else:
+                    await websocket.send_json({
+                        "type": "delta",
+                        "version": snapshot.version,
+                        "base": last_sent.version,
+                        **diff_rankings(last_sent.items, snapshot.items)
+                    })
+                    deltas_since_full += 1
+                last_sent = snapshot
+                force_full = False
 
-            # 3. 2초 대기 (API 호출 제한 고려)
-            await asyncio.sleep(2) 
+            # 3. 갱신 주기만큼 대기 (장외 시간에는 길어짐, 대기 중 스냅샷 재요청 수신)
+            try:
+                message = await asyncio.wait_for(websocket.receive_text(), timeout=ranking_service.refresh_interval(market_type))
+            except asyncio.TimeoutError:
+                continue
+            if delta_mode and _is_snapshot_request(message):
+                force_full = True
 
     except WebSocketDisconnect:
         logger.info("👋 랭킹 소켓 연결 해제")
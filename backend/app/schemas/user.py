@@ -43,4 +43,8 @@ class CheckAvailabilityRequest(BaseModel):
 
 class PhoneVerificationRequest(BaseModel):
     "전화번호 인증 요청"
-    phone_number: str
\ No newline at end of file
+    phone_number: str
+
+class FavoriteCodes(BaseModel):
+    """관심 종목 일괄 추가/삭제/순서 변경 (순서 변경은 목록 순서가 곧 표시 순서)"""
+    codes: list[str] = Field(..., min_length=1, max_length=200)
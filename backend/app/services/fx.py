@@ -0,0 +1,154 @@
+import asyncio
+import json
+import logging
+import os
+import time
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+FX_RETRY_INTERVAL = 60  # 조회 실패 시 재시도 간격 (초)
+
+# ---------------------------------------------------------------------
+# 환율 소스 (fetch() -> 1 USD 당 KRW)
+# ---------------------------------------------------------------------
+class OpenErApiSource:
+    """open.er-api.com 무료 환율 API"""
+    name = "open_er_api"
+
+    def __init__(self, url: str, timeout: float = 3.0):
+        self.url = url
+        self.timeout = timeout
+
+    async def fetch(self) -> float:
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.get(self.url)
+            response.raise_for_status()
+            return float(response.json()['rates']['KRW'])
+
+class FileSource:
+    """로컬 JSON 파일 ({"rate": 1380.5}) - 개발/테스트용"""
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = path
+
+    async def fetch(self) -> float:
+        data = await asyncio.to_thread(_read_json, self.path)
+        return float(data['rate'])
+
+class StaticSource:
+    """고정 환율"""
+    name = "static"
+
+    def __init__(self, rate: float):
+        self.rate = rate
+
+    async def fetch(self) -> float:
+        return float(self.rate)
+
+def _read_json(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def _write_json(path: str, data: dict):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def build_source(kind: str):
+    if kind == "file":
+        return FileSource(settings.FX_FILE_PATH)
+    if kind == "static":
+        return StaticSource(settings.FX_DEFAULT_RATE)
+    return OpenErApiSource(settings.FX_API_URL)
+
+# ---------------------------------------------------------------------
+# 환율 서비스
+# ---------------------------------------------------------------------
+class FxService:
+    """
+    USD -> KRW 환율 단일 공급원
+    - 요청 경로에서는 메모리 값만 읽음 (외부 호출 없음)
+    - 백그라운드 태스크가 FX_REFRESH_SECONDS 마다 소스에서 갱신
+    - 마지막 성공 값을 파일에 저장해 재시작 직후에도 같은 환율 사용
+    """
+    def __init__(self, source, cache_path: str | None, refresh_interval: float, default_rate: float):
+        self.source = source
+        self.cache_path = cache_path
+        self.refresh_interval = refresh_interval
+        self.rate = default_rate
+        self.updated_at = 0.0  # 마지막 갱신 시각 (epoch), 0 이면 기본값
+        self._refresh_task = None
+        self._load_cached()
+
+    def _load_cached(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            data = _read_json(self.cache_path)
+            self.rate = float(data['rate'])
+            self.updated_at = float(data.get('updated_at', 0))
+            logger.info(f"💱 저장된 환율 사용: 1 USD = {self.rate} KRW")
+        except Exception as e:
+            logger.error(f"⛔ 저장된 환율 파일 읽기 실패: {e}")
+
+    def to_krw(self, usd) -> int:
+        """USD 금액을 현재 환율로 원화(정수) 변환"""
+        return int(float(usd or 0) * self.rate)
+
+    async def refresh(self) -> bool:
+        try:
+            rate = await self.source.fetch()
+        except Exception as e:
+            logger.error(f"⛔ 환율 조회 실패 ({self.source.name}), 기존 값 유지: {e}")
+            return False
+
+        if rate <= 0:
+            logger.warning(f"환율 값 이상 ({rate}), 기존 값 유지")
+            return False
+
+        self.rate = rate
+        self.updated_at = time.time()
+        logger.info(f"💱 최신 환율 갱신 완료: 1 USD = {rate} KRW ({self.source.name})")
+
+        if self.cache_path:
+            try:
+                await asyncio.to_thread(_write_json, self.cache_path, {
+                    "rate": rate, "updated_at": self.updated_at, "source": self.source.name
+                })
+            except Exception as e:
+                logger.error(f"⛔ 환율 파일 저장 실패: {e}")
+        return True
+
+    def start_background_refresh(self):
+        if not self._refresh_task or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop_background_refresh(self):
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def _refresh_loop(self):
+        """저장된 값이 충분히 최신이면 남은 시간만큼 기다린 뒤 주기적으로 갱신"""
+        delay = max(self.updated_at + self.refresh_interval - time.time(), 0)
+        while True:
+            await asyncio.sleep(delay)
+            ok = await self.refresh()
+            delay = self.refresh_interval if ok else FX_RETRY_INTERVAL
+
+fx_service = FxService(
+    source=build_source(settings.FX_SOURCE),
+    cache_path=settings.FX_CACHE_PATH or None,
+    refresh_interval=settings.FX_REFRESH_SECONDS,
+    default_rate=settings.FX_DEFAULT_RATE
+)
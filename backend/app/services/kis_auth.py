@@ -1,26 +1,43 @@
+import asyncio
 import logging
-import httpx
 from datetime import datetime, timezone, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.core.config import settings
 from app.database import AsyncSessionLocal
+from app.services.kis_http import kis_client
 from app.models.kis_token import KISToken
 
 logger = logging.getLogger(__name__)
 
+# 만료 이 시간 전부터는 미리 갱신 (요청 경로에서 만료를 만나지 않도록)
+REFRESH_MARGIN = timedelta(minutes=10)
+REFRESH_MIN_INTERVAL = 60
+
 class KISAuth:
     def __init__(self):
         self.access_token = None
+        self.access_token_expires_at = None
         self.approval_key = None
+        self.approval_key_expires_at = None
         self.base_url = settings.KIS_BASE_URL
 
+        self._access_lock = asyncio.Lock()
+        self._approval_lock = asyncio.Lock()
+        self._refresh_task = None
+
     async def _load_token_from_db(self, session: AsyncSession, token_name: str):
         result = await session.execute(select(KISToken).where(KISToken.token_name == token_name))
         token = result.scalars().first()
-        if token and token.expires_at > datetime.now(timezone.utc):
-            return token.token_value, token.expires_at
+        if not token:
+            return None, None
+        expires_at = token.expires_at
+        # SQLite 는 시간대를 저장하지 않아 naive 로 돌아옴 (저장 값은 UTC)
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        if expires_at > datetime.now(timezone.utc):
+            return token.token_value, expires_at
         return None, None
     
     async def _save_token_to_db(self, session: AsyncSession, token_name: str, token_value: str, expires_at: datetime):
@@ -49,20 +66,53 @@ class KISAuth:
             await session.rollback()
             raise
 
+    # ---------------------------------------------------------
+    # 메모리 캐시 (요청 경로에서는 DB/KIS를 거치지 않음)
+    # ---------------------------------------------------------
+    @staticmethod
+    def _is_fresh(value, expires_at, margin: timedelta = timedelta(0)) -> bool:
+        return bool(value) and expires_at is not None and expires_at - margin > datetime.now(timezone.utc)
+
     async def get_access_token(self):
         """
         REST API용 Access Token
-        DB에서 먼저 확인 후, 없거나 만료되면 새로 발급
+        메모리 캐시 -> DB -> KIS 순으로 확인하며, 갱신은 한 번에 하나만 수행
+        """
+        if self._is_fresh(self.access_token, self.access_token_expires_at):
+            return self.access_token
+
+        async with self._access_lock:
+            # 락을 기다리는 동안 다른 요청이 이미 갱신했을 수 있음
+            if not self._is_fresh(self.access_token, self.access_token_expires_at):
+                await self._refresh_access_token()
+        return self.access_token
+
+    async def get_approval_key(self):
         """
+        WEBSOCKET 용 approval key
+        메모리 캐시 -> DB -> KIS 순으로 확인하며, 갱신은 한 번에 하나만 수행
+        """
+        if self._is_fresh(self.approval_key, self.approval_key_expires_at):
+            return self.approval_key
+
+        async with self._approval_lock:
+            if not self._is_fresh(self.approval_key, self.approval_key_expires_at):
+                await self._refresh_approval_key()
+        return self.approval_key
+
+    # ---------------------------------------------------------
+    # 실제 갱신 (락 안에서만 호출)
+    # ---------------------------------------------------------
+    async def _refresh_access_token(self):
+        """DB에 여유 있는 토큰이 있으면 사용 (다른 워커가 발급했을 수 있음), 없으면 KIS에서 새로 발급"""
         async with AsyncSessionLocal() as session:
             token_value, expires_at = await self._load_token_from_db(session, "access_token")
-            now = datetime.now(timezone.utc)
 
-            if token_value and expires_at > now:
-                self.access_token = token_value
-                return self.access_token
+            if self._is_fresh(token_value, expires_at, REFRESH_MARGIN):
+                self.access_token, self.access_token_expires_at = token_value, expires_at
+                return
             
-            logger.info("DB에 access_token이 없거나 만료됨. KIS에서 새로 발급합니다.")
+            logger.info("DB에 access_token이 없거나 만료 임박. KIS에서 새로 발급합니다.")
             url = f"{self.base_url}/oauth2/tokenP"
             data = {
                 "grant_type": "client_credentials",
@@ -70,31 +120,27 @@ class KISAuth:
                 "appsecret": settings.KIS_SECRET_KEY,
             }
 
-            async with httpx.AsyncClient() as client:
+            async with kis_client() as client:
                 response = await client.post(url, json=data)
                 response.raise_for_status()
                 result = response.json()
 
+            now = datetime.now(timezone.utc)
             self.access_token = result["access_token"]
-            expires_dt = now + timedelta(seconds=int(result["expires_in"]))
+            self.access_token_expires_at = now + timedelta(seconds=int(result["expires_in"]))
 
-            await self._save_token_to_db(session, "access_token", self.access_token, expires_dt)
-            return self.access_token
-    
-    async def get_approval_key(self):
-        """
-        WEBSOCKET 용 approval key
-        DB에서 먼저 확인 후, 없거나 만료되면 새로 발급
-        """
+            await self._save_token_to_db(session, "access_token", self.access_token, self.access_token_expires_at)
+
+    async def _refresh_approval_key(self):
+        """DB에 여유 있는 키가 있으면 사용, 없으면 KIS에서 새로 발급"""
         async with AsyncSessionLocal() as session:
             token_value, expires_at = await self._load_token_from_db(session, "approval_key")
-            now = datetime.now(timezone.utc)
 
-            if token_value and expires_at > now:
-                self.approval_key = token_value
-                return self.approval_key
+            if self._is_fresh(token_value, expires_at, REFRESH_MARGIN):
+                self.approval_key, self.approval_key_expires_at = token_value, expires_at
+                return
             
-            logger.info("DB에 approval_key가 없거나 만료됨. KIS에서 새로 발급합니다.")
+            logger.info("DB에 approval_key가 없거나 만료 임박. KIS에서 새로 발급합니다.")
             url = f"{self.base_url}/oauth2/Approval"
             
             headers = {"content-type": "application/json; utf-8"}
@@ -104,17 +150,59 @@ class KISAuth:
                 "secretkey": settings.KIS_SECRET_KEY
             }
 
-            async with httpx.AsyncClient() as client:
+            async with kis_client() as client:
                 response = await client.post(url, headers=headers, json=data)
                 response.raise_for_status()
                 result = response.json()
 
+            now = datetime.now(timezone.utc)
             self.approval_key = result["approval_key"]
             expires_in_seconds = 24 * 3600
-            expires_dt = now + timedelta(seconds=expires_in_seconds)
+            self.approval_key_expires_at = now + timedelta(seconds=expires_in_seconds)
 
-            await self._save_token_to_db(session, "approval_key", self.approval_key, expires_dt)
+            await self._save_token_to_db(session, "approval_key", self.approval_key, self.approval_key_expires_at)
 
-            return self.approval_key
+    # ---------------------------------------------------------
+    # 만료 전 선제 갱신 (백그라운드)
+    # ---------------------------------------------------------
+    def start_background_refresh(self):
+        if not self._refresh_task or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop_background_refresh(self):
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def _refresh_loop(self):
+        """가장 먼저 만료되는 자격 증명의 (만료 - REFRESH_MARGIN) 시점에 깨어나 미리 갱신"""
+        while True:
+            now = datetime.now(timezone.utc)
+            deadlines = [e for e in (self.access_token_expires_at, self.approval_key_expires_at) if e]
+            if deadlines:
+                delay = (min(deadlines) - REFRESH_MARGIN - now).total_seconds()
+            else:
+                delay = 0
+            # KIS 토큰 발급은 분당 1회 제한이 있으므로 최소 간격 유지
+            await asyncio.sleep(max(delay, REFRESH_MIN_INTERVAL))
+
+            try:
+                if not self._is_fresh(self.access_token, self.access_token_expires_at, REFRESH_MARGIN):
+                    async with self._access_lock:
+                        if not self._is_fresh(self.access_token, self.access_token_expires_at, REFRESH_MARGIN):
+                            await self._refresh_access_token()
+                            logger.info("🔑 KIS Access Token 선제 갱신 완료.")
+
+                if not self._is_fresh(self.approval_key, self.approval_key_expires_at, REFRESH_MARGIN):
+                    async with self._approval_lock:
+                        if not self._is_fresh(self.approval_key, self.approval_key_expires_at, REFRESH_MARGIN):
+                            await self._refresh_approval_key()
+                            logger.info("🔑 KIS Approval Key 선제 갱신 완료.")
+            except Exception as e:
+                logger.error(f"⛔ KIS 자격 증명 선제 갱신 실패: {e}")
     
 kis_auth = KISAuth()
\ No newline at end of file
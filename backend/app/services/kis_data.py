@@ -1,49 +1,44 @@
-import httpx
+import asyncio
 import logging
-import time
 from datetime import datetime, timedelta, timezone
 from app.services.kis_auth import kis_auth
+from app.services.kis_http import kis_client
+from app.services.order_book import OrderBook, HOGA_LEVELS
+from app.services.quote_store import quote_store
+from app.services.fx import fx_service
+from app.services.market_calendar import calendar_for, krx_calendar, nasdaq_calendar
+from app.services.stock_info import stock_info_service
+from app.services.ranking import RankingItem, RANKING_SIZE, to_number
+from app.core.cache import TTLCache, SWRCache
+from app.core.rate_limit import AsyncRateLimiter
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 class KisDataService:
     def __init__(self):
-        # 환율 캐싱을 위한 변수 (1시간마다 갱신)
-        self.cached_rate = 1460.0 
-        self.last_fetch_time = 0
-        self.cache_duration = 3600 
+        # 현재가 캐시 (종목코드 -> get_current_price 결과) 및 KIS 초당 호출 제한
+        self.quote_cache = TTLCache(ttl=settings.QUOTE_CACHE_TTL)
+        self.rate_limiter = AsyncRateLimiter(settings.KIS_RATE_LIMIT_PER_SEC)
+
+        # 차트 캐시 ((시장, 종목코드, 기간) -> 차트 데이터, 장외 시간에는 다음 세션까지 유지)
+        self.chart_cache = TTLCache(ttl=settings.CHART_CACHE_TTL, maxsize=2000)
+
+        # 상세 화면 캐시 (기본 정보는 길게, 가격은 짧게 / 만료 후에는 이전 값 반환 + 백그라운드 갱신)
+        self.detail_cache = SWRCache(fresh_ttl=settings.DETAIL_CACHE_TTL, stale_ttl=settings.DETAIL_CACHE_STALE_TTL, maxsize=2000)
+        self.detail_price_cache = SWRCache(fresh_ttl=settings.QUOTE_CACHE_TTL, stale_ttl=settings.DETAIL_PRICE_STALE_TTL, maxsize=2000)
+
+    @staticmethod
+    def _quote_ttl(market: str) -> float:
+        """현재가 캐시 유지 시간 (정규장 QUOTE_CACHE_TTL, 장외에는 다음 세션 전환까지)"""
+        return calendar_for(market).cache_ttl(settings.QUOTE_CACHE_TTL, settings.QUOTE_CACHE_IDLE_TTL)
 
     async def get_exchange_rate(self):
         """
-        [자동 환율 조회]
-        외부 API를 통해 실시간 환율을 가져옵니다.
+        [환율 조회]
+        fx_service 가 백그라운드에서 갱신한 값을 반환합니다. (요청 경로에서 외부 호출 없음)
         """
-        current_time = time.time()
-        
-        # 캐시된 시간이 지났거나, 초기 상태라면 API 호출
-        if current_time - self.last_fetch_time > self.cache_duration:
-            try:
-                # 무료 환율 API (USD 기준)
-                url = "https://open.er-api.com/v6/latest/USD"
-                
-                async with httpx.AsyncClient(timeout=3.0) as client:
-                    response = await client.get(url)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        rate = data['rates']['KRW']
-                        
-                        self.cached_rate = rate
-                        self.last_fetch_time = current_time
-                        logger.info(f"💱 최신 환율 갱신 완료: 1 USD = {rate} KRW")
-                    else:
-                        logger.warning("환율 API 호출 실패, 기존 캐시값 사용")
-            
-            except Exception as e:
-                logger.error(f"환율 조회 중 에러 발생: {e}")
-        
-        return self.cached_rate
+        return fx_service.rate
 
     # ---------------------------------------------------------
     # [국내 주식] 관련 메서드
@@ -51,10 +46,10 @@ class KisDataService:
     async def get_top_volume(self):
         """기존 메서드 호환성 유지"""
         data = await self.get_ranking_data("volume")
-        return [item['code'] for item in data]
+        return [item.code for item in data]
 
     async def get_ranking_data(self, rank_type="volume"):
-        """국내 주식 순위 데이터 조회"""
+        """국내 주식 순위 데이터 조회 (RankingItem 리스트)"""
         tr_id = ""
         path = ""
         params = {}
@@ -116,9 +111,9 @@ class KisDataService:
 
         output = await self._fetch_ranking(tr_id, params, path)
         results = []
-        for item in output[:30]:
+        for item in output[:RANKING_SIZE]:
             mapped_item = self._map_ranking_item(item)
-            if mapped_item['code']:
+            if mapped_item.code:
                 results.append(mapped_item)
         return results
 
@@ -128,11 +123,11 @@ class KisDataService:
     async def get_overseas_top_volume(self, market_code="NAS"):
         """해외(미국) 거래량 상위 종목 코드 리스트 반환"""
         data = await self.get_overseas_ranking_data("volume", market_code)
-        return [item['code'] for item in data]
+        return [item.code for item in data]
 
     async def get_overseas_ranking_data(self, rank_type="volume", market_code="NAS"):
         """
-        해외 주식 순위 조회 (달러 -> 원화 변환 및 거래대금 계산 로직 개선)
+        해외 주식 순위 조회 (달러 -> 원화 변환 및 거래대금 계산 로직 개선, RankingItem 리스트)
         rank_type: volume, amount, market_cap, rise, fall
         """
         tr_id = ""
@@ -172,49 +167,47 @@ class KisDataService:
         # 2. API 호출
         output = await self._fetch_ranking(tr_id, params, path)
         
-        # 3. 현재 환율 가져오기
-        exchange_rate = await self.get_exchange_rate()
-
         results = []
         # 해외 주식 데이터 매핑 및 환율 적용
-        for item in output[:30]:
+        for item in output[:RANKING_SIZE]:
             code = item.get('symb')
             
             if not code: continue
 
             try:
                 # 1) 현재가 (달러 -> 원화)
-                price_usd = float(item.get('last') or 0)
-                price_krw = int(price_usd * exchange_rate)
+                price_usd = to_number(item.get('last'))
+                price_krw = fx_service.to_krw(price_usd)
                 
                 # 2) 거래량
-                volume = float(item.get('tvol') or 0)
+                volume = to_number(item.get('tvol'))
 
                 # 3) 거래대금 계산 (핵심 수정)
                 # 거래대금 순위(amount)나 거래량 순위(volume) API는 'tamt'(거래대금) 필드를 줍니다.
                 # 하지만 시가총액(market_cap)이나 급등락(rise/fall) API는 'tamt'를 안 주거나 'tomv'(시가총액)를 줍니다.
                 if rank_type in ["amount", "volume"] and item.get('tamt'):
-                    amount_usd = float(item['tamt'])
+                    amount_usd = to_number(item['tamt'])
                 else:
                     # 시가총액 순위, 급등락 순위에서는 직접 계산 (현재가 x 거래량)
                     amount_usd = price_usd * volume
 
                 # 원화 환산
-                amount_krw = int(amount_usd * exchange_rate)
+                amount_krw = fx_service.to_krw(amount_usd)
 
             except ValueError:
                 price_krw = 0
                 amount_krw = 0
                 volume = 0
 
-            results.append({
-                "code": code,
-                "name": item.get('name') or item.get('ename'),
-                "price": str(price_krw),         # 원화 가격
-                "change_rate": item.get('rate'), # 등락률
-                "volume": str(int(volume)),      # 거래량
-                "amount": str(amount_krw)        # 거래대금 (원화)
-            })
+            results.append(RankingItem(
+                code=code,
+                name=item.get('name') or item.get('ename'),
+                price=price_krw,                         # 원화 가격
+                change_rate=to_number(item.get('rate')), # 등락률
+                volume=volume,                           # 거래량
+                amount=amount_krw,                       # 거래대금 (원화)
+                market=market_code
+            ))
             
         return results
 
@@ -231,7 +224,7 @@ class KisDataService:
             }
             params = { "fid_cond_mrkt_div_code": "J", "fid_input_iscd": code }
 
-            async with httpx.AsyncClient() as client:
+            async with kis_client() as client:
                 url = f"{settings.KIS_BASE_URL}/uapi/domestic-stock/v1/quotations/inquire-price"
                 response = await client.get(url, headers=headers, params=params)
                 
@@ -239,13 +232,16 @@ class KisDataService:
                     res_json = response.json()
                     if res_json.get('rt_cd') == '0':
                         output = res_json.get('output', {})
-                        return {
+                        quote = {
                             "code": code,
                             "price": output.get('stck_prpr'),
+                            "diff": output.get('prdy_vrss'),
                             "change_rate": output.get('prdy_ctrt'),
                             "volume": output.get('acml_vol'),
                             "amount": output.get('acml_tr_pbmn')
                         }
+                        self.quote_cache.set(code, quote, ttl=self._quote_ttl("KR"))
+                        return quote
         except Exception:
             return None
         return None
@@ -263,7 +259,7 @@ class KisDataService:
             }
             params = { "AUTH": "", "EXCD": market_code, "SYMB": code }
 
-            async with httpx.AsyncClient() as client:
+            async with kis_client() as client:
                 url = f"{settings.KIS_BASE_URL}/uapi/overseas-price/v1/quotations/price"
                 response = await client.get(url, headers=headers, params=params)
                 
@@ -273,8 +269,7 @@ class KisDataService:
                         output = res_json.get('output', {})
                         
                         price_usd = float(output.get('last') or 0)
-                        exchange_rate = await self.get_exchange_rate()
-                        price_krw = int(price_usd * exchange_rate)
+                        price_krw = fx_service.to_krw(price_usd)
                         
                         # 단건 조회 시 거래대금(tamt)이 없으면 직접 계산
                         tamt = output.get('tamt')
@@ -282,20 +277,131 @@ class KisDataService:
                              tvol = float(output.get('tvol') or 0)
                              tamt = price_usd * tvol
                         
-                        amount_krw = int(float(tamt) * exchange_rate)
+                        amount_krw = fx_service.to_krw(tamt)
+
+                        diff_usd = float(output.get('diff') or 0)
+                        if output.get('sign') in ['4', '5']: diff_usd = -abs(diff_usd)
 
-                        return {
+                        quote = {
                             "code": code,
                             "price": str(price_krw),
+                            "diff": str(fx_service.to_krw(diff_usd)),
                             "change_rate": output.get('rate'),
                             "volume": output.get('tvol'),
                             "amount": str(amount_krw)
                         }
+                        self.quote_cache.set(code, quote, ttl=self._quote_ttl(market_code))
+                        return quote
         except Exception as e:
             logger.error(f"Overseas Price Error: {e}")
             return None
         return None
 
+    # ---------------------------------------------------------
+    # [다종목 시세] 검색 결과 / 관심종목용 일괄 조회
+    # ---------------------------------------------------------
+    async def get_quotes(self, codes, markets: dict | None = None):
+        """
+        여러 종목 현재가 일괄 조회 -> {종목코드: 시세} (조회 실패 종목은 제외)
+        1. 중복 제거
+        2. 실시간 체결 시세 / 현재가 캐시에서 바로 응답
+        3. 나머지는 시장별로 묶어서 조회
+           - 국내: 관심종목 멀티 시세 TR (최대 30종목/회)
+           - 해외: 단건 조회를 초당 호출 한도 내에서 병렬 수행
+        markets: {종목코드: 'KR' | 'NAS' ...} (없으면 종목 마스터로 판단)
+        """
+        markets = markets or {}
+        unique_codes = list(dict.fromkeys(c.strip() for c in codes if c and c.strip()))
+
+        quotes = {}
+        cold_domestic, cold_overseas = [], []
+        for code in unique_codes:
+            quote = quote_store.get(code, max_age=settings.QUOTE_CACHE_TTL) or self.quote_cache.get(code)
+            if quote:
+                quotes[code] = quote
+                continue
+
+            market = markets.get(code) or stock_info_service.code_to_market.get(code)
+            if market is None:
+                market = "KR" if code.isdigit() and len(code) == 6 else "NAS"
+            if market == "KR":
+                cold_domestic.append(code)
+            else:
+                cold_overseas.append((code, market))
+
+        async def fetch_domestic_chunk(chunk):
+            async with self.rate_limiter:
+                return await self._fetch_multi_price(chunk)
+
+        async def fetch_overseas(code, market):
+            async with self.rate_limiter:
+                return await self.get_overseas_current_price(code, market_code=market)
+
+        tasks = [fetch_domestic_chunk(cold_domestic[i:i + 30]) for i in range(0, len(cold_domestic), 30)]
+        tasks += [fetch_overseas(code, market) for code, market in cold_overseas]
+        for result in await asyncio.gather(*tasks):
+            if isinstance(result, dict) and "code" in result:
+                quotes[result["code"]] = result
+            elif isinstance(result, list):
+                for quote in result:
+                    quotes[quote["code"]] = quote
+
+        # 멀티 시세 TR 에서 빠진 국내 종목은 단건 조회로 보완
+        missing = [code for code in cold_domestic if code not in quotes]
+        if missing:
+            async def fetch_domestic(code):
+                async with self.rate_limiter:
+                    return await self.get_current_price(code)
+            for quote in await asyncio.gather(*(fetch_domestic(code) for code in missing)):
+                if quote:
+                    quotes[quote["code"]] = quote
+
+        return quotes
+
+    async def _fetch_multi_price(self, codes):
+        """국내 관심종목(멀티종목) 시세 조회 (FHKST11300006, 최대 30종목)"""
+        try:
+            token = await kis_auth.get_access_token()
+            headers = {
+                "content-type": "application/json",
+                "authorization": f"Bearer {token}",
+                "appkey": settings.KIS_APP_KEY,
+                "appsecret": settings.KIS_SECRET_KEY,
+                "tr_id": "FHKST11300006",
+                "custtype": "P"
+            }
+            params = {}
+            for i, code in enumerate(codes, start=1):
+                params[f"FID_COND_MRKT_DIV_CODE_{i}"] = "J"
+                params[f"FID_INPUT_ISCD_{i}"] = code
+
+            async with kis_client() as client:
+                url = f"{settings.KIS_BASE_URL}/uapi/domestic-stock/v1/quotations/intstock-multprice"
+                response = await client.get(url, headers=headers, params=params)
+
+                if response.status_code == 200:
+                    res_json = response.json()
+                    if res_json.get('rt_cd') == '0':
+                        results = []
+                        for output in res_json.get('output') or []:
+                            code = output.get('inter_shrn_iscd')
+                            if not code: continue
+                            quote = {
+                                "code": code,
+                                "price": output.get('inter2_prpr'),
+                                "diff": output.get('inter2_prdy_vrss'),
+                                "change_rate": output.get('prdy_ctrt'),
+                                "volume": output.get('acml_vol'),
+                                "amount": output.get('acml_tr_pbmn')
+                            }
+                            self.quote_cache.set(code, quote, ttl=self._quote_ttl("KR"))
+                            results.append(quote)
+                        return results
+                    logger.error(f"API Error (FHKST11300006): {res_json.get('msg1')}")
+        except Exception as e:
+            logger.error(f"Multi Price Error: {e}")
+        return []
+
     # ---------------------------------------------------------
     # 공통 / 유틸리티
     # ---------------------------------------------------------
@@ -312,7 +418,7 @@ class KisDataService:
                 "custtype": "P"
             }
             
-            async with httpx.AsyncClient() as client:
+            async with kis_client() as client:
                 url = f"{settings.KIS_BASE_URL}{path}"
                 response = await client.get(url, headers=headers, params=params)
                 
@@ -332,43 +438,70 @@ class KisDataService:
             logger.error(f"Fetch Ranking Error: {e}")
             return []
 
-    def _map_ranking_item(self, item):
-        """국내 주식 데이터 매핑 헬퍼"""
+    def _map_ranking_item(self, item) -> RankingItem:
+        """국내 주식 데이터 매핑 헬퍼 (수치는 여기서 한 번만 변환)"""
         code = item.get('mksc_shrn_iscd') or item.get('stck_shrn_iscd')
-        amount = item.get('acml_tr_pbmn') or item.get('tr_pbmn') or item.get('avrg_tr_pbmn')
-        price = item.get('stck_prpr')
-        rate = item.get('prdy_ctrt')
-        volume = item.get('acml_vol')
+        price = to_number(item.get('stck_prpr'))
+        volume = to_number(item.get('acml_vol'))
+        amount = to_number(item.get('acml_tr_pbmn') or item.get('tr_pbmn') or item.get('avrg_tr_pbmn'))
 
-        if not amount and price and volume:
-            try:
-                calc_amount = int(price) * int(volume)
-                amount = str(calc_amount)
-            except (ValueError, TypeError):
-                amount = "0"
-        
-        if not amount: amount = "0"
+        if not amount:
+            amount = price * volume
 
-        return {
-            "code": code,
-            "name": item.get('hts_kor_isnm'), 
-            "price": price,
-            "change_rate": rate,
-            "volume": volume,
-            "amount": amount
-        }
+        return RankingItem(
+            code=code,
+            name=item.get('hts_kor_isnm'), 
+            price=price,
+            change_rate=to_number(item.get('prdy_ctrt')),
+            volume=volume,
+            amount=amount,
+            market="KR"
+        )
 
     async def get_stock_detail(self, market: str, code: str):
         """
-        종목 상세 정보 조회
+        종목 상세 정보 조회 (2단계 캐시)
+        - 기본 정보(시가총액, PER/PBR/EPS/BPS, 상장주식수 등): DETAIL_CACHE_TTL 동안 유지
+        - 가격 정보(현재가, 전일대비, 등락률): 실시간 시세 또는 짧은 TTL 캐시로 덮어씀
+        두 단계 모두 만료 후에는 이전 값을 먼저 반환하고 백그라운드에서 갱신합니다.
         - 시가총액(market_cap)은 모두 '억 원' 단위로 통일하여 반환합니다.
         """
-        data = {
+        base = await self.detail_cache.get((market, code), lambda: self._fetch_stock_detail(market, code))
+        data = dict(base) if base else self._empty_detail(market, code)
+
+        quote = await self._get_detail_quote(market, code)
+        if quote:
+            data.update({
+                "price": quote.get("price") or data["price"],
+                "diff": quote.get("diff") or data["diff"],
+                "change_rate": quote.get("change_rate") or data["change_rate"]
+            })
+        return data
+
+    async def _get_detail_quote(self, market: str, code: str):
+        """상세 화면 가격 단계 (실시간 체결 > 가격 캐시(stale-while-revalidate))"""
+        live = quote_store.get(code, max_age=settings.QUOTE_CACHE_TTL)
+        if live:
+            return live
+
+        async def load():
+            quotes = await self.get_quotes([code], markets={code: market})
+            return quotes.get(code)
+
+        return await self.detail_price_cache.get((market, code), load, fresh_ttl=self._quote_ttl(market))
+
+    @staticmethod
+    def _empty_detail(market: str, code: str) -> dict:
+        return {
             "market": market, "code": code, "price": "0", "diff": "0",
             "change_rate": "0.00", "market_cap": "0", "shares_outstanding": "0",
             "per": "0.00", "pbr": "0.00", "eps": "0", "bps": "0",
             "open_date": "-", "vol_power": "0.00"
         }
+
+    async def _fetch_stock_detail(self, market: str, code: str):
+        """KIS 상세 조회 (실패 시 None) / 조회한 가격은 가격 캐시에도 반영"""
+        data = self._empty_detail(market, code)
         try:
             token = await kis_auth.get_access_token()
             headers = {
@@ -382,10 +515,11 @@ class KisDataService:
                 headers["tr_id"] = "FHKST01010100"
                 params = { "fid_cond_mrkt_div_code": "J", "fid_input_iscd": code }
                 path = "/uapi/domestic-stock/v1/quotations/inquire-price"
-                async with httpx.AsyncClient() as client:
+                async with kis_client() as client:
                     res = await client.get(f"{settings.KIS_BASE_URL}{path}", headers=headers, params=params)
                     if res.status_code == 200:
                         out = res.json().get('output', {})
+                        if not out: return None
                         data.update({
                             "price": out.get('stck_prpr'), "diff": out.get('prdy_vrss'),
                             "change_rate": out.get('prdy_ctrt'), 
@@ -394,17 +528,20 @@ class KisDataService:
                             "pbr": out.get('pbr'), "eps": out.get('eps'), "bps": out.get('bps'),
                             "vol_power": out.get('vol_tnrt')
                         })
+                    else:
+                        return None
             else:
                 # [해외] 데이터 직접 계산 및 환율 적용
                 headers["tr_id"] = "HHDFS76200200"
                 params = { "AUTH": "", "EXCD": "NAS", "SYMB": code }
                 path = "/uapi/overseas-price/v1/quotations/price-detail"
-                async with httpx.AsyncClient() as client:
+                async with kis_client() as client:
                     res = await client.get(f"{settings.KIS_BASE_URL}{path}", headers=headers, params=params)
                     if res.status_code == 200:
                         out = res.json().get('output', {})
-                        rate = await self.get_exchange_rate()
-                        
+                        if not out: return None
+                        rate = fx_service.rate
+
                         # 1. 가격 데이터 추출 (달러)
                         last = float(out.get('last') or 0)  # 현재가
                         base = float(out.get('base') or 0)  # 전일종가
@@ -420,11 +557,11 @@ class KisDataService:
                             change_rate = "0.00"
 
                         # 3. 원화 환산
-                        price_krw = int(last * rate)
-                        diff_krw = int(diff_usd * rate)
+                        price_krw = fx_service.to_krw(last)
+                        diff_krw = fx_service.to_krw(diff_usd)
                         market_cap_krw_eok = (tomv * rate) / 100000000 # 억 단위
-                        eps_krw = int(eps_usd * rate)
-                        bps_krw = int(bps_usd * rate)
+                        eps_krw = fx_service.to_krw(eps_usd)
+                        bps_krw = fx_service.to_krw(bps_usd)
 
                         data.update({
                             "price": str(price_krw),
@@ -437,14 +574,38 @@ class KisDataService:
                             "eps": str(eps_krw),  # 원화로 변환됨
                             "bps": str(bps_krw)   # 원화로 변환됨
                         })
+                    else:
+                        return None
         except Exception as e:
             logger.error(f"Detail Error: {e}")
+            return None
+
+        self.detail_price_cache.set((market, code), {
+            "code": code, "price": data["price"], "diff": data["diff"], "change_rate": data["change_rate"]
+        })
         return data
 
    # ---------------------------------------------------------
     # [차트 조회] 핵심 메서드
     # ---------------------------------------------------------
     async def get_stock_chart(self, market: str, code: str, period: str):
+        """
+        차트 데이터 조회 (캐시 우선)
+        - 정규장 중: CHART_CACHE_TTL 동안 유지
+        - 장외/휴장: 다음 세션 전환 시각까지 유지 (최대 CHART_CACHE_IDLE_TTL)
+        """
+        key = (market, code, period)
+        cached = self.chart_cache.get(key)
+        if cached is not None:
+            return cached
+
+        chart_data = await self._fetch_stock_chart(market, code, period)
+        if chart_data:
+            ttl = calendar_for(market).cache_ttl(settings.CHART_CACHE_TTL, settings.CHART_CACHE_IDLE_TTL)
+            self.chart_cache.set(key, chart_data, ttl=ttl)
+        return chart_data
+
+    async def _fetch_stock_chart(self, market: str, code: str, period: str):
         chart_data = []
         
         # 1. KST 시간대 정의 (UTC+9)
@@ -481,6 +642,9 @@ class KisDataService:
                     curr_date = today
                     # 실시간이면 현재 시간, 과거 조회면 장 마감 시간(15:30) 기준
                     curr_time = now_kst.strftime("%H%M%S") if is_realtime else "153000"
+                    # 정규장 마감 시각 (마감 동시호가 체결 봉 포함용)
+                    krx_hours = krx_calendar.regular_hours(now_kst.date())
+                    krx_close = krx_hours[1] if krx_hours else None
                     
                     # 페이징 (최대 100페이지)
                     for _ in range(100): 
@@ -492,7 +656,7 @@ class KisDataService:
                             "FID_PW_DATA_INCU_YN": "Y", 
                             "FID_FAKE_TICK_INCU_YN": "N"
                         }
-                        async with httpx.AsyncClient() as client:
+                        async with kis_client() as client:
                             res = await client.get(f"{settings.KIS_BASE_URL}{path}", headers=headers, params=params)
                             if res.status_code != 200: break
                             
@@ -510,9 +674,8 @@ class KisDataService:
                                         # 1. 오늘 날짜가 아니면 제외
                                         if d != today: continue
                                         
-                                        # 2. 정규장 시간(09:00 ~ 15:30) 외 데이터 제외
-                                        time_int = int(t)
-                                        if time_int < 90000 or time_int > 153000:
+                                        # 2. 정규장 시간 외 데이터 제외 (마감 시각 봉 포함)
+                                        if not (krx_calendar.is_regular(dt_kr) or dt_kr == krx_close):
                                             continue
 
                                     chart_data.append({
@@ -554,7 +717,7 @@ class KisDataService:
                             "FID_PERIOD_DIV_CODE": p_code, 
                             "FID_ORG_ADJ_PRC": "1"
                         }
-                        async with httpx.AsyncClient() as client:
+                        async with kis_client() as client:
                             res = await client.get(f"{settings.KIS_BASE_URL}{path}", headers=headers, params=params)
                             if res.status_code != 200: break
                             
@@ -600,7 +763,7 @@ class KisDataService:
                     
                     for _ in range(30):
                         params = {"AUTH":"", "EXCD":market_code, "SYMB":code, "NMIN":nmin, "PINC":"1", "NEXT":"1" if next_key else "", "NREC":"120", "KEYB":next_key}
-                        async with httpx.AsyncClient() as client:
+                        async with kis_client() as client:
                             res = await client.get(f"{settings.KIS_BASE_URL}{path}", headers=headers, params=params)
                             if res.status_code != 200: break
                             
@@ -616,18 +779,17 @@ class KisDataService:
 
                                     # [해외 실시간 필터링]
                                     if is_realtime:
-                                        time_int = int(t) # HHMMSS
-                                        # 23:30 ~ 06:00 사이의 데이터만 허용
-                                        # (233000 이상) OR (060000 이하)
-                                        if not (time_int >= 233000 or time_int <= 60000):
+                                        # 미국 정규장 (서머타임 반영: 22:30~05:00 / 23:30~06:00 KST) 데이터만 허용 (마감 시각 봉 포함, 조기 폐장 반영)
+                                        us_hours = nasdaq_calendar.regular_hours(nasdaq_calendar.local_now(dt_kr).date())
+                                        if not (nasdaq_calendar.is_regular(dt_kr) or (us_hours and dt_kr == us_hours[1])):
                                             continue
 
                                     chart_data.append({
                                         "time": ts, 
-                                        "open": float(item['open']), 
-                                        "high": float(item['high']), 
-                                        "low": float(item['low']), 
-                                        "close": float(item['last']), 
+                                        "open": fx_service.to_krw(item['open']), 
+                                        "high": fx_service.to_krw(item['high']), 
+                                        "low": fx_service.to_krw(item['low']), 
+                                        "close": fx_service.to_krw(item['last']), 
                                         "volume": float(item['evol'] or 0)
                                     })
                             
@@ -641,8 +803,9 @@ class KisDataService:
                     # [해외 분봉 병합] (실시간이 아닐 때만)
                     if not is_realtime and period != '1m' and period != 'minute':
                          interval = int(period.replace('m', ''))
-                         # 해외 시작시간: 23:30
-                         chart_data = self._aggregate_minute_data(chart_data, interval, start_h=23, start_m=30)
+                         # 해외 시작시간: 정규장 시작 (KST, 서머타임 반영)
+                         us_open = nasdaq_calendar.local_now().replace(hour=9, minute=30).astimezone(KST)
+                         chart_data = self._aggregate_minute_data(chart_data, interval, start_h=us_open.hour, start_m=us_open.minute)
 
                 else:
                     # [해외 일봉/주봉/월봉]
@@ -653,7 +816,7 @@ class KisDataService:
                     
                     for _ in range(5):
                         params = {"AUTH":"", "EXCD":market_code, "SYMB":code, "GUBN":gubn, "BYMD":curr_base_date, "MODP":"1"}
-                        async with httpx.AsyncClient() as client:
+                        async with kis_client() as client:
                             res = await client.get(f"{settings.KIS_BASE_URL}{path}", headers=headers, params=params)
                             if res.status_code != 200: break
                             
@@ -669,10 +832,10 @@ class KisDataService:
 
                                     chart_data.append({
                                         "time": ts, 
-                                        "open": float(item['open']), 
-                                        "high": float(item['high']), 
-                                        "low": float(item['low']), 
-                                        "close": float(item['clos']), 
+                                        "open": fx_service.to_krw(item['open']), 
+                                        "high": fx_service.to_krw(item['high']), 
+                                        "low": fx_service.to_krw(item['low']), 
+                                        "close": fx_service.to_krw(item['clos']), 
                                         "volume": float(item['tvol'] or 0)
                                     })
                                     
@@ -774,6 +937,71 @@ class KisDataService:
         # 마지막 버킷 추가
         if current_bucket: aggregated.append(current_bucket['data'])
         return aggregated
+
+    # ---------------------------------------------------------
+    # [호가 조회] 10단계 매도/매수 호가
+    # ---------------------------------------------------------
+    async def get_hoga(self, market: str, code: str):
+        """
+        호가 스냅샷 조회 (REST)
+        - 국내: FHKST01010200 / 해외: HHDFS76200100 (원화 환산)
+        - 반환 형식은 OrderBook.snapshot() 과 동일합니다.
+        """
+        book = OrderBook(code)
+
+        try:
+            token = await kis_auth.get_access_token()
+            headers = {
+                "content-type": "application/json",
+                "authorization": f"Bearer {token}",
+                "appkey": settings.KIS_APP_KEY,
+                "appsecret": settings.KIS_SECRET_KEY
+            }
+
+            if market == "KR":
+                headers["tr_id"] = "FHKST01010200"
+                path = "/uapi/domestic-stock/v1/quotations/inquire-asking-price-exp-ccn"
+                params = { "FID_COND_MRKT_DIV_CODE": "J", "FID_INPUT_ISCD": code }
+
+                async with kis_client() as client:
+                    res = await client.get(f"{settings.KIS_BASE_URL}{path}", headers=headers, params=params)
+                    if res.status_code == 200:
+                        out = res.json().get('output1') or {}
+                        asks = [(out.get(f'askp{i}') or "0", out.get(f'askp_rsqn{i}') or "0") for i in range(1, HOGA_LEVELS + 1)]
+                        bids = [(out.get(f'bidp{i}') or "0", out.get(f'bidp_rsqn{i}') or "0") for i in range(1, HOGA_LEVELS + 1)]
+                        book.apply(
+                            asks, bids,
+                            out.get('total_askp_rsqn') or "0",
+                            out.get('total_bidp_rsqn') or "0",
+                            out.get('aspr_acpt_hour')
+                        )
+            else:
+                headers["tr_id"] = "HHDFS76200100"
+                path = "/uapi/overseas-price/v1/quotations/inquire-asking-price"
+                params = { "AUTH": "", "EXCD": "NAS", "SYMB": code }
+
+                async with kis_client() as client:
+                    res = await client.get(f"{settings.KIS_BASE_URL}{path}", headers=headers, params=params)
+                    if res.status_code == 200:
+                        body = res.json()
+                        out = body.get('output2') or {}
+                        if isinstance(out, list): out = out[0] if out else {}
+                        def to_krw(v):
+                            return str(fx_service.to_krw(v))
+
+                        asks = [(to_krw(out.get(f'pask{i}')), out.get(f'vask{i}') or "0") for i in range(1, HOGA_LEVELS + 1)]
+                        bids = [(to_krw(out.get(f'pbid{i}')), out.get(f'vbid{i}') or "0") for i in range(1, HOGA_LEVELS + 1)]
+                        head = body.get('output1') or {}
+                        book.apply(
+                            asks, bids,
+                            str(sum(int(float(v or 0)) for _, v in asks)),
+                            str(sum(int(float(v or 0)) for _, v in bids)),
+                            head.get('dhms') or head.get('khms')
+                        )
+        except Exception as e:
+            logger.error(f"Hoga Error: {e}")
+
+        return book.snapshot()
 # =========================================================
     # 2. [최종_진짜_완성] 해외 체결 (날짜 필터링 + 시간 필터링 + 정렬)
     # =========================================================
@@ -798,7 +1026,7 @@ class KisDataService:
 
                 params = { "FID_COND_MRKT_DIV_CODE": "J", "FID_INPUT_ISCD": code, "FID_INPUT_HOUR_1": curr_time }
                 
-                async with httpx.AsyncClient() as client:
+                async with kis_client() as client:
                     res = await client.get(f"{settings.KIS_BASE_URL}{path}", headers=headers, params=params)
                     
                     if res.status_code == 200:
@@ -828,13 +1056,12 @@ class KisDataService:
                 path = "/uapi/overseas-price/v1/quotations/inquire-ccnl"
                 params = { "AUTH": "", "EXCD": "NAS", "SYMB": code }
 
-                async with httpx.AsyncClient() as client:
+                async with kis_client() as client:
                     res = await client.get(f"{settings.KIS_BASE_URL}{path}", headers=headers, params=params)
                     if res.status_code == 200:
                         items = res.json().get('output1')
                         if items is None: items = []
                         
-                        rate = await self.get_exchange_rate()
                         if items and isinstance(items, list) and len(items) > 0: 
                             vol_power = items[0].get('vpow') or "0.00"
 
@@ -851,7 +1078,7 @@ class KisDataService:
                                     continue
 
                                 price_usd = float(item.get('last') or 0)
-                                price_krw = int(price_usd * rate)
+                                price_krw = fx_service.to_krw(price_usd)
                                 
                                 sign = item.get('sign')
                                 diff_usd = float(item.get('diff') or 0)
@@ -875,7 +1102,7 @@ class KisDataService:
                                 temp_list.append({
                                     "time": kst_time_str,
                                     "price": str(price_krw),
-                                    "diff": str(int(diff_usd * rate)),
+                                    "diff": str(fx_service.to_krw(diff_usd)),
                                     "rate": item.get('rate') or "0.00",
                                     "volume": item.get('evol') or "0",
                                     "total_vol": item.get('tvol') or "0",
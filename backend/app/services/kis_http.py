@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import re
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.profiling import record_upstream, upstream_boundary
+
+logger = logging.getLogger(__name__)
+
+# 초당 거래건수 초과 (KIS 호출 제한) 응답 코드
+THROTTLE_MSG_CD = "EGW00201"
+
+_RT_CD = re.compile(rb'"rt_cd"\s*:\s*"([^"]*)"')
+_MSG_CD = re.compile(rb'"msg_cd"\s*:\s*"([^"]*)"')
+
+kis_request_seconds = registry.histogram(
+    "kis_request_duration_seconds", "KIS REST request latency", ("tr_id",)
+)
+kis_requests_total = registry.counter(
+    "kis_requests_total", "KIS REST requests by HTTP status and rt_cd", ("tr_id", "status", "rt_cd")
+)
+kis_retries_total = registry.counter(
+    "kis_retries_total", "KIS REST requests retried after throttling (EGW00201)", ("tr_id",)
+)
+kis_response_bytes_total = registry.counter(
+    "kis_response_bytes_total", "KIS REST response body bytes", ("tr_id",)
+)
+
+def _tr_id(request: httpx.Request) -> str:
+    # 토큰 발급 등 tr_id 헤더가 없는 호출은 경로로 구분
+    return request.headers.get("tr_id") or request.url.path
+
+def _match(pattern, body: bytes) -> str:
+    found = pattern.search(body[:512]) or pattern.search(body)
+    return found.group(1).decode() if found else ""
+
+class KisTransport(httpx.AsyncBaseTransport):
+    """
+    KIS 호출 계측 transport
+    - tr_id 별 지연 시간, HTTP 상태/rt_cd 결과, 응답 크기 기록
+    - 호출 제한(EGW00201) 응답은 짧게 대기 후 재시도
+    """
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None, max_retries: int | None = None):
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self.max_retries = settings.KIS_THROTTLE_RETRIES if max_retries is None else max_retries
+
+    @upstream_boundary
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        tr_id = _tr_id(request)
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = await self._transport.handle_async_request(request)
+                body = await response.aread()
+            except Exception:
+                kis_request_seconds.observe(time.perf_counter() - start, tr_id=tr_id)
+                kis_requests_total.inc(tr_id=tr_id, status="error", rt_cd="")
+                record_upstream(start, time.perf_counter())
+                raise
+            stop = time.perf_counter()
+            kis_request_seconds.observe(stop - start, tr_id=tr_id)
+            record_upstream(start, stop)
+            kis_response_bytes_total.inc(len(body), tr_id=tr_id)
+
+            rt_cd = _match(_RT_CD, body)
+            kis_requests_total.inc(tr_id=tr_id, status=response.status_code, rt_cd=rt_cd)
+
+            if attempt < self.max_retries and _match(_MSG_CD, body) == THROTTLE_MSG_CD:
+                attempt += 1
+                kis_retries_total.inc(tr_id=tr_id)
+                await response.aclose()
+                await asyncio.sleep(settings.KIS_THROTTLE_BACKOFF * attempt)
+                continue
+            return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+def kis_client(**kwargs) -> httpx.AsyncClient:
+    """KIS 호출용 httpx 클라이언트 (계측/재시도 transport 적용)"""
+    return httpx.AsyncClient(transport=KisTransport(), **kwargs)
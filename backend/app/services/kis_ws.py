@@ -1,26 +1,52 @@
 import logging
 import json
 import asyncio
+import time
 import websockets
 from collections import defaultdict
 from app.services.kis_auth import kis_auth
 from app.services.kis_data import kis_data
 from app.services.stock_info import stock_info_service 
+from app.services.order_book import OrderBook, HOGA_LEVELS
+from app.services.trade_tape import trade_tape
+from app.services.quote_store import quote_store
+from app.services.fx import fx_service
+from app.services.tick_trace import tick_tracer
+from app.services.tick_capture import tick_recorder
 from app.core.config import settings
+from app.core.metrics import registry
 from datetime import datetime, timedelta, timezone
 
 logger = logging.getLogger(__name__)
 
+# KST 시간대 정의
+KST = timezone(timedelta(hours=9))
+
+kis_stream_frames_total = registry.counter(
+    "kis_stream_frames_total", "Realtime frames received from the KIS WebSocket", ("tr_id",)
+)
+ws_fanout_seconds = registry.histogram(
+    "ws_fanout_duration_seconds", "Time to send one update to every subscriber of a code", ("channel",)
+)
+ws_messages_sent_total = registry.counter(
+    "ws_messages_sent_total", "Messages sent to browser WebSocket clients", ("channel",)
+)
+ws_dropped_clients_total = registry.counter(
+    "ws_dropped_clients_total", "Browser WebSocket clients dropped after a failed send", ("channel",)
+)
+
 class KISWebSocketManager:
     def __init__(self):
         self.subscriptions = defaultdict(set) 
+        self.hoga_subscriptions = defaultdict(set)  # 호가 구독자 (종목코드 -> 웹소켓)
+        self.order_books = {}  # 종목코드 -> OrderBook (호가 구독 중인 종목만 유지)
         self.kis_websocket = None 
         self.approval_key = None
         self._stream_task = None
 
     async def get_approval_key(self):
-        if not self.approval_key:
-            self.approval_key = await kis_auth.get_approval_key()
+        # kis_auth 가 메모리 캐시 및 만료 전 갱신을 담당
+        self.approval_key = await kis_auth.get_approval_key()
         return self.approval_key
 
     async def connect_client(self, websocket, code: str):
@@ -31,12 +57,15 @@ class KISWebSocketManager:
         # 1. 접속 즉시 스냅샷 (REST API)
         asyncio.create_task(self.send_snapshot(websocket, code))
 
-        # 2. KIS 웹소켓 연결 확인
-        if self.kis_websocket is None:
-            if not self._stream_task or self._stream_task.done():
-                self._stream_task = asyncio.create_task(self.start_kis_stream())
+        # 2. 첫 구독자라면 체결 링버퍼 생성 후 REST 체결 내역으로 1회 시드
+        if len(self.subscriptions[code]) == 1:
+            trade_tape.open(code)
+            asyncio.create_task(self._seed_trade_tape(code))
+
+        # 3. KIS 웹소켓 연결 확인
+        self._ensure_stream()
         
-        # 3. 구독 요청
+        # 4. 구독 요청
         if self.kis_websocket:
             await self.send_kis_subscription(code, "1")
 
@@ -45,21 +74,107 @@ class KISWebSocketManager:
             self.subscriptions[code].discard(websocket)
             if not self.subscriptions[code]:
                 del self.subscriptions[code]
+                trade_tape.drop(code)
+                quote_store.discard(code)
+                tick_tracer.forget_code(code)
+                # 마지막 구독자가 나가면 KIS 체결가 구독 해제
+                await self.send_kis_subscription(code, "2")
+
+    async def get_recent_trades(self, market: str, code: str, limit: int = 30):
+        """
+        최근 체결 내역
+        실시간 구독 중인 종목은 링버퍼에서 바로 반환하고, 아니면 REST API로 조회합니다.
+        """
+        if trade_tape.is_ready(code):
+            return trade_tape.recent(code, limit)
+
+        result = await kis_data.get_recent_trades(market, code)
+        if code in self.subscriptions:
+            trade_tape.seed(code, result["trades"], result["vol_power"])
+            return trade_tape.recent(code, limit)
+        return result
+
+    async def _seed_trade_tape(self, code: str):
+        try:
+            market = "KR" if self._is_domestic(code) else "NAS"
+            result = await kis_data.get_recent_trades(market, code)
+            trade_tape.seed(code, result["trades"], result["vol_power"])
+        except Exception as e:
+            logger.error(f"Trade Tape Seed Error: {e}")
+
+    def _record_tick(self, code, data, amount):
+        """실시간 체결을 최신 시세 저장소와 체결 링버퍼에 반영"""
+        quote_store.update(code, {
+            "code": code,
+            "price": data["price"],
+            "diff": data["change"],
+            "change_rate": data["rate"],
+            "volume": data["acml_vol"],
+            "amount": amount
+        })
+        # 링버퍼는 REST 체결 내역과 같은 필드명 사용
+        trade_tape.append(code, {
+            "time": data["time"],
+            "price": data["price"],
+            "diff": data["change"],
+            "rate": data["rate"],
+            "volume": data["volume"],
+            "total_vol": data["acml_vol"],
+            "vol_power": data["power"]
+        })
+
+    async def connect_hoga_client(self, websocket, code: str):
+        """호가 구독: 접속 즉시 전체 호가 1회 전송 후 변경분(diff)만 전송"""
+        await websocket.accept()
+        self.hoga_subscriptions[code].add(websocket)
+        logger.info(f"✅ [{code}] 호가 클라이언트 입장. 현재 구독자: {len(self.hoga_subscriptions[code])}명")
 
-    async def send_kis_subscription(self, code, tr_type="1"):
-        """국내/해외 구분하여 구독 요청"""
+        # 1. 접속 즉시 스냅샷 (메모리 호가가 없으면 REST API로 채움)
+        asyncio.create_task(self.send_hoga_snapshot(websocket, code))
+
+        # 2. KIS 웹소켓 연결 확인 및 구독 요청 (같은 종목은 한 번만 구독)
+        self._ensure_stream()
+        if self.kis_websocket and len(self.hoga_subscriptions[code]) == 1:
+            await self.send_kis_subscription(code, "1", self._hoga_tr_id(code))
+
+    async def disconnect_hoga_client(self, websocket, code: str):
+        if code in self.hoga_subscriptions:
+            self.hoga_subscriptions[code].discard(websocket)
+            if not self.hoga_subscriptions[code]:
+                del self.hoga_subscriptions[code]
+                self.order_books.pop(code, None)
+                # 마지막 구독자가 나가면 KIS 호가 구독 해제
+                await self.send_kis_subscription(code, "2", self._hoga_tr_id(code))
+
+    def _ensure_stream(self):
+        """KIS 웹소켓 스트림 태스크가 없으면 시작"""
+        if self.kis_websocket is None:
+            if not self._stream_task or self._stream_task.done():
+                self._stream_task = asyncio.create_task(self.start_kis_stream())
+
+    @staticmethod
+    def _is_domestic(code: str) -> bool:
+        # 국내 주식: 6자리 숫자 (예: 005930) / 해외 주식: 영문 (예: TSLA, AAPL)
+        return code.isdigit() and len(code) == 6
+
+    def _trade_tr_id(self, code: str) -> str:
+        """체결가 TR ID (국내 H0STCNT0 / 해외 H0GSCNT0)"""
+        return "H0STCNT0" if self._is_domestic(code) else "H0GSCNT0"
+
+    def _hoga_tr_id(self, code: str) -> str:
+        """호가 TR ID (국내 H0STASP0 / 해외 HDFSASP0)"""
+        return "H0STASP0" if self._is_domestic(code) else "HDFSASP0"
+
+    async def send_kis_subscription(self, code, tr_type="1", tr_id=None):
+        """국내/해외 구분하여 구독 요청 (tr_id 미지정 시 체결가)"""
         if self.kis_websocket is None: return
 
         try:
             key = await self.get_approval_key()
             
             # [핵심] 국내/해외 TR ID 구분 로직
-            # 국내 주식: 6자리 숫자 (예: 005930) -> H0STCNT0
-            # 해외 주식: 영문 (예: TSLA, AAPL) -> H0GSCNT0
-            if code.isdigit() and len(code) == 6:
-                tr_id = "H0STCNT0" # 국내
-            else:
-                tr_id = "H0GSCNT0" # 해외 (미국)
+            if tr_id is None:
+                tr_id = self._trade_tr_id(code)
 
             req = {
                 "header": {
@@ -104,13 +219,39 @@ class KISWebSocketManager:
         except Exception as e:
             logger.error(f"Snapshot Error: {e}")
 
+    async def send_hoga_snapshot(self, websocket, code):
+        """호가 전체 스냅샷 1회 전송 (메모리 호가 우선, 없으면 REST API로 시드)"""
+        try:
+            book = self.order_books.get(code)
+            if book is None:
+                market = "KR" if self._is_domestic(code) else "NAS"
+                snapshot = await kis_data.get_hoga(market, code)
+                # REST 조회 중 실시간 호가가 먼저 도착했다면 그쪽이 최신
+                book = self.order_books.get(code)
+                if book is None and code in self.hoga_subscriptions:
+                    book = self.order_books[code] = OrderBook(code)
+                    book.apply(
+                        [(a["price"], a["volume"]) for a in snapshot["asks"]],
+                        [(b["price"], b["volume"]) for b in snapshot["bids"]],
+                        snapshot["total_ask_volume"], snapshot["total_bid_volume"],
+                        snapshot["time"]
+                    )
+            if book is not None:
+                await websocket.send_text(json.dumps(book.snapshot()))
+        except Exception as e:
+            logger.error(f"Hoga Snapshot Error: {e}")
+
+    def _apply_hoga(self, code, asks, bids, total_ask, total_bid, time):
+        """실시간 호가를 메모리 호가에 반영하고 diff 반환"""
+        book = self.order_books.get(code)
+        if book is None:
+            book = self.order_books[code] = OrderBook(code)
+        return book.apply(asks, bids, total_ask, total_bid, time)
+
     async def start_kis_stream(self):
         """KIS 웹소켓 연결 유지 및 데이터 분배 (Main Loop)"""
         ws_url = settings.KIS_WS_URL
-        
-        # KST 시간대 정의
-        KST = timezone(timedelta(hours=9))
-        
+
         while True:
             try:
                 async with websockets.connect(f"{ws_url}/tryitout/H0STCNT0", ping_interval=60) as ws:
@@ -121,79 +262,175 @@ class KISWebSocketManager:
                         await self.send_kis_subscription(code, "1")
                         await asyncio.sleep(0.1)
 
+                    for code in list(self.hoga_subscriptions.keys()):
+                        await self.send_kis_subscription(code, "1", self._hoga_tr_id(code))
+                        await asyncio.sleep(0.1)
+
                     while True:
                         msg = await ws.recv()
-                        
-                        if msg[0] in ['0', '1']:
-                            parts = msg.split('|')
-                            if len(parts) > 3:
-                                tr_id = parts[1]
-                                raw_data = parts[3]
-                                fields = raw_data.split('^')
-                                
-                                # 1. [국내 주식] H0STCNT0 (기존 동일)
-                                if tr_id == "H0STCNT0" and len(fields) > 13:
-                                    code = fields[0]
-                                    if code in self.subscriptions:
-                                        data = {
-                                            "type": "trade", 
-                                            "code": code,
-                                            "time": fields[1], # 국내는 한국 시간이니 그대로 사용
-                                            "price": fields[2],
-                                            "change": fields[4],
-                                            "rate": fields[5],
-                                            "volume": fields[12],
-                                            "acml_vol": fields[13], 
-                                            "power": fields[16] if len(fields) > 16 else "0.00"
-                                        }
-                                        await self.broadcast(code, data)
-
-                                # 2. [해외 주식] H0GSCNT0 (시간 수정)
-                                elif tr_id == "H0GSCNT0" and len(fields) > 12:
-                                    code = fields[0]
-                                    if code in self.subscriptions:
-                                        rate = 1460.0 
-                                        
-                                        try:
-                                            price_usd = float(fields[2])
-                                            price_krw = int(price_usd * rate)
-                                            
-                                            change_usd = float(fields[4])
-                                            change_krw = int(change_usd * rate)
-                                            
-                                            # [핵심 수정] 미국 현지 시간을 버리고, 현재 한국 시간으로 대체
-                                            # fields[1] (미국시간) -> datetime.now(KST)
-                                            current_kst_time = datetime.now(KST).strftime("%H%M%S")
-
-                                            data = {
-                                                "type": "trade", 
-                                                "code": code,
-                                                "time": current_kst_time, # ★ 여기를 수정했습니다!
-                                                "price": str(price_krw),
-                                                "change": str(change_krw),
-                                                "rate": fields[5],
-                                                "volume": fields[12],
-                                                "acml_vol": fields[11], 
-                                                "power": "0.00"
-                                            }
-                                            await self.broadcast(code, data)
-                                        except:
-                                            pass
+                        recv_ts = time.perf_counter()
+                        tick_recorder.record(msg)
+                        await self.handle_frame(msg, recv_ts)
 
             except Exception as e:
                 logger.error(f"KIS WS Disconnected: {e}")
                 self.kis_websocket = None
                 await asyncio.sleep(3) 
 
-    async def broadcast(self, code, data):
-        """해당 종목 구독자에게 데이터 전송"""
-        if code in self.subscriptions:
+    async def handle_frame(self, msg: str, recv_ts: float | None = None):
+        """
+        KIS 실시간 프레임 1건 처리 (파싱 -> 시세/체결 저장 -> 구독자 전송)
+        - recv_ts: 수신 시각 (time.perf_counter), 단계별 지연 추적 기준
+        """
+        if recv_ts is None:
+            recv_ts = time.perf_counter()
+        if not msg or msg[0] not in ('0', '1'):
+            return
+
+        parts = msg.split('|')
+        if len(parts) <= 3:
+            return
+        tr_id = parts[1]
+        raw_data = parts[3]
+        kis_stream_frames_total.inc(tr_id=tr_id)
+        fields = raw_data.split('^')
+
+        # 부하 테스트용 수신 시각 (epoch ms) - 브라우저까지의 지연 측정
+        recv_ms = int(time.time() * 1000) if settings.TICK_TRACE_TIMESTAMPS else None
+
+        # 1. [국내 주식] H0STCNT0 (기존 동일)
+        if tr_id == "H0STCNT0" and len(fields) > 13:
+            code = fields[0]
+            if code in self.subscriptions:
+                data = {
+                    "type": "trade", 
+                    "code": code,
+                    "time": fields[1], # 국내는 한국 시간이니 그대로 사용
+                    "price": fields[2],
+                    "change": fields[4],
+                    "rate": fields[5],
+                    "volume": fields[12],
+                    "acml_vol": fields[13], 
+                    "power": fields[16] if len(fields) > 16 else "0.00"
+                }
+                self._record_tick(code, data, fields[14] if len(fields) > 14 else "0")
+                if recv_ms: data["ts"] = recv_ms
+                await self.broadcast(code, data, (recv_ts, time.perf_counter()))
+
+        # 2. [해외 주식] H0GSCNT0 (시간 수정)
+        elif tr_id == "H0GSCNT0" and len(fields) > 12:
+            code = fields[0]
+            if code in self.subscriptions:
+                try:
+                    # 환율은 fx_service 한 곳에서 (상세/순위/차트와 동일한 값)
+                    price_usd = float(fields[2])
+                    price_krw = fx_service.to_krw(price_usd)
+
+                    change_krw = fx_service.to_krw(fields[4])
+
+                    # [핵심 수정] 미국 현지 시간을 버리고, 현재 한국 시간으로 대체
+                    # fields[1] (미국시간) -> datetime.now(KST)
+                    current_kst_time = datetime.now(KST).strftime("%H%M%S")
+
+                    data = {
+                        "type": "trade", 
+                        "code": code,
+                        "time": current_kst_time, # ★ 여기를 수정했습니다!
+                        "price": str(price_krw),
+                        "change": str(change_krw),
+                        "rate": fields[5],
+                        "volume": fields[12],
+                        "acml_vol": fields[11], 
+                        "power": "0.00"
+                    }
+                    amount_krw = fx_service.to_krw(price_usd * float(fields[11] or 0))
+                    self._record_tick(code, data, str(amount_krw))
+                    if recv_ms: data["ts"] = recv_ms
+                    await self.broadcast(code, data, (recv_ts, time.perf_counter()))
+                except:
+                    pass
+
+        # 3. [국내 호가] H0STASP0 (10단계 매도/매수 호가 + 잔량)
+        elif tr_id == "H0STASP0" and len(fields) > 44:
+            code = fields[0]
+            if code in self.hoga_subscriptions:
+                asks = list(zip(fields[3:13], fields[23:33]))
+                bids = list(zip(fields[13:23], fields[33:43]))
+                diff = self._apply_hoga(code, asks, bids, fields[43], fields[44], fields[1])
+                if diff:
+                    await self.broadcast_hoga(code, diff, (recv_ts, time.perf_counter()))
+
+        # 4. [해외 호가] HDFSASP0 (단계별 매수가/매도가/매수잔량/매도잔량 반복)
+        elif tr_id == "HDFSASP0" and len(fields) > 14:
+            code = fields[1] or fields[0]
+            if code in self.hoga_subscriptions:
+                try:
+                    asks, bids = [], []
+                    for i in range(HOGA_LEVELS):
+                        base = 11 + i * 6
+                        if len(fields) < base + 4: break
+                        bids.append((str(fx_service.to_krw(fields[base])), fields[base + 2]))
+                        asks.append((str(fx_service.to_krw(fields[base + 1])), fields[base + 3]))
+
+                    current_kst_time = datetime.now(KST).strftime("%H%M%S")
+                    diff = self._apply_hoga(code, asks, bids, fields[8], fields[7], current_kst_time)
+                    if diff:
+                        await self.broadcast_hoga(code, diff, (recv_ts, time.perf_counter()))
+                except (ValueError, IndexError):
+                    pass
+
+    async def broadcast(self, code, data, trace=None):
+        """해당 종목 구독자에게 데이터 전송 (trace: (수신 시각, 파싱 완료 시각))"""
+        await self._fan_out(self.subscriptions, code, data, "trade", trace)
+
+    async def broadcast_hoga(self, code, data, trace=None):
+        """해당 종목 호가 구독자에게 데이터 전송"""
+        await self._fan_out(self.hoga_subscriptions, code, data, "hoga", trace)
+
+    async def _fan_out(self, pool, code, data, channel, trace=None):
+        if code in pool:
+            start = time.perf_counter()
+            if trace and tick_tracer.sample():
+                recv_ts, parsed_ts = trace
+                tick_tracer.record_stages(channel, recv_ts, parsed_ts, start)
+            else:
+                trace = None
+
             json_data = json.dumps(data)
-            targets = self.subscriptions[code].copy()
+            targets = pool[code].copy()
+            sent = 0
             for client in targets:
                 try:
+                    send_started = time.perf_counter()
                     await client.send_text(json_data)
+                    sent += 1
+                    if trace:
+                        tick_tracer.record_send(client, code, channel, recv_ts, send_started)
                 except:
-                    self.subscriptions[code].discard(client)
+                    pool[code].discard(client)
+                    ws_dropped_clients_total.inc(channel=channel)
+            elapsed = time.perf_counter() - start
+            ws_fanout_seconds.observe(elapsed, channel=channel)
+            ws_messages_sent_total.inc(sent, channel=channel)
+            if trace:
+                tick_tracer.record_fanout(code, elapsed)
+
+kis_ws_manager = KISWebSocketManager()
 
-kis_ws_manager = KISWebSocketManager()
\ No newline at end of file
+# ---------------------------------------------------------------------
+# 구독 현황 (수집 시점 계산)
+# ---------------------------------------------------------------------
+registry.gauge(
+    "ws_clients", "Connected browser WebSocket clients", ("channel",),
+    collect=lambda: {
+        ("trade",): sum(len(c) for c in kis_ws_manager.subscriptions.values()),
+        ("hoga",): sum(len(c) for c in kis_ws_manager.hoga_subscriptions.values())
+    }
+)
+registry.gauge(
+    "ws_subscribed_codes", "Codes subscribed on the KIS stream", ("channel",),
+    collect=lambda: {
+        ("trade",): len(kis_ws_manager.subscriptions),
+        ("hoga",): len(kis_ws_manager.hoga_subscriptions)
+    }
+)
\ No newline at end of file
@@ -0,0 +1,182 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+from app.core.config import settings
+
+KST = timezone(timedelta(hours=9))
+EST = timezone(timedelta(hours=-5))
+EDT = timezone(timedelta(hours=-4))
+
+# 세션 구분
+PRE = "pre"          # 장전 (국내 장전 시간외/동시호가, 미국 프리마켓)
+REGULAR = "regular"  # 정규장
+POST = "post"        # 장후 (국내 시간외, 미국 애프터마켓)
+CLOSED = "closed"
+
+# ---------------------------------------------------------------------
+# 휴장일 (매년 거래소 공지 기준으로 갱신 / 추가분은 .env 의 MARKET_EXTRA_HOLIDAYS_* 로 보완)
+# ---------------------------------------------------------------------
+KRX_HOLIDAYS = {
+    # 2025
+    "20250101", "20250127", "20250128", "20250129", "20250130", "20250303", "20250501",
+    "20250505", "20250506", "20250603", "20250606", "20250815", "20251003", "20251006",
+    "20251007", "20251008", "20251009", "20251225", "20251231",
+    # 2026
+    "20260101", "20260216", "20260217", "20260218", "20260302", "20260501", "20260505",
+    "20260525", "20260603", "20260817", "20260924", "20260925", "20261005", "20261009",
+    "20261225", "20261231",
+}
+
+US_HOLIDAYS = {
+    # 2025
+    "20250101", "20250109", "20250120", "20250217", "20250418", "20250526", "20250619",
+    "20250704", "20250901", "20251127", "20251225",
+    # 2026
+    "20260101", "20260119", "20260216", "20260403", "20260525", "20260619", "20260703",
+    "20260907", "20261126", "20261225",
+    # 2027
+    "20270101", "20270118", "20270215", "20270326", "20270531", "20270618", "20270705",
+    "20270906", "20271125", "20271224",
+}
+
+# 미국 조기 폐장일 (정규장 13:00 ET 종료)
+US_EARLY_CLOSES = {
+    "20250703", "20251128", "20251224",
+    "20261127", "20261224",
+    "20271126",
+}
+
+def _parse_dates(values) -> set:
+    return {datetime.strptime(v.strip(), "%Y%m%d").date() for v in values if v.strip()}
+
+def _nth_sunday(year: int, month: int, n: int) -> date:
+    first = date(year, month, 1)
+    return first + timedelta(days=(6 - first.weekday()) % 7, weeks=n - 1)
+
+def us_eastern_tz(moment: datetime) -> timezone:
+    """
+    미국 동부 시간대 (서머타임 직접 계산)
+    3월 둘째 일요일 02:00 EST ~ 11월 첫째 일요일 02:00 EDT 구간은 UTC-4, 그 외 UTC-5
+    """
+    utc = moment.astimezone(timezone.utc)
+    dst_start = datetime.combine(_nth_sunday(utc.year, 3, 2), time(7), tzinfo=timezone.utc)
+    dst_end = datetime.combine(_nth_sunday(utc.year, 11, 1), time(6), tzinfo=timezone.utc)
+    return EDT if dst_start <= utc < dst_end else EST
+
+class MarketCalendar:
+    """
+    거래소 세션 달력
+    - 세션 구간은 현지 시각으로 정의 (미국은 서머타임 자동 반영)
+    - 모든 datetime 입력은 timezone-aware 기준
+    """
+    def __init__(self, name: str, tz_for, windows, holidays, early_closes=None):
+        self.name = name
+        self._tz_for = tz_for
+        self.windows = windows                  # [(세션, 시작, 종료)] 현지 시각, 시간순
+        self.holidays = holidays                # set[date]
+        self.early_closes = early_closes or {}  # date -> 정규장 조기 종료 시각
+
+    def local_now(self, now: datetime | None = None) -> datetime:
+        now = now or datetime.now(timezone.utc)
+        return now.astimezone(self._tz_for(now))
+
+    def is_trading_day(self, d: date) -> bool:
+        return d.weekday() < 5 and d not in self.holidays
+
+    def previous_trading_day(self, d: date) -> date:
+        d -= timedelta(days=1)
+        while not self.is_trading_day(d):
+            d -= timedelta(days=1)
+        return d
+
+    def last_trading_day(self, now: datetime | None = None) -> date:
+        """현지 기준 오늘이 거래일이면 오늘, 아니면 직전 거래일"""
+        today = self.local_now(now).date()
+        return today if self.is_trading_day(today) else self.previous_trading_day(today)
+
+    def sessions_on(self, d: date):
+        """해당 현지 날짜의 세션 구간 [(세션, 시작 datetime, 종료 datetime)] (휴장일이면 [])"""
+        if not self.is_trading_day(d):
+            return []
+        tz = self._tz_for(datetime.combine(d, time(12), tzinfo=timezone.utc))
+        early_close = self.early_closes.get(d)
+
+        result = []
+        for session, start, end in self.windows:
+            if early_close:
+                if session == REGULAR:
+                    end = early_close
+                elif session == POST:
+                    start = early_close
+            result.append((session, datetime.combine(d, start, tzinfo=tz), datetime.combine(d, end, tzinfo=tz)))
+        return result
+
+    def session(self, now: datetime | None = None) -> str:
+        local = self.local_now(now)
+        for session, start, end in self.sessions_on(local.date()):
+            if start <= local < end:
+                return session
+        return CLOSED
+
+    def is_regular(self, moment: datetime) -> bool:
+        """해당 시각(예: 분봉 시각)이 정규장 구간인지"""
+        return self.session(moment) == REGULAR
+
+    def regular_hours(self, d: date):
+        """정규장 (시작, 종료) datetime / 휴장일이면 None"""
+        for session, start, end in self.sessions_on(d):
+            if session == REGULAR:
+                return start, end
+        return None
+
+    def next_change(self, now: datetime | None = None) -> datetime:
+        """다음 세션 전환 시각 (최대 2주 앞까지 탐색)"""
+        local = self.local_now(now)
+        d = local.date()
+        for _ in range(14):
+            for _, start, end in self.sessions_on(d):
+                for boundary in (start, end):
+                    if boundary > local:
+                        return boundary
+            d += timedelta(days=1)
+        return local + timedelta(days=1)
+
+    def seconds_until_next_change(self, now: datetime | None = None) -> float:
+        now = now or datetime.now(timezone.utc)
+        return max((self.next_change(now) - now).total_seconds(), 0.0)
+
+    def cache_ttl(self, active_ttl: float, idle_max_ttl: float, now: datetime | None = None) -> float:
+        """
+        세션에 따른 캐시 유지 시간
+        - 정규장: active_ttl
+        - 그 외: 다음 세션 전환 시각까지 (최대 idle_max_ttl, 최소 active_ttl)
+        """
+        if self.session(now) == REGULAR:
+            return active_ttl
+        return max(active_ttl, min(idle_max_ttl, self.seconds_until_next_change(now)))
+
+krx_calendar = MarketCalendar(
+    name="KRX",
+    tz_for=lambda _: KST,
+    windows=[
+        (PRE, time(8, 30), time(9, 0)),
+        (REGULAR, time(9, 0), time(15, 30)),
+        (POST, time(15, 30), time(18, 0)),
+    ],
+    holidays=_parse_dates(KRX_HOLIDAYS | set(settings.MARKET_EXTRA_HOLIDAYS_KRX.split(","))),
+)
+
+nasdaq_calendar = MarketCalendar(
+    name="NASDAQ",
+    tz_for=us_eastern_tz,
+    windows=[
+        (PRE, time(4, 0), time(9, 30)),
+        (REGULAR, time(9, 30), time(16, 0)),
+        (POST, time(16, 0), time(20, 0)),
+    ],
+    holidays=_parse_dates(US_HOLIDAYS | set(settings.MARKET_EXTRA_HOLIDAYS_US.split(","))),
+    early_closes={d: time(13, 0) for d in _parse_dates(US_EARLY_CLOSES)},
+)
+
+def calendar_for(market: str) -> MarketCalendar:
+    """시장 코드(KR / NAS, NYS, AMS 등) -> 거래소 달력"""
+    return krx_calendar if market == "KR" else nasdaq_calendar
@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import time
+
+import httpx
+from jose import jwt, JWTError
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# JWKS 에 없는 kid 가 오면 키 교체로 보고 다시 받되, 이 간격(초) 안에는 한 번만 (동시 로그인 폭주 시 합침)
+JWKS_REFRESH_MIN_INTERVAL = 5.0
+# discovery 조회 실패 후 이 시간(초) 동안은 다시 조회하지 않고 기본 엔드포인트 사용 (로그인마다 타임아웃 대기 방지)
+DISCOVERY_RETRY_INTERVAL = 30.0
+
+class OAuthTokenError(Exception):
+    """토큰 응답에 access_token 이 없음"""
+
+class OAuthProvider:
+    """
+    소셜 로그인 제공자 호출
+    - 제공자별 httpx 클라이언트 1개를 공유 (로그인마다 TLS 핸드셰이크를 새로 하지 않음)
+    - discovery_url 이 있으면 OpenID discovery 문서/JWKS 를 캐시하고 ID 토큰을 로컬 검증
+      (검증에 성공하면 userinfo 호출 생략)
+    - discovery 조회에 실패하면 authorize_url/token_url/userinfo_url 기본값으로 로그인 계속
+    """
+    def __init__(
+        self,
+        name: str,
+        client_id: str,
+        client_secret: str,
+        redirect_uri: str,
+        token_url: str | None = None,
+        userinfo_url: str | None = None,
+        discovery_url: str | None = None,
+        authorize_url: str | None = None,
+    ):
+        self.name = name
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.redirect_uri = redirect_uri
+        self.token_url = token_url
+        self.userinfo_url = userinfo_url
+        self.discovery_url = discovery_url
+        self.authorize_url = authorize_url
+        self._client = None
+        self._cache = TTLCache(ttl=settings.OAUTH_METADATA_TTL, maxsize=10)
+        self._lock = asyncio.Lock()  # discovery/JWKS 동시 조회를 한 번으로 합침
+        self._jwks_fetched_at = 0.0
+        self._discovery_failed_at = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=settings.OAUTH_HTTP_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=settings.OAUTH_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.OAUTH_MAX_CONNECTIONS,
+                ),
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_json(self, key: str, url: str, force: bool = False) -> dict:
+        """캐시된 JSON 문서 (없거나 force 면 다시 조회)"""
+        if not force:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+        async with self._lock:
+            cached = None if force else self._cache.get(key)
+            if cached is None:
+                res = await self.client.get(url)
+                res.raise_for_status()
+                cached = res.json()
+                self._cache.set(key, cached)
+            return cached
+
+    async def metadata(self) -> dict:
+        """OpenID discovery 문서 (discovery_url 이 없으면 빈 dict)"""
+        if not self.discovery_url:
+            return {}
+        return await self._get_json("discovery", self.discovery_url)
+
+    def _discovery_usable(self) -> bool:
+        """discovery_url 이 있고 최근에 조회 실패하지 않았는지"""
+        failed_at = self._discovery_failed_at
+        return bool(self.discovery_url) and (
+            failed_at is None or time.monotonic() - failed_at >= DISCOVERY_RETRY_INTERVAL
+        )
+
+    async def endpoint(self, name: str, fallback: str | None) -> str:
+        """discovery 문서의 엔드포인트 (조회 실패 시 fallback)"""
+        if self._discovery_usable():
+            try:
+                url = (await self.metadata()).get(name)
+                self._discovery_failed_at = None
+                if url:
+                    return url
+            except (httpx.HTTPError, ValueError) as e:
+                if fallback is None:
+                    raise
+                self._discovery_failed_at = time.monotonic()
+                logger.warning(f"⚠️ {self.name.capitalize()} discovery 조회 실패, 기본 {name} 사용: {e}")
+        if fallback is None:
+            raise KeyError(f"{self.name} {name} 없음")
+        return fallback
+
+    async def _jwks(self, force: bool = False) -> dict:
+        meta = await self.metadata()
+        if force and time.monotonic() - self._jwks_fetched_at < JWKS_REFRESH_MIN_INTERVAL:
+            force = False
+        jwks = await self._get_json("jwks", meta["jwks_uri"], force=force)
+        if force or not self._jwks_fetched_at:
+            self._jwks_fetched_at = time.monotonic()
+        return jwks
+
+    async def exchange_code(self, code: str) -> dict:
+        """인가 코드 -> 토큰 응답 (access_token, id_token ...)"""
+        token_url = await self.endpoint("token_endpoint", self.token_url)
+        res = await self.client.post(token_url, data={
+            "grant_type": "authorization_code",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "redirect_uri": self.redirect_uri,
+            "code": code,
+        })
+        res.raise_for_status()
+        return res.json()
+
+    async def userinfo(self, access_token: str) -> dict:
+        userinfo_url = await self.endpoint("userinfo_endpoint", self.userinfo_url)
+        res = await self.client.get(userinfo_url, headers={"Authorization": f"Bearer {access_token}"})
+        res.raise_for_status()
+        return res.json()
+
+    async def verify_id_token(self, id_token: str, access_token: str | None = None) -> dict:
+        """
+        ID 토큰 서명/aud/iss/exp (+ at_hash) 검증 후 claims 반환
+        - JWKS 에 kid 가 없으면 키 교체로 보고 한 번 다시 조회 (그래도 없으면 KeyError)
+        - 검증 실패 시 JWTError
+        """
+        kid = jwt.get_unverified_header(id_token).get("kid")
+        jwks = await self._jwks()
+        key = next((k for k in jwks.get("keys", []) if k.get("kid") == kid), None)
+        if key is None:
+            jwks = await self._jwks(force=True)
+            key = next((k for k in jwks.get("keys", []) if k.get("kid") == kid), None)
+            if key is None:
+                raise KeyError(f"알 수 없는 서명 키: {kid}")
+
+        claims = jwt.decode(
+            id_token,
+            key,
+            algorithms=[key.get("alg", "RS256")],
+            audience=self.client_id,
+            access_token=access_token,
+        )
+        # Google 은 iss 에 scheme 없는 값도 사용
+        issuer = (await self.metadata()).get("issuer", "")
+        if claims.get("iss") not in (issuer, issuer.removeprefix("https://")):
+            raise JWTError(f"잘못된 발급자: {claims.get('iss')}")
+        return claims
+
+    async def fetch_profile(self, code: str) -> dict:
+        """
+        인가 코드 -> 사용자 정보
+        ID 토큰을 로컬 검증할 수 있으면 그 claims 를, 아니면 userinfo 응답을 반환
+        (discovery/JWKS 조회 실패나 모르는 서명 키면 userinfo 로 대체, 서명/claims 검증 실패는 예외)
+        """
+        tokens = await self.exchange_code(code)
+        access_token = tokens.get("access_token")
+        if not access_token:
+            raise OAuthTokenError(f"{self.name.capitalize()} Access Token 발급 실패")
+
+        id_token = tokens.get("id_token")
+        if id_token and self._discovery_usable():
+            try:
+                return await self.verify_id_token(id_token, access_token)
+            except (httpx.HTTPError, KeyError) as e:
+                logger.warning(f"⚠️ {self.name.capitalize()} ID 토큰 키 확인 실패, userinfo 로 대체: {e}")
+        return await self.userinfo(access_token)
+
+kakao_oauth = OAuthProvider(
+    "kakao",
+    settings.KAKAO_CLIENT_ID,
+    settings.KAKAO_CLIENT_SECRET,
+    settings.KAKAO_REDIRECT_URI,
+    # 카카오 ID 토큰에는 이름/전화번호가 없어 userinfo(/v2/user/me) 사용
+    token_url=f"{settings.KAKAO_AUTH_BASE_URL}/oauth/token",
+    userinfo_url=f"{settings.KAKAO_API_BASE_URL}/v2/user/me",
+)
+
+google_oauth = OAuthProvider(
+    "google",
+    settings.GOOGLE_CLIENT_ID,
+    settings.GOOGLE_CLIENT_SECRET,
+    settings.GOOGLE_REDIRECT_URI,
+    discovery_url=settings.GOOGLE_DISCOVERY_URL,
+    # discovery 조회 실패 시 사용할 기본 엔드포인트
+    authorize_url="https://accounts.google.com/o/oauth2/v2/auth",
+    token_url="https://oauth2.googleapis.com/token",
+    userinfo_url="https://openidconnect.googleapis.com/v1/userinfo",
+)
+
+async def close_oauth_clients():
+    await kakao_oauth.aclose()
+    await google_oauth.aclose()
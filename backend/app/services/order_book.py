@@ -0,0 +1,67 @@
+HOGA_LEVELS = 10
+
+class OrderBook:
+    """
+    종목별 10단계 호가 상태
+    - asks/bids: [(가격, 잔량), ...] 문자열 튜플 리스트 (1호가부터)
+    - apply() 로 새 호가를 반영하고, 바뀐 단계만 diff 로 돌려줍니다.
+    """
+    __slots__ = ("code", "time", "asks", "bids", "total_ask_volume", "total_bid_volume")
+
+    def __init__(self, code: str):
+        self.code = code
+        self.time = "000000"
+        self.asks = [("0", "0")] * HOGA_LEVELS
+        self.bids = [("0", "0")] * HOGA_LEVELS
+        self.total_ask_volume = "0"
+        self.total_bid_volume = "0"
+
+    @staticmethod
+    def _normalize(levels):
+        levels = list(levels[:HOGA_LEVELS])
+        if len(levels) < HOGA_LEVELS:
+            levels += [("0", "0")] * (HOGA_LEVELS - len(levels))
+        return levels
+
+    @staticmethod
+    def _diff_side(old, new):
+        # [단계, 가격, 잔량] 형태로 변경분만 추출
+        return [[i, p, v] for i, (o, (p, v)) in enumerate(zip(old, new)) if o != (p, v)]
+
+    def apply(self, asks, bids, total_ask_volume="0", total_bid_volume="0", time=None):
+        """새 호가를 반영하고 변경된 단계만 담은 diff 메시지 반환 (변경 없으면 None)"""
+        asks = self._normalize(asks)
+        bids = self._normalize(bids)
+
+        ask_diff = self._diff_side(self.asks, asks)
+        bid_diff = self._diff_side(self.bids, bids)
+        totals_changed = (total_ask_volume != self.total_ask_volume
+                          or total_bid_volume != self.total_bid_volume)
+
+        self.asks, self.bids = asks, bids
+        self.total_ask_volume, self.total_bid_volume = total_ask_volume, total_bid_volume
+        if time:
+            self.time = time
+
+        if not ask_diff and not bid_diff and not totals_changed:
+            return None
+
+        diff = {"type": "hoga_diff", "code": self.code, "time": self.time}
+        if ask_diff: diff["asks"] = ask_diff
+        if bid_diff: diff["bids"] = bid_diff
+        if totals_changed:
+            diff["total_ask_volume"] = total_ask_volume
+            diff["total_bid_volume"] = total_bid_volume
+        return diff
+
+    def snapshot(self):
+        """전체 호가 (접속 직후 / REST 조회용)"""
+        return {
+            "type": "hoga",
+            "code": self.code,
+            "time": self.time,
+            "asks": [{"price": p, "volume": v} for p, v in self.asks],
+            "bids": [{"price": p, "volume": v} for p, v in self.bids],
+            "total_ask_volume": self.total_ask_volume,
+            "total_bid_volume": self.total_bid_volume
+        }
@@ -0,0 +1,27 @@
+import time
+
+class QuoteStore:
+    """
+    실시간 체결 스트림으로 갱신되는 종목별 최신 시세
+    - kis_ws 가 체결 수신 시 update(), 시세 조회 경로가 get() 으로 읽음
+    - 반환 형식은 KisDataService.get_current_price() 와 동일
+    """
+    def __init__(self):
+        self._quotes = {}  # 종목코드 -> (갱신 시각(monotonic), 시세)
+
+    def update(self, code: str, quote: dict):
+        self._quotes[code] = (time.monotonic(), quote)
+
+    def get(self, code: str, max_age: float):
+        entry = self._quotes.get(code)
+        if entry is None:
+            return None
+        updated_at, quote = entry
+        if time.monotonic() - updated_at > max_age:
+            return None
+        return quote
+
+    def discard(self, code: str):
+        self._quotes.pop(code, None)
+
+quote_store = QuoteStore()
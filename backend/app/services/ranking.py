@@ -0,0 +1,106 @@
+import heapq
+from dataclasses import dataclass
+from itertools import islice
+
+RANKING_SIZE = 30
+
+def to_number(value) -> float:
+    """'1,234.5' 같은 KIS 문자열 수치를 float 로 변환 (실패 시 0.0)"""
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value.replace(',', ''))
+    except (ValueError, AttributeError):
+        return 0.0
+
+@dataclass(slots=True)
+class RankingItem:
+    """
+    순위 한 줄 (수치는 수집 시점에 한 번만 변환)
+    - price/amount 는 원화 기준
+    - to_dict() 에서만 API 응답용 문자열로 변환
+    """
+    code: str
+    name: str | None
+    price: float
+    change_rate: float
+    volume: float
+    amount: float
+    market: str = "KR"
+    market_cap: float | None = None
+
+    def to_dict(self) -> dict:
+        data = {
+            "code": self.code,
+            "name": self.name,
+            "price": str(int(self.price)),
+            "change_rate": f"{self.change_rate:.2f}",
+            "volume": str(int(self.volume)),
+            "amount": str(int(self.amount)),
+            "market": self.market
+        }
+        if self.market_cap is not None:
+            data["market_cap"] = str(int(self.market_cap))
+        return data
+
+def ranking_sort_key(rank_type: str):
+    """순위 유형별 (정렬 키, 내림차순 여부) / 알 수 없는 유형이면 (None, False)"""
+    if rank_type == "rise":
+        return (lambda x: x.change_rate), True
+    if rank_type == "fall":
+        return (lambda x: x.change_rate), False
+    if rank_type == "cap":
+        return (lambda x: x.market_cap if x.market_cap is not None else x.amount), True
+    if rank_type == "volume":
+        return (lambda x: x.volume), True
+    if rank_type == "amount":
+        return (lambda x: x.amount), True
+    return None, False
+
+def merge_top_k(sources, rank_type: str, k: int = RANKING_SIZE):
+    """
+    여러 순위 목록(국내/해외)을 병합해 상위 k개 반환
+    각 목록을 정렬한 뒤 heapq.merge 로 앞에서부터 k개만 꺼냅니다.
+    """
+    key, reverse = ranking_sort_key(rank_type)
+    if key is None:
+        return list(islice((item for source in sources for item in source), k))
+
+    ordered = [sorted(source, key=key, reverse=reverse) for source in sources]
+    return list(islice(heapq.merge(*ordered, key=key, reverse=reverse), k))
+
+def diff_rankings(previous: list, current: list) -> dict:
+    """
+    두 순위 목록(to_dict() 형식)의 차이를 종목코드 기준으로 계산
+    - removed: 빠진 종목코드
+    - added:   [순위, 항목 전체]
+    - moved:   [종목코드, 새 순위] (남아 있는 종목 중 순위가 바뀐 것만)
+    - changed: {"code": 종목코드, 바뀐 필드: 값, ...}
+    비어 있는 항목은 생략합니다.
+    """
+    prev_by_code = {item["code"]: (rank, item) for rank, item in enumerate(previous)}
+    curr_codes = {item["code"] for item in current}
+
+    removed = [code for code in prev_by_code if code not in curr_codes]
+    added, moved, changed = [], [], []
+
+    for rank, item in enumerate(current):
+        code = item["code"]
+        old = prev_by_code.get(code)
+        if old is None:
+            added.append([rank, item])
+            continue
+
+        old_rank, old_item = old
+        if old_rank != rank:
+            moved.append([code, rank])
+
+        fields = {key: value for key, value in item.items() if old_item.get(key) != value}
+        if fields:
+            fields["code"] = code
+            changed.append(fields)
+
+    delta = {"removed": removed, "added": added, "moved": moved, "changed": changed}
+    return {key: value for key, value in delta.items() if value}
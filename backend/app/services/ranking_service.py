@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from app.core.config import settings
+from app.services.kis_data import kis_data
+from app.services.stock_info import stock_info_service
+from app.services.ranking import merge_top_k, RANKING_SIZE
+from app.services.market_calendar import krx_calendar, nasdaq_calendar, PRE, REGULAR, POST
+
+logger = logging.getLogger(__name__)
+
+RANK_TYPES = ("volume", "amount", "cap", "rise", "fall")
+MARKET_TYPES = ("ALL", "DOMESTIC", "OVERSEAS")
+MARKET_CALENDARS = {
+    "ALL": (krx_calendar, nasdaq_calendar),
+    "DOMESTIC": (krx_calendar,),
+    "OVERSEAS": (nasdaq_calendar,),
+}
+
+@dataclass(slots=True)
+class RankingSnapshot:
+    """(rank_type, market_type) 별 마지막 계산 결과"""
+    rank_type: str
+    market_type: str
+    version: int
+    items: list = field(default_factory=list)  # API 응답 형식 (RankingItem.to_dict())
+    etag: str = ""
+    updated_at: float = 0.0   # 내용이 바뀐 시각 (epoch)
+    fetched_at: float = 0.0   # 마지막으로 KIS에서 가져온 시각 (monotonic)
+
+class RankingService:
+    """
+    REST(/stocks/rank) 와 WebSocket(/realtime/rankings) 이 함께 쓰는 순위 스냅샷 캐시
+    - 갱신 주기(refresh_interval, 시장 세션에 따라 달라짐) 안에서는 KIS 호출 없이 캐시된 스냅샷 반환
+    - 같은 키를 동시에 요청해도 KIS 조회는 한 번만 수행
+    - 내용이 바뀔 때만 version 증가 (WebSocket 은 version 이 바뀔 때만 전송)
+    """
+    def __init__(self):
+        self._snapshots = {}
+        self._locks = defaultdict(asyncio.Lock)
+
+    @staticmethod
+    def normalize_market_type(market_type: str) -> str:
+        return market_type if market_type in MARKET_TYPES else "DOMESTIC"
+
+    def refresh_interval(self, market_type: str = "DOMESTIC") -> float:
+        """
+        시장 세션에 따른 갱신 주기
+        - 정규장: RANKING_REFRESH_SECONDS
+        - 프리/애프터마켓, 휴장: 더 긴 주기 (단, 다음 세션 전환 시각을 넘기지 않음)
+        """
+        calendars = MARKET_CALENDARS[self.normalize_market_type(market_type)]
+        sessions = {calendar.session() for calendar in calendars}
+        if REGULAR in sessions:
+            return settings.RANKING_REFRESH_SECONDS
+
+        if PRE in sessions or POST in sessions:
+            idle = settings.RANKING_EXTENDED_REFRESH_SECONDS
+        else:
+            idle = settings.RANKING_CLOSED_REFRESH_SECONDS
+        next_change = min(calendar.seconds_until_next_change() for calendar in calendars)
+        return max(settings.RANKING_REFRESH_SECONDS, min(idle, next_change))
+
+    def _is_fresh(self, snapshot) -> bool:
+        return snapshot is not None and time.monotonic() - snapshot.fetched_at < self.refresh_interval(snapshot.market_type)
+
+    async def get_snapshot(self, rank_type: str, market_type: str = "DOMESTIC") -> RankingSnapshot:
+        market_type = self.normalize_market_type(market_type)
+        if rank_type not in RANK_TYPES:
+            # 지원하지 않는 순위 유형은 캐시하지 않음
+            return RankingSnapshot(rank_type, market_type, version=0, etag=self._digest([]))
+
+        key = (rank_type, market_type)
+        snapshot = self._snapshots.get(key)
+        if self._is_fresh(snapshot):
+            return snapshot
+
+        async with self._locks[key]:
+            snapshot = self._snapshots.get(key)
+            if self._is_fresh(snapshot):
+                return snapshot
+            return await self._refresh(key, snapshot)
+
+    async def _refresh(self, key, previous):
+        rank_type, market_type = key
+        items = [item.to_dict() for item in await self._compute(rank_type, market_type)]
+        now = time.monotonic()
+
+        # KIS 오류로 빈 결과가 오면 직전 스냅샷 유지 (다음 주기에 재시도)
+        if not items and previous is not None:
+            previous.fetched_at = now
+            return previous
+
+        digest = self._digest(items)
+        if previous is not None and previous.etag == digest:
+            previous.fetched_at = now
+            return previous
+
+        snapshot = RankingSnapshot(
+            rank_type=rank_type,
+            market_type=market_type,
+            version=(previous.version + 1) if previous else 1,
+            items=items,
+            etag=digest,
+            updated_at=time.time(),
+            fetched_at=now
+        )
+        self._snapshots[key] = snapshot
+        return snapshot
+
+    @staticmethod
+    def _digest(items) -> str:
+        return hashlib.sha1(json.dumps(items, ensure_ascii=False).encode()).hexdigest()
+
+    async def _compute(self, rank_type: str, market_type: str):
+        """KIS 순위 조회 + 국내 한글명 보정 + (ALL) 국내/해외 병합"""
+        # 'cap'으로 요청이 오더라도 해외 주식 로직에는 'market_cap'으로 전달
+        overseas_rank_type = "market_cap" if rank_type == "cap" else rank_type
+
+        if market_type == "ALL":
+            d_data, o_data = await asyncio.gather(
+                kis_data.get_ranking_data(rank_type),
+                kis_data.get_overseas_ranking_data(overseas_rank_type, market_code="NAS")
+            )
+            self._apply_names(d_data)
+            return merge_top_k([d_data, o_data], rank_type, k=RANKING_SIZE)
+
+        if market_type == "OVERSEAS":
+            return await kis_data.get_overseas_ranking_data(overseas_rank_type, market_code="NAS")
+
+        d_data = await kis_data.get_ranking_data(rank_type)
+        self._apply_names(d_data)
+        return d_data
+
+    @staticmethod
+    def _apply_names(items):
+        for item in items:
+            name = stock_info_service.get_name(item.code)
+            if name:
+                item.name = name
+
+ranking_service = RankingService()
@@ -0,0 +1,132 @@
+import gzip
+import logging
+import os
+import time
+import zlib
+from datetime import datetime
+
+from app.core.config import settings
+from app.services.market_calendar import KST
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 1.0  # 파일 flush 주기 (초)
+
+def open_capture(path: str, mode: str):
+    """.gz 로 끝나면 gzip"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def segment_path(path: str) -> str:
+    """
+    .gz 캡처의 새 파일 경로 (이미 있으면 20250102-1.tsv.gz, 20250102-2.tsv.gz ...)
+    비정상 종료로 끝이 잘린 gzip 파일에 이어 쓰면 파일 전체를 읽을 수 없게 되므로
+    프로세스 시작/날짜 전환마다 새 파일에 기록
+    """
+    if not path.endswith(".gz") or not os.path.exists(path):
+        return path
+    directory, filename = os.path.split(path)
+    name, dot, ext = filename.partition(".")
+    n = 1
+    while os.path.exists(candidate := os.path.join(directory, f"{name}-{n}{dot}{ext}")):
+        n += 1
+    return candidate
+
+def _truncate_partial_line(path: str):
+    """일반 텍스트 캡처 끝의 완성되지 않은 줄 제거"""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            step = min(4096, pos)
+            f.seek(pos - step)
+            newline = f.read(step).rfind(b"\n")
+            if newline >= 0:
+                pos = pos - step + newline + 1
+                break
+            pos -= step
+        if pos != end:
+            f.truncate(pos)
+
+def read_capture(path: str):
+    """
+    캡처 파일 -> (수신 시각 epoch 초, 원본 프레임) 순회
+    기록 중이거나 비정상 종료로 끝이 잘린 파일은 마지막 완전한 줄까지만 읽음
+    """
+    with open_capture(path, "r") as f:
+        try:
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # 쓰다 만 마지막 줄
+                ts, sep, frame = line[:-1].partition("\t")
+                if sep:
+                    yield float(ts), frame
+        except (EOFError, zlib.error, gzip.BadGzipFile) as e:
+            logger.warning(f"⚠️ 캡처 파일 끝이 잘려 있어 여기까지만 읽습니다 [{path}]: {e}")
+
+class TickRecorder:
+    """
+    KIS 실시간 원본 프레임 기록 (append-only, 한 줄에 "수신시각\t프레임")
+    - path 에 strftime 형식(%Y%m%d 등)을 쓰면 날짜가 바뀔 때 새 파일로 전환 (KST 기준)
+    - 데이터 프레임(0|... / 1|...)만 기록하고 구독 응답/PINGPONG JSON 은 제외
+    - .gz 는 기존 파일에 이어 쓰지 않고 새 파일로 기록 (segment_path), 일반 텍스트는 이어 씀
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._current_path = None
+        self._last_flush = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _open(self, now: float):
+        path = datetime.fromtimestamp(now, KST).strftime(self.path)
+        if path == self._current_path:
+            return
+        self.close()
+        try:
+            self._file = self._open_for_append(path)
+            self._current_path = path
+        except OSError as e:
+            logger.error(f"⛔ 프레임 기록 파일 열기 실패 [{path}]: {e}")
+            self.path = ""  # 기록 중단 (매 프레임마다 재시도하지 않도록)
+
+    @staticmethod
+    def _open_for_append(path: str):
+        if path.endswith(".gz"):
+            segment = segment_path(path)
+            logger.info(f"📼 실시간 프레임 기록 시작: {segment}")
+            return open_capture(segment, "w")
+        # 이전 프로세스가 줄 중간에서 끝났으면 쓰다 만 줄을 잘라내고 이어 씀
+        _truncate_partial_line(path)
+        f = open_capture(path, "a")
+        logger.info(f"📼 실시간 프레임 기록 시작: {path}")
+        return f
+
+    def record(self, msg: str, received_at: float | None = None):
+        if not self.path or not msg or msg[0] not in ('0', '1'):
+            return
+        now = received_at or time.time()
+        if self._file is None or now - self._last_flush >= FLUSH_INTERVAL:
+            self._open(now)
+            if self._file is None:
+                return
+            self._file.flush()
+            self._last_flush = now
+        self._file.write(f"{now:.6f}\t{msg}\n")
+
+    def close(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError as e:
+                logger.error(f"⛔ 프레임 기록 파일 닫기 실패: {e}")
+            self._file = None
+            self._current_path = None
+
+tick_recorder = TickRecorder(settings.TICK_CAPTURE_PATH)
@@ -0,0 +1,92 @@
+import time
+import weakref
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+STAGE_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+tick_stage_seconds = registry.histogram(
+    "tick_stage_seconds", "Sampled time from KIS frame receipt to each processing stage",
+    ("channel", "stage"), buckets=STAGE_BUCKETS
+)
+
+class TickTracer:
+    """
+    실시간 체결/호가 1건의 단계별 지연 추적 (표본 추출)
+    - receive: KIS 프레임 수신 (기준 시각)
+    - parse:   필드 파싱 및 전송 데이터 생성 완료
+    - enqueue: 구독자 전송 시작
+    - send:    각 클라이언트 send_text 완료
+    느린 클라이언트/종목은 /debug/ticks 에서 확인합니다.
+    """
+    def __init__(self, sample_rate: float):
+        self.sample_every = round(1 / sample_rate) if sample_rate > 0 else 0
+        self._count = 0
+        # 웹소켓 -> [라벨, 종목코드, 표본 수, 전송 시간 합, 전송 시간 최대, 수신~전송 최대]
+        self._clients = weakref.WeakKeyDictionary()
+        # 종목코드 -> [표본 수, 전체 전송 시간 합, 최대]
+        self._codes = {}
+
+    def sample(self) -> bool:
+        if not self.sample_every:
+            return False
+        self._count += 1
+        return self._count % self.sample_every == 0
+
+    def record_stages(self, channel: str, recv_ts: float, parsed_ts: float, enqueue_ts: float):
+        tick_stage_seconds.observe(parsed_ts - recv_ts, channel=channel, stage="parse")
+        tick_stage_seconds.observe(enqueue_ts - recv_ts, channel=channel, stage="enqueue")
+
+    def record_send(self, client, code: str, channel: str, recv_ts: float, send_started: float):
+        now = time.perf_counter()
+        send_elapsed = now - send_started
+        since_recv = now - recv_ts
+        tick_stage_seconds.observe(since_recv, channel=channel, stage="send")
+
+        stats = self._clients.get(client)
+        if stats is None:
+            address = getattr(client, "client", None)
+            label = f"{address.host}:{address.port}" if address else str(id(client))
+            stats = self._clients[client] = [label, code, 0, 0.0, 0.0, 0.0]
+        stats[1] = code
+        stats[2] += 1
+        stats[3] += send_elapsed
+        stats[4] = max(stats[4], send_elapsed)
+        stats[5] = max(stats[5], since_recv)
+
+    def record_fanout(self, code: str, elapsed: float):
+        stats = self._codes.get(code)
+        if stats is None:
+            stats = self._codes[code] = [0, 0.0, 0.0]
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+
+    def slowest_clients(self, limit: int = 10):
+        rows = [
+            {
+                "client": label, "code": code, "samples": count,
+                "avg_send_ms": round(total / count * 1000, 3),
+                "max_send_ms": round(max_send * 1000, 3),
+                "max_tick_to_send_ms": round(max_since_recv * 1000, 3)
+            }
+            for label, code, count, total, max_send, max_since_recv in list(self._clients.values())
+        ]
+        return sorted(rows, key=lambda r: r["avg_send_ms"], reverse=True)[:limit]
+
+    def slowest_codes(self, limit: int = 10):
+        rows = [
+            {
+                "code": code, "samples": count,
+                "avg_fanout_ms": round(total / count * 1000, 3),
+                "max_fanout_ms": round(max_elapsed * 1000, 3)
+            }
+            for code, (count, total, max_elapsed) in list(self._codes.items())
+        ]
+        return sorted(rows, key=lambda r: r["avg_fanout_ms"], reverse=True)[:limit]
+
+    def forget_code(self, code: str):
+        self._codes.pop(code, None)
+
+tick_tracer = TickTracer(settings.TICK_TRACE_SAMPLE_RATE)
@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, or_, select
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.database import AsyncSessionLocal
+from app.models.refresh_token import RefreshToken
+
+logger = logging.getLogger(__name__)
+
+refresh_tokens_purged_total = registry.counter(
+    "refresh_tokens_purged_total", "Expired or revoked refresh tokens deleted by the background purge"
+)
+
+class RefreshTokenPurger:
+    """
+    만료/폐기된 Refresh Token 주기 삭제
+    - batch_size 행씩 나눠 삭제하고 배치마다 커밋 (긴 잠금/트랜잭션 방지)
+    - 재발급 시 폐기된 토큰은 다시 쓰이지 않으므로 만료 전이라도 삭제
+    """
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task = None
+
+    async def purge(self) -> int:
+        """정리 1회 실행, 삭제한 행 수 반환"""
+        total = 0
+        while True:
+            async with AsyncSessionLocal() as session:
+                targets = (
+                    select(RefreshToken.refresh_token_id)
+                    .where(or_(
+                        RefreshToken.is_revoked == True,
+                        RefreshToken.expires_at <= datetime.now(timezone.utc),
+                    ))
+                    .limit(self.batch_size)
+                )
+                result = await session.execute(
+                    delete(RefreshToken)
+                    .where(RefreshToken.refresh_token_id.in_(targets))
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+            deleted = result.rowcount or 0
+            total += deleted
+            refresh_tokens_purged_total.inc(deleted)
+            if deleted < self.batch_size:
+                return total
+            await asyncio.sleep(0)  # 배치 사이에 다른 요청 처리
+
+    def start(self):
+        if self.interval <= 0:
+            return
+        if not self._task or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                deleted = await self.purge()
+                if deleted:
+                    logger.info(f"🧹 만료/폐기된 Refresh Token {deleted}건 삭제")
+            except Exception as e:
+                logger.error(f"⛔ Refresh Token 정리 실패: {e}")
+            await asyncio.sleep(self.interval)
+
+refresh_token_purger = RefreshTokenPurger(settings.REFRESH_TOKEN_PURGE_SECONDS, settings.REFRESH_TOKEN_PURGE_BATCH)
@@ -0,0 +1,70 @@
+from collections import deque
+from itertools import islice
+
+TAPE_SIZE = 100
+
+class TradeTape:
+    """
+    종목별 최근 체결 링버퍼 (최신순)
+    - open(): 구독 시작 시 빈 버퍼 생성 (이후 실시간 체결이 앞쪽에 쌓임)
+    - seed(): REST 체결 내역으로 과거 구간을 1회 채움
+    - recent(): 최신 k건을 O(k)로 반환
+    """
+    def __init__(self, maxlen: int = TAPE_SIZE):
+        self.maxlen = maxlen
+        self._tapes = {}       # 종목코드 -> deque
+        self._vol_power = {}   # 종목코드 -> 최근 체결강도
+        self._seeded = set()   # REST 시드가 끝난 종목
+
+    def open(self, code: str):
+        if code not in self._tapes:
+            self._tapes[code] = deque(maxlen=self.maxlen)
+            self._vol_power[code] = "0.00"
+
+    def drop(self, code: str):
+        self._tapes.pop(code, None)
+        self._vol_power.pop(code, None)
+        self._seeded.discard(code)
+
+    def is_ready(self, code: str) -> bool:
+        return code in self._seeded
+
+    def append(self, code: str, trade: dict):
+        """실시간 체결 1건 추가 (구독 중인 종목만)"""
+        tape = self._tapes.get(code)
+        if tape is None:
+            return
+        tape.appendleft(trade)
+        # 해외 체결은 체결강도를 주지 않으므로("0.00") 기존 값 유지
+        if trade.get("vol_power") not in (None, "", "0.00"):
+            self._vol_power[code] = trade["vol_power"]
+
+    def seed(self, code: str, trades: list, vol_power: str = "0.00"):
+        """
+        REST 체결 내역(최신순)으로 버퍼를 채움
+        시드 전에 먼저 들어온 실시간 체결은 더 최신이므로 앞쪽에 그대로 둡니다.
+        REST 결과도 실시간 체결도 없으면(조회 제한/오류 등) 시드 완료로 보지 않아 다음 조회 때 다시 시도합니다.
+        """
+        tape = self._tapes.get(code)
+        if tape is None or code in self._seeded:
+            return
+
+        live = list(tape)
+        if not trades and not live:
+            return
+        seen = {(t["time"], t["price"], t["volume"]) for t in live}
+        history = [t for t in trades if (t["time"], t["price"], t["volume"]) not in seen]
+
+        self._tapes[code] = deque(live + history, maxlen=self.maxlen)
+        if not live:
+            self._vol_power[code] = vol_power
+        self._seeded.add(code)
+
+    def recent(self, code: str, limit: int = 30) -> dict:
+        tape = self._tapes.get(code) or ()
+        return {
+            "trades": list(islice(tape, limit)),
+            "vol_power": self._vol_power.get(code, "0.00")
+        }
+
+trade_tape = TradeTape()
@@ -1,7 +1,9 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import joinedload, selectinload
-from sqlalchemy import update 
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import update, insert, exists
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta, timezone
 
 from app.models.user import User
@@ -9,10 +11,43 @@ from app.models.social_account import SocialAccount, AuthProvider
 from app.models.refresh_token import RefreshToken
 from app.schemas.user import UserUpdate
 from app.core.config import settings
-from app.core.security.hashing import hash_password
+from app.core.security.hashing import hash_password_async
+from app.core.security.user_status import user_status_cache
+from app.core.cache import TTLCache
 
+import re
 import uuid
 
+# 중복 확인 대상 필드 (unique 인덱스가 있는 컬럼)
+UNIQUE_FIELDS = ("username", "email")
+
+# (field, value) -> 사용 가능
+# 회원가입 폼은 입력할 때마다 중복 확인을 호출하므로 "없음" 결과만 짧게 캐싱합니다.
+# 가입/아이디 변경 시 즉시 무효화하고, 다른 워커와의 경합은 unique 인덱스가 최종 판정합니다.
+availability_cache = TTLCache(ttl=settings.AVAILABILITY_CACHE_TTL, maxsize=5000)
+
+class DuplicateUserError(ValueError):
+    """unique 인덱스 위반 (field: 중복된 필드)"""
+    def __init__(self, field: str | None):
+        self.field = field
+        super().__init__(f"이미 사용 중인 값입니다: {field}")
+
+# 위반된 unique 인덱스 이름 -> 필드 (Column(unique=True, index=True) 가 만드는 인덱스)
+UNIQUE_INDEXES = {f"ix_users_{field}": field for field in UNIQUE_FIELDS}
+# 드라이버가 제약 이름을 주지 않을 때: PostgreSQL DETAIL "Key (username)=(...)", SQLite "UNIQUE constraint failed: users.username"
+_DUPLICATE_COLUMN = re.compile(r"Key \((\w+)\)=|UNIQUE constraint failed: users\.(\w+)")
+
+def _duplicate_field(error: IntegrityError) -> str | None:
+    """IntegrityError 의 제약 이름(또는 컬럼 이름)으로 중복된 필드 판별 (입력 값은 보지 않음)"""
+    # asyncpg 예외는 드라이버 어댑터 예외의 __cause__ 에 constraint_name 으로 들어 있음
+    cause = getattr(error.orig, "__cause__", None)
+    constraint = getattr(cause, "constraint_name", None) or getattr(error.orig, "constraint_name", None)
+    if constraint in UNIQUE_INDEXES:
+        return UNIQUE_INDEXES[constraint]
+    match = _DUPLICATE_COLUMN.search(str(error.orig))
+    column = match and (match.group(1) or match.group(2))
+    return column if column in UNIQUE_FIELDS else None
+
 class UserService:
     async def get_user_by_id(self, db: AsyncSession, user_id: uuid.UUID) -> User | None:
         """ID로 마스터 사용자 조회"""
@@ -23,6 +58,11 @@ class UserService:
         )
         result = await db.execute(stmt)
         return result.scalars().first()
+
+    async def get_user_active_status(self, db: AsyncSession, user_id: uuid.UUID) -> bool | None:
+        """ID로 활성 상태만 조회 (인증 빠른 경로용, 사용자가 없으면 None)"""
+        result = await db.execute(select(User.is_active).where(User.user_id == user_id))
+        return result.scalar_one_or_none()
     
     async def get_user_by_username_or_email(self, db: AsyncSession, username_or_email: str) -> User | None:
         """이메일 또는 유저이름으로 마스터 사용자 조회"""
@@ -52,23 +92,36 @@ class UserService:
         name: str,
         phone_number: str | None = None
     ) -> User:
-        """일반 회원가입으로 신규 사용자 생성"""
-        
-        hashed_pass = hash_password(password)
+        """
+        일반 회원가입으로 신규 사용자 생성
+        - INSERT ... RETURNING 1회 (중복 여부는 unique 인덱스가 판정)
+        - 아이디/이메일 중복이면 DuplicateUserError
+        """
         
-        new_user = User(
-            username=username,
-            email=email, 
-            hashed_password=hashed_pass,
-            name=name,
-            phone_number=phone_number
-        )
-        db.add(new_user)
-        await db.commit()
+        hashed_pass = await hash_password_async(password)
         
-        query = select(User).options(selectinload(User.social_accounts)).where(User.user_id == new_user.user_id)
-        result = await db.execute(query)
-        new_user = result.scalars().first()
+        try:
+            result = await db.execute(
+                insert(User)
+                .values(
+                    username=username,
+                    email=email, 
+                    hashed_password=hashed_pass,
+                    name=name,
+                    phone_number=phone_number
+                )
+                .returning(User)
+            )
+            new_user = result.scalar_one()
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            raise DuplicateUserError(_duplicate_field(e)) from e
+
+        # 신규 사용자는 소셜 계정이 없으므로 추가 조회 없이 빈 목록으로 채움
+        set_committed_value(new_user, "social_accounts", [])
+        availability_cache.pop(("username", username))
+        availability_cache.pop(("email", email))
         
         return new_user
 
@@ -109,16 +162,17 @@ class UserService:
             field: str,
             value: str
     ) -> bool:
-        """실시간 중복 확인: 존재하면 True, 없으면 False"""
-        if field == "username":
-            query = select(User).where(User.username == value)
-        elif field == "email":
-            query = select(User).where(User.email == value)
-        else:
+        """실시간 중복 확인: 존재하면 True, 없으면 False (EXISTS, 인덱스만 조회)"""
+        if field not in UNIQUE_FIELDS:
             raise ValueError("지원하지 않는 필드입니다.")
-        
-        result = await db.execute(query)
-        return result.scalars().first() is not None
+        if availability_cache.get((field, value)):
+            return False
+
+        column = User.username if field == "username" else User.email
+        is_exist = bool(await db.scalar(select(exists().where(column == value))))
+        if not is_exist:
+            availability_cache.set((field, value), True)
+        return is_exist
 
     async def get_or_create_user_social(
         self, 
@@ -154,15 +208,17 @@ class UserService:
             if existing_user and existing_user.user_id != user.user_id:
                 raise ValueError("이미 사용 중인 아이디입니다.")
             user.username = user_in.username
+            availability_cache.pop(("username", user_in.username))
         
         if user_in.password:
-            user.hashed_password = hash_password(user_in.password)
+            user.hashed_password = await hash_password_async(user_in.password)
         
         user.updated_at = datetime.now(timezone.utc)
         
         db.add(user)
         await db.commit()
         await db.refresh(user)
+        user_status_cache.pop(user.user_id)
         
         return user
 
@@ -175,16 +231,18 @@ class UserService:
         user.is_active = False
         user.updated_at = datetime.now(timezone.utc)
         
-        result = await db.execute(select(RefreshToken).where(RefreshToken.user_id == user.user_id))
-        tokens = result.scalars().all()
-
-        for token in tokens:
-            token.is_revoked = True
-            db.add(token)
+        # 남은 Refresh Token 일괄 폐기 (UPDATE 1회)
+        await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user.user_id, RefreshToken.is_revoked == False)
+            .values(is_revoked=True)
+            .execution_options(synchronize_session=False)
+        )
 
         db.add(user)
         await db.commit()
         await db.refresh(user)
+        user_status_cache.pop(user.user_id)
         
         return user
     
@@ -210,32 +268,40 @@ class UserService:
         await db.refresh(new_token)
         return new_token
 
-    async def get_user_by_refresh_token(
-        self, 
-        db: AsyncSession, 
-        token: str
-    ) -> User | None:
+    async def rotate_refresh_token(
+        self,
+        db: AsyncSession,
+        token: str,
+        new_token: str,
+    ) -> uuid.UUID | None:
         """
         (토큰 재발급 시 사용)
-        유효한 Refresh Token으로 사용자 조회
+        유효한 Refresh Token을 폐기하고 새 토큰을 같은 트랜잭션으로 저장
+        - 폐기는 UPDATE ... RETURNING 1회 (동시 재발급 요청 중 하나만 성공)
+        - 유효하지 않으면 None
         """
         result = await db.execute(
-            select(RefreshToken)
+            update(RefreshToken)
             .where(
                 RefreshToken.token == token,
                 RefreshToken.is_revoked == False, # 폐기되지 않았고
                 RefreshToken.expires_at > datetime.now(timezone.utc) # 만료되지 않은
             )
-            .options(joinedload(RefreshToken.user)) # User 정보 join
+            .values(is_revoked=True)
+            .returning(RefreshToken.user_id)
+            .execution_options(synchronize_session=False)
         )
-        refresh_token_obj = result.scalars().first()
+        user_id = result.scalar_one_or_none()
+        if user_id is None:
+            await db.rollback()
+            return None
 
-        if refresh_token_obj:
-            refresh_token_obj.is_revoked = True
-            db.add(refresh_token_obj)
-            await db.commit()
-
-            return refresh_token_obj.user
-        return None
+        db.add(RefreshToken(
+            user_id=user_id,
+            token=new_token,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        ))
+        await db.commit()
+        return user_id
 
 user_service = UserService()
\ No newline at end of file
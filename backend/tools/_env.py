@@ -0,0 +1,48 @@
+"""
+로컬 벤치마크/부하 테스트용 설정
+.env 없이도 app 모듈을 import 할 수 있도록 필수 설정의 기본값을 채웁니다.
+(이미 환경 변수나 .env 에 값이 있으면 그 값을 그대로 사용)
+반드시 app 모듈을 import 하기 전에 호출해야 합니다.
+기본 DB(SQLite)는 aiosqlite 가 필요합니다: pip install -e ".[bench]"
+"""
+import importlib.util
+import os
+import sys
+from dotenv import dotenv_values
+
+LOCAL_DEFAULTS = {
+    "DATABASE_URL": "sqlite+aiosqlite:///./bench.db?timeout=30",
+    "FRONTEND_URL": "http://localhost:5173",
+    "KIS_BASE_URL": "http://127.0.0.1:9443",
+    "KIS_WS_URL": "ws://127.0.0.1:9443",
+    "TWLEVEDATA_BASE_URL": "http://127.0.0.1:9443",
+    "KAKAO_REDIRECT_URI": "http://localhost:8000/auth/kakao/callback",
+    "GOOGLE_REDIRECT_URI": "http://localhost:8000/auth/google/callback",
+    "KIS_APP_KEY": "local-app-key",
+    "KIS_SECRET_KEY": "local-secret-key",
+    "TWLEVEDATA_API_KEY": "local",
+    "KAKAO_CLIENT_ID": "local",
+    "KAKAO_CLIENT_SECRET": "local",
+    "GOOGLE_CLIENT_ID": "local",
+    "GOOGLE_CLIENT_SECRET": "local",
+    "JWT_SECRET_KEY": "local-bench-secret",
+    "JWT_ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+    "REFRESH_TOKEN_EXPIRE_DAYS": "7",
+    "KAKAO_AUTH_BASE_URL": "http://127.0.0.1:9444/kakao",
+    "KAKAO_API_BASE_URL": "http://127.0.0.1:9444/kakao",
+    "GOOGLE_DISCOVERY_URL": "http://127.0.0.1:9444/google/.well-known/openid-configuration",
+}
+
+def use_local_settings(**overrides):
+    """overrides 로 넘긴 값은 항상 우선 적용"""
+    from_dotenv = dotenv_values(".env")
+    for key, value in LOCAL_DEFAULTS.items():
+        if key not in os.environ and key not in from_dotenv:
+            os.environ[key] = value
+    for key, value in overrides.items():
+        if value is not None:
+            os.environ[key] = str(value)
+    database_url = os.environ.get("DATABASE_URL") or from_dotenv.get("DATABASE_URL") or ""
+    if database_url.startswith("sqlite+aiosqlite") and importlib.util.find_spec("aiosqlite") is None:
+        sys.exit('⛔ 로컬 SQLite DB 에는 aiosqlite 가 필요합니다: pip install -e ".[bench]" (또는 --database-url 로 PostgreSQL 지정)')
@@ -0,0 +1,302 @@
+"""
+핫 패스 마이크로 벤치마크 (기준값 대비 회귀 확인)
+
+운영 CPU 대부분을 차지하는 함수들을 timeit 으로 측정하고
+tools/bench_baseline.json 에 기록된 기준값과 비교합니다.
+- 종목 검색 / 마스터 파일 로드
+- 분봉 병합, 순위 항목 매핑, 순위 병합/정렬, 순위 diff
+- 실시간 프레임 파싱(handle_frame), 구독자 전송 직렬화(fan-out), 호가 diff
+- TTL 캐시 조회, 메트릭 기록
+
+기준값 대비 --tolerance 이상 느려진 항목이 있으면 종료 코드 1 을 반환합니다.
+각 항목은 순수 파이썬 보정 작업 대비 배수(relative)로 비교해 머신 속도 차이를 상쇄합니다.
+- 보정 작업과 항목을 번갈아 --repeat 번 재고, 같은 시점 측정끼리의 배수 중앙값을 사용 (순간 부하 상쇄)
+- 회귀로 보이면 --confirm 번 다시 재서 매번 회귀일 때만 실패로 판정
+파이썬 버전이 다르면 비교 의미가 약하므로 같은 버전에서 비교하는 것이 좋습니다.
+
+사용법 (backend 디렉터리에서):
+    python -m tools.bench_hot_paths                 # 기준값과 비교
+    python -m tools.bench_hot_paths -k ranking      # 이름에 ranking 이 들어간 항목만
+    python -m tools.bench_hot_paths --save          # 현재 결과를 기준값으로 저장
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import timeit
+
+from tools._env import use_local_settings
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="keyword", default=None, help="이름에 포함된 항목만 실행")
+    parser.add_argument("--repeat", type=int, default=9, help="반복 측정 횟수 (보정 작업 대비 배수의 중앙값 사용)")
+    parser.add_argument("--confirm", type=int, default=2, help="회귀로 보일 때 다시 잴 횟수 (매번 회귀여야 실패)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="회귀 판단 기준 (0.25 = 25%% 느려짐)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="기준값 파일")
+    parser.add_argument("--save", action="store_true", help="현재 결과를 기준값으로 저장")
+    return parser.parse_args()
+
+class FakeClient:
+    """send_text 만 있는 웹소켓 대역"""
+    async def send_text(self, text: str):
+        pass
+
+# ---------------------------------------------------------------------
+# 측정 대상 (각 함수는 (호출할 함수, 호출당 처리 건수) 반환)
+# ---------------------------------------------------------------------
+def bench_search_stocks():
+    from app.services.stock_info import stock_info_service
+    keywords = ["삼성", "005930", "AAPL", "카카오", "a", "테슬라"]
+    return lambda: [stock_info_service.search_stocks(k) for k in keywords], len(keywords)
+
+def bench_load_master_file():
+    from app.services import stock_info
+    from app.services.stock_info import StockInfoService
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(stock_info.__file__))), "kospi_code.mst")
+    loader = StockInfoService.__new__(StockInfoService)
+
+    def run():
+        loader.code_to_name, loader.name_to_code, loader.code_to_market = {}, {}, {}
+        loader.load_master_file(path, "DOMESTIC")
+    return run, 1
+
+def bench_aggregate_minute_data():
+    from app.services.kis_data import kis_data
+    rng = random.Random(1)
+    start = 1735689600  # 2025-01-01 09:00 KST
+    bars = []
+    for i in range(390):
+        price = 70000 + rng.randint(-500, 500)
+        bars.append({"time": start + i * 60, "open": price, "high": price + 100, "low": price - 100, "close": price, "volume": 1000.0})
+    return lambda: kis_data._aggregate_minute_data(list(bars), 5), len(bars)
+
+def raw_domestic_ranking(n=30):
+    rng = random.Random(2)
+    return [
+        {
+            "mksc_shrn_iscd": f"{i:06d}", "hts_kor_isnm": f"종목{i}", "stck_prpr": str(rng.randint(1000, 900000)),
+            "prdy_ctrt": f"{rng.uniform(-10, 10):.2f}", "acml_vol": str(rng.randint(1, 10**7)),
+            "acml_tr_pbmn": str(rng.randint(1, 10**12))
+        }
+        for i in range(n)
+    ]
+
+def ranking_items(market, n=30, seed=3):
+    from app.services.ranking import RankingItem
+    rng = random.Random(seed)
+    return [
+        RankingItem(code=f"{market}{i}", name=None, price=rng.uniform(1000, 900000), change_rate=rng.uniform(-10, 10),
+                    volume=rng.randint(1, 10**7), amount=rng.randint(1, 10**12), market=market)
+        for i in range(n)
+    ]
+
+def bench_map_ranking_item():
+    from app.services.kis_data import kis_data
+    raw = raw_domestic_ranking()
+    return lambda: [kis_data._map_ranking_item(item) for item in raw], len(raw)
+
+def bench_ranking_merge_all():
+    """ALL 순위 1회 계산 (한글명 보정 + 국내/해외 병합 + 응답 변환)"""
+    from app.services.ranking import merge_top_k
+    from app.services.ranking_service import RankingService
+    domestic, overseas = ranking_items("KR"), ranking_items("NAS", seed=4)
+
+    def run():
+        RankingService._apply_names(domestic)
+        return [item.to_dict() for item in merge_top_k([domestic, overseas], "volume")]
+    return run, 1
+
+def bench_diff_rankings():
+    from app.services.ranking import diff_rankings
+    previous = [item.to_dict() for item in ranking_items("KR")]
+    current = [dict(item) for item in previous]
+    rng = random.Random(5)
+    rng.shuffle(current)
+    for item in current[:10]:
+        item["price"] = str(int(item["price"]) + 10)
+    return lambda: diff_rankings(previous, current), 1
+
+def _frame_batch(frames, subscribers):
+    """handle_frame 을 batch 단위로 실행 (이벤트 루프 진입 비용 분산)"""
+    from app.services.kis_ws import kis_ws_manager
+    for frame in frames:
+        code = frame.split("|")[3].split("^")[0]
+        kis_ws_manager.subscriptions[code] = {FakeClient() for _ in range(subscribers)}
+        kis_ws_manager.hoga_subscriptions[code] = {FakeClient() for _ in range(subscribers)}
+    loop = asyncio.new_event_loop()
+
+    async def batch():
+        for frame in frames:
+            await kis_ws_manager.handle_frame(frame)
+    return lambda: loop.run_until_complete(batch()), len(frames)
+
+def trade_frames(n=200):
+    rng = random.Random(6)
+    frames = []
+    for i in range(n):
+        fields = ["0"] * 46
+        price = 70000 + rng.randint(-20, 20) * 100
+        fields[0], fields[1], fields[2], fields[4], fields[5] = "005930", "093001", str(price), str(price - 70000), "0.14"
+        fields[12], fields[13], fields[14], fields[16] = "10", str(1000 + i), "70000000", "99.5"
+        frames.append("0|H0STCNT0|001|" + "^".join(fields))
+    return frames
+
+def bench_handle_frame_trade():
+    """국내 체결 프레임 파싱 + 저장 + 구독자 1명 전송"""
+    return _frame_batch(trade_frames(), subscribers=1)
+
+def bench_handle_frame_hoga():
+    rng = random.Random(7)
+    frames = []
+    for _ in range(200):
+        fields = ["0"] * 59
+        fields[0], fields[1] = "000660", "093001"
+        for i in range(10):
+            fields[3 + i], fields[13 + i] = str(200500 + i * 500), str(200000 - i * 500)
+            fields[23 + i], fields[33 + i] = str(rng.randint(1, 5000)), str(rng.randint(1, 5000))
+        fields[43], fields[44] = "25000", "25000"
+        frames.append("0|H0STASP0|001|" + "^".join(fields))
+    return _frame_batch(frames, subscribers=1)
+
+def bench_fanout_100():
+    """체결 1건을 구독자 100명에게 직렬화/전송"""
+    from app.services.kis_ws import kis_ws_manager
+    kis_ws_manager.subscriptions["FANOUT"] = {FakeClient() for _ in range(100)}
+    data = {"type": "trade", "code": "FANOUT", "time": "093001", "price": "70000", "change": "100",
+            "rate": "0.14", "volume": "10", "acml_vol": "1000", "power": "99.5"}
+    loop = asyncio.new_event_loop()
+    return lambda: loop.run_until_complete(kis_ws_manager.broadcast("FANOUT", data)), 1
+
+def bench_order_book_apply():
+    from app.services.order_book import OrderBook
+    book = OrderBook("005930")
+    rng = random.Random(8)
+    updates = [
+        ([(str(70100 + i * 100), str(rng.randint(1, 5000))) for i in range(10)],
+         [(str(70000 - i * 100), str(rng.randint(1, 5000))) for i in range(10)])
+        for _ in range(100)
+    ]
+    return lambda: [book.apply(asks, bids, "1000", "1000", "093001") for asks, bids in updates], len(updates)
+
+def bench_ttl_cache_get():
+    from app.core.cache import TTLCache
+    cache = TTLCache(ttl=60)
+    keys = [f"KR:{i:06d}" for i in range(1000)]
+    for key in keys:
+        cache.set(key, {"price": "1"})
+    return lambda: [cache.get(key) for key in keys], len(keys)
+
+def bench_histogram_observe():
+    from app.core.metrics import Histogram
+    histogram = Histogram("bench_seconds", "bench", ("tr_id",))
+    values = [random.Random(9).random() for _ in range(1000)]
+    return lambda: [histogram.observe(v, tr_id="FHKST01010100") for v in values], len(values)
+
+BENCHMARKS = {
+    "search_stocks": bench_search_stocks,
+    "load_master_file": bench_load_master_file,
+    "aggregate_minute_data": bench_aggregate_minute_data,
+    "map_ranking_item": bench_map_ranking_item,
+    "ranking_merge_all": bench_ranking_merge_all,
+    "diff_rankings": bench_diff_rankings,
+    "handle_frame_trade": bench_handle_frame_trade,
+    "handle_frame_hoga": bench_handle_frame_hoga,
+    "fanout_100_clients": bench_fanout_100,
+    "order_book_apply": bench_order_book_apply,
+    "ttl_cache_get": bench_ttl_cache_get,
+    "histogram_observe": bench_histogram_observe,
+}
+
+# ---------------------------------------------------------------------
+# 실행
+# ---------------------------------------------------------------------
+def calibration_work():
+    """머신 속도 보정용 순수 파이썬 작업"""
+    total = 0
+    for i in range(2000):
+        total += i * i % 7
+    return {str(i): i for i in range(200)}
+
+def measure(fn, ops, repeat):
+    """
+    보정 작업과 번갈아 repeat 번 측정
+    -> (건당 마이크로초 최솟값, 보정 작업 대비 배수 중앙값)
+    """
+    timer, calib_timer = timeit.Timer(fn), timeit.Timer(calibration_work)
+    number, _ = timer.autorange()
+    calib_number, _ = calib_timer.autorange()
+    samples, ratios = [], []
+    for _ in range(repeat):
+        calib = calib_timer.timeit(calib_number) / calib_number
+        sample = timer.timeit(number) / number / ops
+        samples.append(sample)
+        ratios.append(sample / calib)
+    return min(samples) * 1_000_000, statistics.median(ratios)
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def main():
+    args = parse_args()
+    use_local_settings()
+
+    import logging
+    logging.disable(logging.INFO)  # 서비스 로드 로그 생략
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+
+    results = {}
+    regressions = []
+    print(f"{'benchmark':<24}{'us/op':>12}{'baseline':>12}{'ratio':>8}")
+    for name, setup in BENCHMARKS.items():
+        if args.keyword and args.keyword not in name:
+            continue
+        fn, ops = setup()
+        fn()  # 워밍업
+        base = baseline.get(name)
+        # 회귀로 보이면 일시적인 부하일 수 있으므로 --confirm 번 다시 재서 매번 회귀일 때만 실패 (가장 나은 값 표시)
+        for _ in range(1 + args.confirm):
+            us_per_op, relative = measure(fn, ops, args.repeat)
+            if name not in results or relative < results[name]["relative"]:
+                results[name] = {"us_per_op": round(us_per_op, 3), "relative": round(relative, 4)}
+            ratio = results[name]["relative"] / base["relative"] if base else None
+            if args.save or not ratio or ratio <= 1 + args.tolerance:
+                break
+        us_per_op = results[name]["us_per_op"]
+        base_us = f"{us_per_op / ratio:.3f}" if ratio else "-"  # 현재 머신 기준으로 환산한 기준값
+        mark = ""
+        if ratio and ratio > 1 + args.tolerance:
+            regressions.append(name)
+            mark = "  ⚠️ 회귀"
+        print(f"{name:<24}{us_per_op:>12.3f}{base_us:>12}{f'{ratio:.2f}' if ratio else '-':>8}{mark}")
+
+    if args.save:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": {**baseline, **results}
+            }, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"\n기준값 저장: {args.baseline}")
+    elif regressions:
+        print(f"\n⛔ 기준값 대비 {args.tolerance:.0%} 이상 느려진 항목: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
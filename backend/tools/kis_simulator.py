@@ -0,0 +1,536 @@
+"""
+로컬 KIS 시뮬레이터 (REST + WebSocket)
+
+앱이 사용하는 KIS TR 을 합성 데이터로 응답하는 스텁 서버입니다.
+실 KIS 없이 벤치마크/부하 테스트를 같은 조건에서 반복 실행하기 위해 사용합니다.
+- REST: /oauth2/tokenP, /oauth2/Approval, 국내/해외 현재가·순위·호가·체결·차트 TR
+- WebSocket: /tryitout/H0STCNT0 (H0STCNT0 / H0GSCNT0 체결, H0STASP0 / HDFSASP0 호가)
+  프레임 필드 위치는 KISWebSocketManager.handle_frame 의 파서 기준
+- 지연 시간, 호출 제한(EGW00201) 응답, 웹소켓 강제 끊김을 옵션으로 주입
+
+사용법 (backend 디렉터리에서):
+    python -m tools.kis_simulator --port 9443 --tick-rate 20 --latency-ms 30 --max-rps 20
+
+앱은 KIS_BASE_URL=http://127.0.0.1:9443, KIS_WS_URL=ws://127.0.0.1:9443 으로 실행합니다.
+(tools._env 의 기본값과 같습니다.) 요청/전송 통계는 GET /sim/stats 로 확인합니다.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import uvicorn
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+
+KST = timezone(timedelta(hours=9))
+HOGA_LEVELS = 10
+PAGE_SIZE = 120
+
+DOMESTIC_STOCKS = {
+    "005930": "삼성전자", "000660": "SK하이닉스", "373220": "LG에너지솔루션", "207940": "삼성바이오로직스",
+    "005380": "현대차", "000270": "기아", "068270": "셀트리온", "005490": "POSCO홀딩스",
+    "035420": "NAVER", "035720": "카카오", "051910": "LG화학", "006400": "삼성SDI",
+    "105560": "KB금융", "055550": "신한지주", "012330": "현대모비스", "028260": "삼성물산",
+    "066570": "LG전자", "003670": "포스코퓨처엠", "096770": "SK이노베이션", "034730": "SK",
+    "015760": "한국전력", "032830": "삼성생명", "003550": "LG", "086790": "하나금융지주",
+    "017670": "SK텔레콤", "030200": "KT", "009150": "삼성전기", "018260": "삼성에스디에스",
+    "011200": "HMM", "259960": "크래프톤", "010130": "고려아연", "033780": "KT&G",
+}
+
+OVERSEAS_STOCKS = {
+    "AAPL": "Apple", "MSFT": "Microsoft", "NVDA": "NVIDIA", "AMZN": "Amazon.com", "GOOGL": "Alphabet A",
+    "META": "Meta Platforms", "TSLA": "Tesla", "AVGO": "Broadcom", "COST": "Costco", "NFLX": "Netflix",
+    "AMD": "Advanced Micro Devices", "PEP": "PepsiCo", "ADBE": "Adobe", "CSCO": "Cisco", "INTC": "Intel",
+    "QCOM": "Qualcomm", "TXN": "Texas Instruments", "AMAT": "Applied Materials", "INTU": "Intuit",
+    "PYPL": "PayPal", "SBUX": "Starbucks", "MU": "Micron", "PLTR": "Palantir", "MRVL": "Marvell",
+    "ABNB": "Airbnb", "PANW": "Palo Alto Networks", "CRWD": "CrowdStrike", "ASML": "ASML", "ARM": "Arm",
+    "SMCI": "Super Micro Computer",
+}
+
+THROTTLE_BODY = {"rt_cd": "1", "msg_cd": "EGW00201", "msg1": "초당 거래건수를 초과하였습니다."}
+
+@dataclass
+class SimConfig:
+    latency_ms: float = 0.0        # REST 응답 평균 지연
+    jitter_ms: float = 0.0         # REST 응답 지연 표준편차
+    throttle_rate: float = 0.0     # 무작위로 EGW00201 을 돌려줄 비율
+    max_rps: float = 0.0           # 초당 허용 요청 수 (초과 시 EGW00201, 0 이면 무제한)
+    tick_rate: float = 10.0        # 구독 종목당 초당 체결 프레임 수
+    hoga_rate: float = 2.0         # 구독 종목당 초당 호가 프레임 수
+    disconnect_after: float = 0.0  # 웹소켓 연결 후 N초 뒤 강제 종료 (0 이면 안 함)
+    seed: int = 42
+
+# ---------------------------------------------------------------------
+# 합성 시세
+# ---------------------------------------------------------------------
+class Instrument:
+    """종목별 랜덤 워크 시세"""
+    def __init__(self, code: str, name: str, domestic: bool, rng: random.Random):
+        seed = zlib.crc32(code.encode())
+        self.code = code
+        self.name = name
+        self.domestic = domestic
+        self.tick = 50.0 if domestic else 0.01
+        base = (10000 + seed % 400000) if domestic else (20 + seed % 800) + (seed % 100) / 100
+        self.prev_close = self._round(base)
+        self.price = self.prev_close
+        self.acml_vol = 0
+        self.acml_amount = 0.0
+        self.shares = 50_000_000 + seed % 5_000_000_000
+        self.eps = self.prev_close / (8 + seed % 20)
+        self.bps = self.prev_close / (0.5 + (seed % 30) / 10)
+        self.rng = rng
+
+    def _round(self, price: float) -> float:
+        return max(self.tick, round(round(price / self.tick) * self.tick, 2))
+
+    def step(self):
+        """체결 1건 (가격 이동 + 거래량 누적) -> 체결 수량"""
+        self.price = self._round(self.price + self.rng.choice((-1, 0, 0, 1)) * self.tick)
+        volume = self.rng.randint(1, 500)
+        self.acml_vol += volume
+        self.acml_amount += volume * self.price
+        return volume
+
+    @property
+    def diff(self) -> float:
+        return round(self.price - self.prev_close, 2)
+
+    @property
+    def rate(self) -> float:
+        return round(self.diff / self.prev_close * 100, 2)
+
+    @property
+    def sign(self) -> str:
+        return "2" if self.diff > 0 else "5" if self.diff < 0 else "3"
+
+    def fmt(self, value: float) -> str:
+        return str(int(value)) if self.domestic else f"{value:.2f}"
+
+    def book(self):
+        """10단계 (매도호가, 매도잔량), (매수호가, 매수잔량)"""
+        asks = [(self.price + self.tick * (i + 1), self.rng.randint(100, 20000)) for i in range(HOGA_LEVELS)]
+        bids = [(self.price - self.tick * i, self.rng.randint(100, 20000)) for i in range(HOGA_LEVELS)]
+        return asks, bids
+
+class Market:
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.instruments = {}
+        for code, name in DOMESTIC_STOCKS.items():
+            self.instruments[code] = Instrument(code, name, True, self.rng)
+        for code, name in OVERSEAS_STOCKS.items():
+            self.instruments[code] = Instrument(code, name, False, self.rng)
+        # 순위가 의미 있도록 초기 거래를 조금 만들어 둠
+        for inst in self.instruments.values():
+            for _ in range(self.rng.randint(5, 60)):
+                inst.step()
+
+    def get(self, code: str) -> Instrument:
+        inst = self.instruments.get(code)
+        if inst is None:
+            domestic = code.isdigit() and len(code) == 6
+            inst = self.instruments[code] = Instrument(code, code, domestic, self.rng)
+        return inst
+
+    def universe(self, domestic: bool):
+        return [inst for inst in self.instruments.values() if inst.domestic == domestic]
+
+# ---------------------------------------------------------------------
+# 서버
+# ---------------------------------------------------------------------
+def create_app(config: SimConfig) -> FastAPI:
+    app = FastAPI(title="KIS Simulator")
+    market = Market(config.seed)
+    stats = Counter()
+    window = {"second": 0, "count": 0}
+
+    async def gate(request: Request):
+        """지연/호출 제한 주입 -> 제한에 걸리면 응답 반환"""
+        tr_id = request.headers.get("tr_id") or request.url.path
+        stats[f"rest:{tr_id}"] += 1
+
+        if config.latency_ms or config.jitter_ms:
+            delay = max(0.0, market.rng.gauss(config.latency_ms, config.jitter_ms)) / 1000
+            await asyncio.sleep(delay)
+
+        now = int(time.monotonic())
+        if window["second"] != now:
+            window["second"], window["count"] = now, 0
+        window["count"] += 1
+        over_limit = config.max_rps and window["count"] > config.max_rps
+        if over_limit or (config.throttle_rate and market.rng.random() < config.throttle_rate):
+            stats["rest:throttled"] += 1
+            return JSONResponse(THROTTLE_BODY, status_code=500)
+        return None
+
+    def ok(**payload):
+        return {"rt_cd": "0", "msg_cd": "MCA00000", "msg1": "정상처리 되었습니다.", **payload}
+
+    # ----- 인증 -----
+    @app.post("/oauth2/tokenP")
+    async def token_p(request: Request):
+        if (blocked := await gate(request)): return blocked
+        expired = datetime.now(KST) + timedelta(days=1)
+        return {
+            "access_token": f"sim-{uuid.uuid4().hex}", "token_type": "Bearer", "expires_in": 86400,
+            "access_token_token_expired": expired.strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    @app.post("/oauth2/Approval")
+    async def approval(request: Request):
+        if (blocked := await gate(request)): return blocked
+        return {"approval_key": str(uuid.uuid4())}
+
+    # ----- 국내 시세 -----
+    def domestic_price(inst: Instrument) -> dict:
+        return {
+            "stck_prpr": inst.fmt(inst.price), "prdy_vrss": inst.fmt(inst.diff), "prdy_vrss_sign": inst.sign,
+            "prdy_ctrt": f"{inst.rate:.2f}", "acml_vol": str(inst.acml_vol), "acml_tr_pbmn": str(int(inst.acml_amount)),
+            "hts_avls": str(int(inst.price * inst.shares / 100_000_000)), "lstn_stcn": str(inst.shares),
+            "per": f"{inst.price / inst.eps:.2f}", "pbr": f"{inst.price / inst.bps:.2f}",
+            "eps": f"{inst.eps:.0f}", "bps": f"{inst.bps:.0f}", "vol_tnrt": f"{inst.acml_vol / inst.shares * 100:.2f}"
+        }
+
+    @app.get("/uapi/domestic-stock/v1/quotations/inquire-price")
+    async def inquire_price(request: Request, FID_INPUT_ISCD: str = "", fid_input_iscd: str = ""):
+        if (blocked := await gate(request)): return blocked
+        return ok(output=domestic_price(market.get(FID_INPUT_ISCD or fid_input_iscd)))
+
+    @app.get("/uapi/domestic-stock/v1/quotations/intstock-multprice")
+    async def multi_price(request: Request):
+        if (blocked := await gate(request)): return blocked
+        output = []
+        for i in range(1, 31):
+            code = request.query_params.get(f"FID_INPUT_ISCD_{i}")
+            if not code: continue
+            inst = market.get(code)
+            output.append({
+                "inter_shrn_iscd": code, "inter_kor_isnm": inst.name, "inter2_prpr": inst.fmt(inst.price),
+                "inter2_prdy_vrss": inst.fmt(inst.diff), "prdy_ctrt": f"{inst.rate:.2f}",
+                "acml_vol": str(inst.acml_vol), "acml_tr_pbmn": str(int(inst.acml_amount))
+            })
+        return ok(output=output)
+
+    def domestic_ranking(key, reverse=True, code_field="stck_shrn_iscd"):
+        ranked = sorted(market.universe(True), key=key, reverse=reverse)
+        return ok(output=[
+            {
+                code_field: inst.code, "hts_kor_isnm": inst.name, "stck_prpr": inst.fmt(inst.price),
+                "prdy_ctrt": f"{inst.rate:.2f}", "acml_vol": str(inst.acml_vol),
+                "acml_tr_pbmn": str(int(inst.acml_amount)), "stck_avls": str(int(inst.price * inst.shares / 100_000_000))
+            }
+            for inst in ranked
+        ])
+
+    @app.get("/uapi/domestic-stock/v1/quotations/volume-rank")
+    async def volume_rank(request: Request, FID_BLNG_CLS_CODE: str = "0"):
+        if (blocked := await gate(request)): return blocked
+        key = (lambda i: i.acml_amount) if FID_BLNG_CLS_CODE == "3" else (lambda i: i.acml_vol)
+        return domestic_ranking(key, code_field="mksc_shrn_iscd")
+
+    @app.get("/uapi/domestic-stock/v1/ranking/market-cap")
+    async def market_cap_rank(request: Request):
+        if (blocked := await gate(request)): return blocked
+        return domestic_ranking(lambda i: i.price * i.shares)
+
+    @app.get("/uapi/domestic-stock/v1/ranking/fluctuation")
+    async def fluctuation_rank(request: Request, FID_RANK_SORT_CLS_CODE: str = "0"):
+        if (blocked := await gate(request)): return blocked
+        return domestic_ranking(lambda i: i.rate, reverse=FID_RANK_SORT_CLS_CODE == "0")
+
+    @app.get("/uapi/domestic-stock/v1/quotations/inquire-asking-price-exp-ccn")
+    async def domestic_hoga(request: Request, FID_INPUT_ISCD: str = ""):
+        if (blocked := await gate(request)): return blocked
+        inst = market.get(FID_INPUT_ISCD)
+        asks, bids = inst.book()
+        out = {"aspr_acpt_hour": datetime.now(KST).strftime("%H%M%S")}
+        for i, ((ap, av), (bp, bv)) in enumerate(zip(asks, bids), start=1):
+            out.update({f"askp{i}": inst.fmt(ap), f"askp_rsqn{i}": str(av), f"bidp{i}": inst.fmt(bp), f"bidp_rsqn{i}": str(bv)})
+        out["total_askp_rsqn"] = str(sum(v for _, v in asks))
+        out["total_bidp_rsqn"] = str(sum(v for _, v in bids))
+        return ok(output1=out, output2={})
+
+    @app.get("/uapi/domestic-stock/v1/quotations/inquire-time-itemconclusion")
+    async def domestic_trades(request: Request, FID_INPUT_ISCD: str = ""):
+        if (blocked := await gate(request)): return blocked
+        inst = market.get(FID_INPUT_ISCD)
+        now = datetime.now(KST)
+        output2 = []
+        for i in range(30):
+            volume = inst.rng.randint(1, 500)
+            output2.append({
+                "stck_cntg_hour": (now - timedelta(seconds=i * 3)).strftime("%H%M%S"), "stck_prpr": inst.fmt(inst.price),
+                "prdy_vrss": inst.fmt(inst.diff), "prdy_ctrt": f"{inst.rate:.2f}", "cnqn": str(volume),
+                "acml_vol": str(max(inst.acml_vol - i * volume, 0)), "tday_rltv": "105.32"
+            })
+        return ok(output1={}, output2=output2)
+
+    def bar(inst: Instrument):
+        close = inst.price + inst.rng.choice((-2, -1, 0, 1, 2)) * inst.tick
+        high = max(close, inst.price) + inst.tick
+        low = min(close, inst.price) - inst.tick
+        return inst.fmt(inst.price), inst.fmt(high), inst.fmt(low), inst.fmt(close), str(inst.rng.randint(100, 50000))
+
+    @app.get("/uapi/domestic-stock/v1/quotations/inquire-time-dailychartprice")
+    async def domestic_minute_chart(request: Request, FID_INPUT_ISCD: str = "", FID_INPUT_DATE_1: str = "", FID_INPUT_HOUR_1: str = ""):
+        if (blocked := await gate(request)): return blocked
+        inst = market.get(FID_INPUT_ISCD)
+        start = datetime.strptime(f"{FID_INPUT_DATE_1}{FID_INPUT_HOUR_1 or '153000'}", "%Y%m%d%H%M%S")
+        output2 = []
+        for i in range(PAGE_SIZE):
+            t = start - timedelta(minutes=i)
+            o, h, l, c, v = bar(inst)
+            output2.append({
+                "stck_bsop_date": t.strftime("%Y%m%d"), "stck_cntg_hour": t.strftime("%H%M00"),
+                "stck_prpr": c, "stck_oprc": o, "stck_hgpr": h, "stck_lwpr": l, "cntg_vol": v
+            })
+        return ok(output1={}, output2=output2)
+
+    @app.get("/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice")
+    async def domestic_daily_chart(request: Request, FID_INPUT_ISCD: str = "", FID_INPUT_DATE_2: str = ""):
+        if (blocked := await gate(request)): return blocked
+        inst = market.get(FID_INPUT_ISCD)
+        end = datetime.strptime(FID_INPUT_DATE_2, "%Y%m%d") if FID_INPUT_DATE_2 else datetime.now(KST)
+        output2 = []
+        for i in range(100):
+            o, h, l, c, v = bar(inst)
+            output2.append({
+                "stck_bsop_date": (end - timedelta(days=i)).strftime("%Y%m%d"),
+                "stck_oprc": o, "stck_hgpr": h, "stck_lwpr": l, "stck_clpr": c, "acml_vol": v
+            })
+        return ok(output1={}, output2=output2)
+
+    # ----- 해외 시세 -----
+    @app.get("/uapi/overseas-price/v1/quotations/price")
+    async def overseas_price(request: Request, SYMB: str = ""):
+        if (blocked := await gate(request)): return blocked
+        inst = market.get(SYMB)
+        return ok(output={
+            "rsym": f"DNAS{SYMB}", "last": inst.fmt(inst.price), "diff": f"{abs(inst.diff):.2f}", "sign": inst.sign,
+            "rate": f"{inst.rate:.2f}", "tvol": str(inst.acml_vol), "tamt": f"{inst.acml_amount:.2f}",
+            "base": inst.fmt(inst.prev_close)
+        })
+
+    @app.get("/uapi/overseas-price/v1/quotations/price-detail")
+    async def overseas_detail(request: Request, SYMB: str = ""):
+        if (blocked := await gate(request)): return blocked
+        inst = market.get(SYMB)
+        return ok(output={
+            "last": inst.fmt(inst.price), "base": inst.fmt(inst.prev_close), "tomv": f"{inst.price * inst.shares:.0f}",
+            "epsx": f"{inst.eps:.2f}", "bpsx": f"{inst.bps:.2f}", "shar": str(inst.shares),
+            "perx": f"{inst.price / inst.eps:.2f}", "pbrx": f"{inst.price / inst.bps:.2f}"
+        })
+
+    @app.get("/uapi/overseas-price/v1/quotations/inquire-asking-price")
+    async def overseas_hoga(request: Request, SYMB: str = ""):
+        if (blocked := await gate(request)): return blocked
+        inst = market.get(SYMB)
+        asks, bids = inst.book()
+        out = {}
+        for i, ((ap, av), (bp, bv)) in enumerate(zip(asks, bids), start=1):
+            out.update({f"pask{i}": inst.fmt(ap), f"vask{i}": str(av), f"pbid{i}": inst.fmt(bp), f"vbid{i}": str(bv)})
+        return ok(output1={"dhms": datetime.now(KST).strftime("%H%M%S")}, output2=out)
+
+    @app.get("/uapi/overseas-price/v1/quotations/inquire-ccnl")
+    async def overseas_trades(request: Request, SYMB: str = ""):
+        if (blocked := await gate(request)): return blocked
+        inst = market.get(SYMB)
+        now = datetime.now(KST)
+        output1 = []
+        for i in range(30):
+            t = now - timedelta(seconds=i * 3)
+            output1.append({
+                "xymd": now.strftime("%Y%m%d"), "khms": t.strftime("%H%M%S"), "last": inst.fmt(inst.price),
+                "diff": f"{abs(inst.diff):.2f}", "sign": inst.sign, "rate": f"{inst.rate:.2f}",
+                "evol": str(inst.rng.randint(1, 500)), "tvol": str(inst.acml_vol), "vpow": "98.71"
+            })
+        return ok(output1=output1)
+
+    @app.get("/uapi/overseas-price/v1/quotations/inquire-time-itemchartprice")
+    async def overseas_minute_chart(request: Request, SYMB: str = "", KEYB: str = ""):
+        if (blocked := await gate(request)): return blocked
+        inst = market.get(SYMB)
+        start = datetime.strptime(KEYB, "%Y%m%d%H%M%S") - timedelta(minutes=1) if KEYB else datetime.now(KST).replace(tzinfo=None, second=0)
+        output2 = []
+        for i in range(PAGE_SIZE):
+            t = start - timedelta(minutes=i)
+            o, h, l, c, v = bar(inst)
+            output2.append({
+                "kymd": t.strftime("%Y%m%d"), "khms": t.strftime("%H%M00"), "xymd": t.strftime("%Y%m%d"), "xhms": t.strftime("%H%M00"),
+                "open": o, "high": h, "low": l, "last": c, "evol": v
+            })
+        # 과거 조회 페이징은 5페이지까지만 제공
+        oldest = datetime.now(KST).replace(tzinfo=None) - timedelta(minutes=PAGE_SIZE * 5)
+        return ok(output1={"next": "1" if start - timedelta(minutes=PAGE_SIZE) > oldest else "0"}, output2=output2)
+
+    @app.get("/uapi/overseas-price/v1/quotations/dailyprice")
+    async def overseas_daily_chart(request: Request, SYMB: str = "", BYMD: str = ""):
+        if (blocked := await gate(request)): return blocked
+        inst = market.get(SYMB)
+        end = datetime.strptime(BYMD, "%Y%m%d") if BYMD else datetime.now(KST)
+        output2 = []
+        for i in range(100):
+            o, h, l, c, v = bar(inst)
+            output2.append({"xymd": (end - timedelta(days=i)).strftime("%Y%m%d"), "open": o, "high": h, "low": l, "clos": c, "tvol": v})
+        return ok(output1={}, output2=output2)
+
+    def overseas_ranking(key, reverse=True):
+        ranked = sorted(market.universe(False), key=key, reverse=reverse)
+        return ok(output1={}, output2=[
+            {
+                "symb": inst.code, "name": inst.name, "ename": inst.name, "last": inst.fmt(inst.price),
+                "rate": f"{inst.rate:.2f}", "tvol": str(inst.acml_vol), "tamt": f"{inst.acml_amount:.2f}",
+                "tomv": f"{inst.price * inst.shares:.0f}"
+            }
+            for inst in ranked
+        ])
+
+    @app.get("/uapi/overseas-stock/v1/ranking/trade-vol")
+    async def overseas_volume_rank(request: Request):
+        if (blocked := await gate(request)): return blocked
+        return overseas_ranking(lambda i: i.acml_vol)
+
+    @app.get("/uapi/overseas-stock/v1/ranking/trade-pbmn")
+    async def overseas_amount_rank(request: Request):
+        if (blocked := await gate(request)): return blocked
+        return overseas_ranking(lambda i: i.acml_amount)
+
+    @app.get("/uapi/overseas-stock/v1/ranking/market-cap")
+    async def overseas_cap_rank(request: Request):
+        if (blocked := await gate(request)): return blocked
+        return overseas_ranking(lambda i: i.price * i.shares)
+
+    @app.get("/uapi/overseas-stock/v1/ranking/updown-rate")
+    async def overseas_updown_rank(request: Request, GUBN: str = "1"):
+        if (blocked := await gate(request)): return blocked
+        return overseas_ranking(lambda i: i.rate, reverse=GUBN == "1")
+
+    # ----- 실시간 웹소켓 -----
+    def trade_frame(tr_id: str, inst: Instrument) -> str:
+        volume = inst.step()
+        now = datetime.now(KST).strftime("%H%M%S")
+        if tr_id == "H0STCNT0":
+            fields = ["0"] * 46
+            fields[0], fields[1], fields[2], fields[3] = inst.code, now, inst.fmt(inst.price), inst.sign
+            fields[4], fields[5] = inst.fmt(inst.diff), f"{inst.rate:.2f}"
+            fields[12], fields[13], fields[14] = str(volume), str(inst.acml_vol), str(int(inst.acml_amount))
+            fields[16] = fields[18] = "101.25"
+        else:
+            fields = ["0"] * 26
+            fields[0], fields[1], fields[2] = inst.code, now, inst.fmt(inst.price)
+            fields[3], fields[4], fields[5] = inst.sign, f"{inst.diff:.2f}", f"{inst.rate:.2f}"
+            fields[11], fields[12] = str(inst.acml_vol), str(volume)
+        return f"0|{tr_id}|001|{'^'.join(fields)}"
+
+    def hoga_frame(tr_id: str, inst: Instrument) -> str:
+        asks, bids = inst.book()
+        now = datetime.now(KST).strftime("%H%M%S")
+        if tr_id == "H0STASP0":
+            fields = ["0"] * 59
+            fields[0], fields[1] = inst.code, now
+            for i in range(HOGA_LEVELS):
+                fields[3 + i], fields[23 + i] = inst.fmt(asks[i][0]), str(asks[i][1])
+                fields[13 + i], fields[33 + i] = inst.fmt(bids[i][0]), str(bids[i][1])
+            fields[43], fields[44] = str(sum(v for _, v in asks)), str(sum(v for _, v in bids))
+        else:
+            fields = ["0"] * (11 + HOGA_LEVELS * 6)
+            fields[0], fields[1] = f"DNAS{inst.code}", inst.code
+            fields[7], fields[8] = str(sum(v for _, v in bids)), str(sum(v for _, v in asks))
+            for i in range(HOGA_LEVELS):
+                base = 11 + i * 6
+                fields[base], fields[base + 1] = inst.fmt(bids[i][0]), inst.fmt(asks[i][0])
+                fields[base + 2], fields[base + 3] = str(bids[i][1]), str(asks[i][1])
+        return f"0|{tr_id}|001|{'^'.join(fields)}"
+
+    async def emit(ws: WebSocket, subscriptions: dict, hoga: bool):
+        rate = config.hoga_rate if hoga else config.tick_rate
+        if rate <= 0:
+            return
+        interval = 1 / rate
+        next_at = time.perf_counter()
+        while True:
+            next_at += interval
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+            for (tr_id, code) in list(subscriptions):
+                frame = hoga_frame(tr_id, market.get(code)) if hoga else trade_frame(tr_id, market.get(code))
+                await ws.send_text(frame)
+                stats["ws:frames"] += 1
+
+    @app.websocket("/tryitout/{name}")
+    async def realtime(ws: WebSocket, name: str):
+        await ws.accept()
+        stats["ws:connections"] += 1
+        trades, books = {}, {}
+        tasks = [asyncio.create_task(emit(ws, trades, False)), asyncio.create_task(emit(ws, books, True))]
+        opened = time.monotonic()
+        try:
+            while True:
+                timeout = None
+                if config.disconnect_after:
+                    timeout = max(0.0, config.disconnect_after - (time.monotonic() - opened))
+                try:
+                    message = await asyncio.wait_for(ws.receive_text(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    stats["ws:forced_disconnects"] += 1
+                    await ws.close(code=1011)
+                    break
+
+                req = json.loads(message)
+                header, body = req.get("header", {}), req.get("body", {}).get("input", {})
+                tr_id, code = body.get("tr_id"), body.get("tr_key")
+                target = books if tr_id in ("H0STASP0", "HDFSASP0") else trades
+                if header.get("tr_type") == "2":
+                    target.pop((tr_id, code), None)
+                else:
+                    target[(tr_id, code)] = True
+                stats[f"ws:{tr_id}:{'unsubscribe' if header.get('tr_type') == '2' else 'subscribe'}"] += 1
+                await ws.send_text(json.dumps({
+                    "header": {"tr_id": tr_id, "tr_key": code, "encrypt": "N"},
+                    "body": {"rt_cd": "0", "msg_cd": "OPSP0000", "msg1": "SUBSCRIBE SUCCESS"}
+                }))
+        except WebSocketDisconnect:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @app.get("/sim/stats")
+    async def sim_stats():
+        return dict(stats)
+
+    return app
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9443)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="REST 평균 지연 (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="REST 지연 표준편차 (ms)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="무작위 EGW00201 비율 (0~1)")
+    parser.add_argument("--max-rps", type=float, default=0.0, help="초당 허용 요청 수 (초과 시 EGW00201)")
+    parser.add_argument("--tick-rate", type=float, default=10.0, help="구독 종목당 초당 체결 프레임 수")
+    parser.add_argument("--hoga-rate", type=float, default=2.0, help="구독 종목당 초당 호가 프레임 수")
+    parser.add_argument("--disconnect-after", type=float, default=0.0, help="웹소켓 강제 종료 주기 (초)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    config = SimConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, throttle_rate=args.throttle_rate,
+        max_rps=args.max_rps, tick_rate=args.tick_rate, hoga_rate=args.hoga_rate,
+        disconnect_after=args.disconnect_after, seed=args.seed
+    )
+    print(f"KIS simulator: http://{args.host}:{args.port}  ws://{args.host}:{args.port}/tryitout/H0STCNT0")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
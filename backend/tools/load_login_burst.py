@@ -0,0 +1,116 @@
+"""
+로그인 폭주 중 이벤트 루프 지연(틱 브로드캐스트 지연) 측정
+
+실시간 체결 브로드캐스트를 흉내 내는 주기 작업(기본 10ms 간격)을 돌리면서
+/auth/login 으로 동시 로그인 요청을 보내고, 주기 작업이 예정보다 얼마나 늦게 실행되는지 측정합니다.
+- async: 현재 구현 (bcrypt 검증을 스레드 풀에서 실행)
+- sync : 이전 구현 재현 (이벤트 루프에서 bcrypt 직접 실행)
+
+사용법 (backend 디렉터리에서):
+    python -m tools.load_login_burst --logins 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from tools._env import use_local_settings
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200, help="모드별 로그인 요청 수")
+    parser.add_argument("--concurrency", type=int, default=50, help="동시 로그인 요청 수")
+    parser.add_argument("--tick-interval", type=float, default=0.01, help="틱 주기 (초)")
+    parser.add_argument("--mode", choices=["both", "async", "sync"], default="both")
+    parser.add_argument("--database-url", default=None, help="기본: .env 또는 sqlite+aiosqlite:///./bench.db")
+    return parser.parse_args()
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] if ordered else 0.0
+
+async def ticker(interval, lags, stop):
+    """예정 시각 대비 실제 실행 시각의 지연을 기록"""
+    next_at = time.perf_counter() + interval
+    while not stop.is_set():
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+        lags.append(time.perf_counter() - next_at)
+        next_at += interval
+
+async def run_burst(client, username, password, logins, concurrency, interval):
+    lags, stop = [], asyncio.Event()
+    tick_task = asyncio.create_task(ticker(interval, lags, stop))
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses = {}
+
+    async def login():
+        async with semaphore:
+            res = await client.post("/auth/login", data={"username": username, "password": password})
+            statuses[res.status_code] = statuses.get(res.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await tick_task
+
+    return {
+        "logins_per_sec": logins / elapsed,
+        "statuses": statuses,
+        "lag_p50_ms": statistics.median(lags) * 1000 if lags else 0.0,
+        "lag_p99_ms": percentile(lags, 0.99) * 1000,
+        "lag_max_ms": max(lags) * 1000 if lags else 0.0,
+        "ticks": len(lags),
+    }
+
+async def main():
+    args = parse_args()
+    use_local_settings(DATABASE_URL=args.database_url)
+
+    import httpx
+    from fastapi import FastAPI
+
+    from app.database import Base, AsyncSessionLocal, engine
+    from app.models import user, social_account, refresh_token, user_stock, kis_token  # noqa: F401 (테이블 등록)
+    from app.models.user import User
+    from app.core.security import hashing
+    from app.routers.auth import user_general
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    username, password = f"burst_{int(time.time())}", "burst-password"
+    async with AsyncSessionLocal() as db:
+        db.add(User(name="burst", username=username, email=f"{username}@example.com",
+                    hashed_password=hashing.hash_password(password)))
+        await db.commit()
+
+    bench_app = FastAPI()
+    bench_app.include_router(user_general.router)
+
+    async def verify_on_loop(plain, hashed):
+        # 이전 구현: 이벤트 루프 스레드에서 bcrypt 실행
+        return hashing.verify_password(plain, hashed)
+
+    modes = ["sync", "async"] if args.mode == "both" else [args.mode]
+    original = user_general.verify_password_async
+    results = {}
+
+    transport = httpx.ASGITransport(app=bench_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for mode in modes:
+            user_general.verify_password_async = verify_on_loop if mode == "sync" else original
+            results[mode] = await run_burst(client, username, password, args.logins, args.concurrency, args.tick_interval)
+    user_general.verify_password_async = original
+
+    await engine.dispose()
+
+    print(f"\n로그인 {args.logins}건 (동시 {args.concurrency}), 틱 주기 {args.tick_interval * 1000:.0f}ms, "
+          f"bcrypt rounds={hashing.pwd_context.to_dict()['bcrypt__rounds']}")
+    print(f"{'mode':<7}{'login/s':>9}{'ticks':>7}{'lag p50':>10}{'lag p99':>10}{'lag max':>10}  status")
+    for mode, r in results.items():
+        print(f"{mode:<7}{r['logins_per_sec']:>9.1f}{r['ticks']:>7}{r['lag_p50_ms']:>8.2f}ms"
+              f"{r['lag_p99_ms']:>8.2f}ms{r['lag_max_ms']:>8.2f}ms  {r['statuses']}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
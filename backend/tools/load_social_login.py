@@ -0,0 +1,126 @@
+"""
+소셜 로그인 폭주 측정 (로컬 OAuth 스텁 대상)
+
+/auth/{kakao,google}/callback 을 동시에 호출해 로그인 처리량과 지연, 로그인당 제공자 호출/새 연결 수를 비교합니다.
+- shared   : 현재 구현 (제공자별 공유 클라이언트, 구글은 ID 토큰 로컬 검증으로 userinfo 생략)
+- per-login: 이전 구현 재현 (로그인마다 새 httpx 클라이언트, token + userinfo 순차 호출)
+스텁은 http 이므로 TLS 핸드셰이크 비용은 --latency-ms 로 대신 반영합니다.
+
+사용법 (backend 디렉터리에서):
+    python -m tools.oauth_stub --latency-ms 30 &
+    python -m tools.load_social_login --provider google --logins 300 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+
+from tools._env import use_local_settings
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider", choices=["kakao", "google"], default="google")
+    parser.add_argument("--logins", type=int, default=200, help="모드별 로그인 요청 수")
+    parser.add_argument("--concurrency", type=int, default=50, help="동시 로그인 요청 수")
+    parser.add_argument("--users", type=int, default=50, help="서로 다른 사용자 수 (인가 코드 종류)")
+    parser.add_argument("--mode", choices=["both", "shared", "per-login"], default="both")
+    parser.add_argument("--stub-url", default="http://127.0.0.1:9444", help="oauth_stub 주소")
+    parser.add_argument("--database-url", default=None, help="기본: .env 또는 sqlite+aiosqlite:///./bench.db")
+    return parser.parse_args()
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] if ordered else 0.0
+
+async def stub_stats(http, stub_url):
+    res = await http.get(f"{stub_url}/stub/stats")
+    return res.json()
+
+async def run_burst(client, provider, logins, concurrency, users):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], {}
+
+    async def login(i):
+        async with semaphore:
+            start = time.perf_counter()
+            res = await client.get(f"/auth/{provider}/callback", params={"code": f"user-{i % users}"})
+            latencies.append(time.perf_counter() - start)
+            # 성공 시 프론트엔드 /social/callback 으로 리다이렉트
+            outcome = "ok" if res.status_code == 307 and "/social/callback" in res.headers.get("location", "") else res.status_code
+            statuses[outcome] = statuses.get(outcome, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login(i) for i in range(logins)))
+    elapsed = time.perf_counter() - started
+    return {
+        "logins_per_sec": logins / elapsed,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "statuses": statuses,
+    }
+
+async def main():
+    args = parse_args()
+    use_local_settings(DATABASE_URL=args.database_url)
+
+    import httpx
+    from fastapi import FastAPI
+
+    from app.database import Base, engine
+    from app.models import user, social_account, refresh_token, user_stock, kis_token  # noqa: F401 (테이블 등록)
+    from app.routers.auth import user_social
+    from app.services.oauth import kakao_oauth, google_oauth, close_oauth_clients
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    oauth = kakao_oauth if args.provider == "kakao" else google_oauth
+    shared_fetch = oauth.fetch_profile
+
+    async def per_login_fetch(code):
+        # 이전 구현: 로그인마다 새 클라이언트로 token -> userinfo
+        meta = await oauth.metadata()  # 엔드포인트 주소만 사용 (캐시)
+        async with httpx.AsyncClient() as fresh:
+            res = await fresh.post(meta.get("token_endpoint", oauth.token_url), data={
+                "grant_type": "authorization_code", "client_id": oauth.client_id,
+                "client_secret": oauth.client_secret, "redirect_uri": oauth.redirect_uri, "code": code,
+            })
+            res.raise_for_status()
+            access_token = res.json()["access_token"]
+            res = await fresh.get(meta.get("userinfo_endpoint", oauth.userinfo_url),
+                                  headers={"Authorization": f"Bearer {access_token}"})
+            res.raise_for_status()
+            return res.json()
+
+    bench_app = FastAPI()
+    bench_app.include_router(user_social.router)
+
+    modes = ["per-login", "shared"] if args.mode == "both" else [args.mode]
+    results = {}
+    transport = httpx.ASGITransport(app=bench_app)
+    async with httpx.AsyncClient() as http, \
+            httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # 사용자 생성/discovery 조회는 측정에서 제외
+        await run_burst(client, args.provider, args.users, args.concurrency, args.users)
+        for mode in modes:
+            oauth.fetch_profile = per_login_fetch if mode == "per-login" else shared_fetch
+            before = await stub_stats(http, args.stub_url)
+            results[mode] = await run_burst(client, args.provider, args.logins, args.concurrency, args.users)
+            after = await stub_stats(http, args.stub_url)
+            calls = sum(v for k, v in after.items() if k.startswith(("GET /", "POST /")) and "/stub/" not in k) \
+                - sum(v for k, v in before.items() if k.startswith(("GET /", "POST /")) and "/stub/" not in k)
+            results[mode]["calls_per_login"] = calls / args.logins
+            # stats 조회 연결은 before 조회 때 이미 열려 재사용되므로 차이에 포함되지 않음
+            results[mode]["new_conns_per_login"] = (after.get("connections", 0) - before.get("connections", 0)) / args.logins
+    oauth.fetch_profile = shared_fetch
+
+    await close_oauth_clients()
+    await engine.dispose()
+
+    print(f"\n{args.provider} 로그인 {args.logins}건 (동시 {args.concurrency}, 사용자 {args.users}명)")
+    print(f"{'mode':<10}{'login/s':>9}{'p50':>10}{'p99':>10}{'calls':>7}{'conns':>7}  status")
+    for mode, r in results.items():
+        print(f"{mode:<10}{r['logins_per_sec']:>9.1f}{r['p50_ms']:>8.1f}ms{r['p99_ms']:>8.1f}ms"
+              f"{r['calls_per_login']:>7.2f}{r['new_conns_per_login']:>7.2f}  {r['statuses']}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
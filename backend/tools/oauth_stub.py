@@ -0,0 +1,172 @@
+"""
+로컬 소셜 로그인(OAuth) 스텁 서버 (카카오 + 구글)
+
+실 제공자 없이 소셜 로그인 콜백을 반복 테스트하기 위한 스텁입니다.
+- 카카오: /kakao/oauth/token, /kakao/v2/user/me
+- 구글(OpenID): /google/.well-known/openid-configuration, /google/authorize, /google/jwks, /google/token, /google/userinfo
+  /google/authorize 는 동의 화면 없이 redirect_uri 로 바로 인가 코드를 넘김
+  token 응답의 id_token 은 RS256 으로 서명 (aud=client_id, at_hash 포함)
+- 인가 코드는 아무 문자열이나 허용하고, 같은 코드는 같은 사용자로 응답
+- --rotate-every N: 토큰 N 개마다 서명 키 교체 (JWKS 재조회 경로 확인)
+- 경로별 요청 수와 새 TCP 연결 수는 GET /stub/stats 로 확인
+
+사용법 (backend 디렉터리에서):
+    python -m tools.oauth_stub --port 9444 --latency-ms 50
+
+앱은 아래 설정으로 실행합니다. (tools._env 의 기본값과 같습니다.)
+    KAKAO_AUTH_BASE_URL=http://127.0.0.1:9444/kakao
+    KAKAO_API_BASE_URL=http://127.0.0.1:9444/kakao
+    GOOGLE_DISCOVERY_URL=http://127.0.0.1:9444/google/.well-known/openid-configuration
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import time
+import uuid
+from collections import Counter
+from urllib.parse import urlencode
+
+import uvicorn
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import FastAPI, Form, Header, Request
+from fastapi.responses import JSONResponse, RedirectResponse
+from jose import jwk, jwt
+
+def _b64(value: int) -> str:
+    raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+class SigningKey:
+    """RS256 서명 키 + 공개 JWK"""
+    def __init__(self):
+        self.kid = uuid.uuid4().hex[:16]
+        private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        # PEM 을 매번 다시 읽으면 키 검증에 수십 ms 가 걸리므로 서명용 키 객체를 미리 생성
+        self.signer = jwk.construct(private.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        ), "RS256")
+        numbers = private.public_key().public_numbers()
+        self.jwk = {"kty": "RSA", "use": "sig", "alg": "RS256", "kid": self.kid, "n": _b64(numbers.n), "e": _b64(numbers.e)}
+
+def _user(code: str) -> tuple[str, str]:
+    """인가 코드 -> (사용자 ID, 표시 이름) (같은 코드면 같은 사용자)"""
+    digest = hashlib.sha256(code.encode()).hexdigest()
+    return str(int(digest[:12], 16)), f"stub-{digest[:6]}"
+
+def create_app(latency_ms: float, rotate_every: int) -> FastAPI:
+    app = FastAPI(title="OAuth Stub")
+    stats = Counter()
+    peers = set()
+    keys = [SigningKey()]   # 현재 키 + 직전 키 (교체 직후 이전 토큰도 검증되도록)
+    access_tokens = {}      # access_token -> 인가 코드
+
+    @app.middleware("http")
+    async def count(request: Request, call_next):
+        stats[f"{request.method} {request.url.path}"] += 1
+        peer = request.scope.get("client")
+        if peer and tuple(peer) not in peers:
+            peers.add(tuple(peer))
+            stats["connections"] += 1
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        return await call_next(request)
+
+    def issue(code: str) -> str:
+        token = uuid.uuid4().hex
+        access_tokens[token] = code
+        return token
+
+    # ----- 카카오 -----
+    @app.post("/kakao/oauth/token")
+    async def kakao_token(code: str = Form(...)):
+        return {"token_type": "bearer", "access_token": issue(code), "expires_in": 21599}
+
+    @app.get("/kakao/v2/user/me")
+    async def kakao_me(authorization: str = Header("")):
+        code = access_tokens.get(authorization.removeprefix("Bearer "))
+        if code is None:
+            return JSONResponse(status_code=401, content={"msg": "this access token does not exist", "code": -401})
+        user_id, name = _user(code)
+        return {
+            "id": int(user_id),
+            "kakao_account": {"email": f"{name}@kakao.stub", "name": name, "phone_number": "+82 10-0000-0000"},
+        }
+
+    # ----- 구글 (OpenID Connect) -----
+    @app.get("/google/.well-known/openid-configuration")
+    async def google_discovery(request: Request):
+        base = str(request.base_url).rstrip("/") + "/google"
+        return {
+            "issuer": base,
+            "authorization_endpoint": f"{base}/authorize",
+            "token_endpoint": f"{base}/token",
+            "userinfo_endpoint": f"{base}/userinfo",
+            "jwks_uri": f"{base}/jwks",
+            "id_token_signing_alg_values_supported": ["RS256"],
+        }
+
+    @app.get("/google/authorize")
+    async def google_authorize(redirect_uri: str, state: str | None = None):
+        params = {"code": uuid.uuid4().hex}
+        if state:
+            params["state"] = state
+        return RedirectResponse(f"{redirect_uri}?{urlencode(params)}")
+
+    @app.get("/google/jwks")
+    async def google_jwks():
+        return {"keys": [key.jwk for key in keys]}
+
+    @app.post("/google/token")
+    async def google_token(request: Request, code: str = Form(...), client_id: str = Form(...)):
+        stats["id_tokens"] += 1
+        if rotate_every and stats["id_tokens"] % rotate_every == 0:
+            keys.insert(0, SigningKey())
+            del keys[2:]
+            stats["key_rotations"] += 1
+        access_token = issue(code)
+        user_id, name = _user(code)
+        now = int(time.time())
+        claims = {
+            "iss": str(request.base_url).rstrip("/") + "/google",
+            "aud": client_id,
+            "sub": user_id,
+            "email": f"{name}@gmail.stub",
+            "email_verified": True,
+            "name": name,
+            "iat": now,
+            "exp": now + 3600,
+        }
+        id_token = jwt.encode(claims, keys[0].signer, algorithm="RS256",
+                              headers={"kid": keys[0].kid}, access_token=access_token)
+        return {"access_token": access_token, "id_token": id_token, "token_type": "Bearer", "expires_in": 3599}
+
+    @app.get("/google/userinfo")
+    async def google_userinfo(authorization: str = Header("")):
+        code = access_tokens.get(authorization.removeprefix("Bearer "))
+        if code is None:
+            return JSONResponse(status_code=401, content={"error": "invalid_token"})
+        user_id, name = _user(code)
+        return {"sub": user_id, "email": f"{name}@gmail.stub", "name": name}
+
+    @app.get("/stub/stats")
+    async def stub_stats():
+        return dict(stats)
+
+    return app
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9444)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="모든 응답에 추가할 지연")
+    parser.add_argument("--rotate-every", type=int, default=0, help="구글 토큰 N 개마다 서명 키 교체 (0 이면 교체 안 함)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    uvicorn.run(create_app(args.latency_ms, args.rotate_every), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
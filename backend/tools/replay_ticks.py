@@ -0,0 +1,144 @@
+"""
+KIS 실시간 프레임 재생 (캡처 파일 -> 파싱 -> 구독자 전송 경로)
+
+TICK_CAPTURE_PATH 로 기록한 파일을 KISWebSocketManager.handle_frame 에 그대로 다시 넣습니다.
+파일에 등장하는 종목마다 가짜 구독자(--subscribers 명)를 붙여 fan-out 까지 실행하고,
+재생 일정 대비 처리 지연과 처리량을 출력합니다. (예: 09:00 장 시작 구간 재현, 파서 회귀 확인)
+
+사용법 (backend 디렉터리에서):
+    python -m tools.replay_ticks ticks/20250102.tsv.gz --speed 10 --subscribers 50
+    python -m tools.replay_ticks ticks/20250102.tsv.gz --speed 0 --start 085950 --duration 120
+    python -m tools.replay_ticks ticks/20250102*.tsv.gz   (재시작으로 나뉜 파일은 시각 순으로 합쳐 재생)
+    (--speed 0: 대기 없이 최대 속도)
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime
+
+from tools._env import use_local_settings
+
+HOGA_TR_IDS = ("H0STASP0", "HDFSASP0")  # 나머지는 체결 TR
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="캡처 파일 (.tsv / .tsv.gz, 여러 개 가능)")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 배속 (1, 10, ... / 0 이면 최대 속도)")
+    parser.add_argument("--subscribers", type=int, default=10, help="종목별 가짜 구독자 수 (체결/호가 각각)")
+    parser.add_argument("--send-delay-ms", type=float, default=0.0, help="가짜 구독자 send_text 지연 (느린 클라이언트 재현)")
+    parser.add_argument("--start", default=None, help="재생 시작 시각 HHMMSS (KST, 기본: 파일 처음)")
+    parser.add_argument("--duration", type=float, default=0.0, help="재생할 캡처 구간 길이 (초, 0 이면 끝까지)")
+    return parser.parse_args()
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] if ordered else 0.0
+
+class FakeClient:
+    """브라우저 웹소켓 대역 (전송 건수/바이트만 기록)"""
+    def __init__(self, index: int, delay: float):
+        self.index = index
+        self.delay = delay
+        self.messages = 0
+        self.bytes = 0
+
+    async def send_text(self, text: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.messages += 1
+        self.bytes += len(text)
+
+def frame_code(frame: str):
+    """프레임 -> (TR ID, 종목코드)"""
+    parts = frame.split("|", 3)
+    if len(parts) <= 3:
+        return None, None
+    fields = parts[3].split("^", 2)
+    if parts[1] == "HDFSASP0":
+        return parts[1], fields[1] if len(fields) > 1 and fields[1] else fields[0]
+    return parts[1], fields[0]
+
+def select_frames(paths, start, duration):
+    """재생 구간 프레임 목록 [(수신 시각, 프레임)] (여러 파일은 수신 시각 순으로 합침)"""
+    from app.services.tick_capture import read_capture
+    from app.services.market_calendar import KST
+
+    captured = sorted((item for path in paths for item in read_capture(path)), key=lambda item: item[0])
+    frames = []
+    begin = None
+    for ts, frame in captured:
+        if start and datetime.fromtimestamp(ts, KST).strftime("%H%M%S") < start:
+            continue
+        if begin is None:
+            begin = ts
+        if duration and ts - begin > duration:
+            break
+        frames.append((ts, frame))
+    return frames
+
+async def replay(frames, speed, subscribers, send_delay):
+    from app.services.kis_ws import kis_ws_manager
+
+    clients = [FakeClient(i, send_delay) for i in range(subscribers)]
+    tr_counts = Counter()
+    for _, frame in frames:
+        tr_id, code = frame_code(frame)
+        if not code:
+            continue
+        tr_counts[tr_id] += 1
+        pool = kis_ws_manager.hoga_subscriptions if tr_id in HOGA_TR_IDS else kis_ws_manager.subscriptions
+        if code not in pool:
+            pool[code] = set(clients)
+
+    lags, handle_times = [], []
+    first_ts = frames[0][0]
+    started = time.perf_counter()
+    for ts, frame in frames:
+        if speed > 0:
+            due = started + (ts - first_ts) / speed
+            wait = due - time.perf_counter()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            lags.append(max(time.perf_counter() - due, 0.0))
+        t0 = time.perf_counter()
+        await kis_ws_manager.handle_frame(frame, t0)
+        handle_times.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    # 캡처 기준 초당 최대 프레임 수 (장 시작 폭주 구간 규모)
+    per_second = Counter(int(ts) for ts, _ in frames)
+    return {
+        "frames": len(frames),
+        "by_tr_id": dict(tr_counts),
+        "codes": len(kis_ws_manager.subscriptions) + len(kis_ws_manager.hoga_subscriptions),
+        "capture_seconds": frames[-1][0] - first_ts,
+        "capture_peak_fps": max(per_second.values()),
+        "replay_seconds": elapsed,
+        "frames_per_sec": len(frames) / elapsed if elapsed else 0.0,
+        "handle_p50_ms": percentile(handle_times, 0.5) * 1000,
+        "handle_p99_ms": percentile(handle_times, 0.99) * 1000,
+        "handle_max_ms": max(handle_times) * 1000,
+        "schedule_lag_p99_ms": percentile(lags, 0.99) * 1000,
+        "schedule_lag_max_ms": max(lags, default=0.0) * 1000,
+        "messages_sent": sum(c.messages for c in clients),
+        "bytes_sent": sum(c.bytes for c in clients),
+    }
+
+def main():
+    args = parse_args()
+    use_local_settings()
+
+    frames = select_frames(args.paths, args.start, args.duration)
+    if not frames:
+        print("재생할 프레임이 없습니다.")
+        return
+
+    result = asyncio.run(replay(frames, args.speed, args.subscribers, args.send_delay_ms / 1000))
+    speed = f"{args.speed:g}x" if args.speed > 0 else "max"
+    print(f"[replay {speed}] {' '.join(args.paths)}")
+    for key, value in result.items():
+        print(f"  {key:<22} {value:.3f}" if isinstance(value, float) else f"  {key:<22} {value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+실시간 웹소켓 fan-out 부하 테스트
+
+/realtime/stocks/{code} 와 /realtime/rankings 에 asyncio 웹소켓 클라이언트를 대량으로 붙여
+한 워커가 감당하는 동시 접속 수를 측정합니다.
+- 종목 분포: 인기 종목 Zipf 분포 (--zipf-s 가 클수록 상위 종목 집중)
+- 느린 클라이언트: --slow-fraction 비율의 클라이언트가 수신마다 --slow-delay-ms 만큼 지연
+  (수신 큐 1개 + 작은 소켓 수신 버퍼(--slow-rcvbuf)로 지연이 TCP 를 통해 서버 송신까지 전달됨)
+- 결과: 초당 수신 체결 수, 체결 지연 p50/p99/p999, 연결당 서버 메모리, 끊긴 클라이언트 수
+
+체결 지연은 서버가 KIS 프레임을 받은 시각("ts")부터 클라이언트 수신까지입니다.
+서버는 시뮬레이터(tools.kis_simulator)를 upstream 으로, TICK_TRACE_TIMESTAMPS=true 로 실행합니다.
+
+사용법 (backend 디렉터리에서):
+    python -m tools.kis_simulator --tick-rate 20 &
+    TICK_TRACE_TIMESTAMPS=true uvicorn app.main:app --port 8000 &
+    python -m tools.ws_loadtest --clients 2000 --ranking-clients 200 --slow-fraction 0.05 --server-pid <uvicorn pid>
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import resource
+import socket
+import time
+from urllib.parse import urlsplit
+
+import httpx
+import websockets
+
+from tools.kis_simulator import DOMESTIC_STOCKS, OVERSEAS_STOCKS
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="ws://127.0.0.1:8000", help="서버 웹소켓 주소")
+    parser.add_argument("--clients", type=int, default=1000, help="종목 체결 웹소켓 클라이언트 수")
+    parser.add_argument("--ranking-clients", type=int, default=0, help="순위 웹소켓 클라이언트 수")
+    parser.add_argument("--codes", default=None, help="종목코드 목록 (쉼표 구분, 인기순 / 기본: 시뮬레이터 종목)")
+    parser.add_argument("--zipf-s", type=float, default=1.1, help="Zipf 지수")
+    parser.add_argument("--slow-fraction", type=float, default=0.0, help="느린 클라이언트 비율 (0~1)")
+    parser.add_argument("--slow-delay-ms", type=float, default=200.0, help="느린 클라이언트의 메시지당 처리 지연")
+    parser.add_argument("--slow-rcvbuf", type=int, default=4096, help="느린 클라이언트 소켓 수신 버퍼 (바이트)")
+    parser.add_argument("--connect-rate", type=float, default=200.0, help="초당 신규 연결 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="전체 연결 후 측정 시간 (초)")
+    parser.add_argument("--server-pid", type=int, default=None, help="서버 프로세스 PID (연결당 메모리 측정, Linux)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] if ordered else 0.0
+
+def zipf_picker(codes, s, rng):
+    weights = [1 / (rank ** s) for rank in range(1, len(codes) + 1)]
+    return lambda: rng.choices(codes, weights)[0]
+
+def rss_bytes(pid):
+    """/proc/<pid>/status 의 VmRSS (없으면 None)"""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+async def scrape_counter(http_url, name):
+    """서버 /metrics 의 카운터 합계 (라벨 무관)"""
+    try:
+        async with httpx.AsyncClient() as client:
+            res = await client.get(f"{http_url}/metrics", timeout=5)
+    except httpx.HTTPError:
+        return None
+    pattern = re.compile(rf"^{name}(?:{{[^}}]*}})? ([0-9.eE+-]+)$", re.M)
+    return sum(float(v) for v in pattern.findall(res.text))
+
+def raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+class Stats:
+    def __init__(self):
+        self.connected = 0
+        self.failed = 0
+        self.closed_by_server = 0
+        self.ticks = 0
+        self.ranking_messages = 0
+        self.latencies = {"fast": [], "slow": []}
+        self.missing_ts = 0
+        self.measuring = False
+
+async def open_small_socket(url, rcvbuf):
+    """수신 버퍼를 줄인 TCP 소켓 (연결 전에 설정해야 광고 윈도우에 반영됨)"""
+    parts = urlsplit(url)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+    sock.setblocking(False)
+    try:
+        await asyncio.get_running_loop().sock_connect(sock, (parts.hostname, parts.port or 80))
+    except Exception:
+        sock.close()
+        raise
+    return sock
+
+async def stock_client(url, code, slow_delay, slow_rcvbuf, stats, stop):
+    kind = "slow" if slow_delay else "fast"
+    uri = f"{url}/realtime/stocks/{code}"
+    try:
+        if slow_delay:
+            # 클라이언트에 쌓아두지 않도록 수신 큐 1개 + 작은 수신 버퍼 -> 서버 송신이 막힘
+            # (읽기가 밀린 동안 pong 을 제때 못 받으므로 클라이언트 ping 은 끔)
+            sock = await open_small_socket(url, slow_rcvbuf)
+            ws = await websockets.connect(uri, sock=sock, max_queue=1, ping_interval=None)
+        else:
+            ws = await websockets.connect(uri, max_queue=None)
+    except Exception:
+        stats.failed += 1
+        return
+    stats.connected += 1
+    try:
+        while not stop.is_set():
+            try:
+                raw = await asyncio.wait_for(ws.recv(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+            if slow_delay:
+                await asyncio.sleep(slow_delay)
+            if not stats.measuring:
+                continue
+            data = json.loads(raw)
+            # 접속 직후 REST 스냅샷("name" 포함)은 실시간 체결이 아니므로 제외
+            if data.get("type") != "trade" or "name" in data:
+                continue
+            stats.ticks += 1
+            ts = data.get("ts")
+            if ts:
+                stats.latencies[kind].append(time.time() * 1000 - ts)
+            else:
+                stats.missing_ts += 1
+    except websockets.ConnectionClosed:
+        stats.closed_by_server += 1
+    finally:
+        await ws.close()
+
+async def ranking_client(url, stats, stop):
+    try:
+        ws = await websockets.connect(f"{url}/realtime/rankings?rank_type=volume&market_type=ALL&protocol=delta")
+    except Exception:
+        stats.failed += 1
+        return
+    stats.connected += 1
+    try:
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(ws.recv(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+            if stats.measuring:
+                stats.ranking_messages += 1
+    except websockets.ConnectionClosed:
+        stats.closed_by_server += 1
+    finally:
+        await ws.close()
+
+async def run(args):
+    rng = random.Random(args.seed)
+    codes = args.codes.split(",") if args.codes else list(DOMESTIC_STOCKS) + list(OVERSEAS_STOCKS)
+    pick = zipf_picker(codes, args.zipf_s, rng)
+    http_url = args.url.replace("ws://", "http://").replace("wss://", "https://")
+
+    stats, stop = Stats(), asyncio.Event()
+    rss_before = rss_bytes(args.server_pid)
+    dropped_before = await scrape_counter(http_url, "ws_dropped_clients_total")
+
+    # 1. 연결 (--connect-rate 속도로)
+    tasks = []
+    total = args.clients + args.ranking_clients
+    for i in range(total):
+        if i < args.clients:
+            slow = args.slow_delay_ms / 1000 if rng.random() < args.slow_fraction else 0.0
+            tasks.append(asyncio.create_task(stock_client(args.url, pick(), slow, args.slow_rcvbuf, stats, stop)))
+        else:
+            tasks.append(asyncio.create_task(ranking_client(args.url, stats, stop)))
+        await asyncio.sleep(1 / args.connect_rate)
+    while stats.connected + stats.failed < total:
+        await asyncio.sleep(0.1)
+
+    # 2. 측정
+    await asyncio.sleep(2)  # 연결 직후 스냅샷 전송 구간 제외
+    rss_after = rss_bytes(args.server_pid)
+    stats.measuring = True
+    started = time.perf_counter()
+    await asyncio.sleep(args.duration)
+    stats.measuring = False
+    elapsed = time.perf_counter() - started
+
+    dropped_after = await scrape_counter(http_url, "ws_dropped_clients_total")
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    result = {
+        "connected": stats.connected,
+        "connect_failed": stats.failed,
+        "closed_by_server": stats.closed_by_server,
+        "ticks_per_sec": stats.ticks / elapsed,
+        "ranking_msgs_per_sec": stats.ranking_messages / elapsed,
+    }
+    for kind, values in stats.latencies.items():
+        if values:
+            result[f"{kind}_latency_p50_ms"] = percentile(values, 0.5)
+            result[f"{kind}_latency_p99_ms"] = percentile(values, 0.99)
+            result[f"{kind}_latency_p999_ms"] = percentile(values, 0.999)
+    if stats.missing_ts:
+        result["ticks_without_ts"] = stats.missing_ts
+    if rss_before is not None and rss_after is not None and stats.connected:
+        result["server_rss_mb"] = rss_after / 1024 / 1024
+        result["server_kb_per_conn"] = (rss_after - rss_before) / stats.connected / 1024
+    if dropped_before is not None and dropped_after is not None:
+        result["server_dropped_clients"] = int(dropped_after - dropped_before)
+    return result
+
+def main():
+    args = parse_args()
+    raise_fd_limit()
+    result = asyncio.run(run(args))
+
+    print(f"[ws loadtest] clients={args.clients} ranking={args.ranking_clients} slow={args.slow_fraction} zipf={args.zipf_s}")
+    for key, value in result.items():
+        print(f"  {key:<24} {value:.3f}" if isinstance(value, float) else f"  {key:<24} {value}")
+    if result.get("ticks_without_ts"):
+        print("  ⚠️ 'ts' 없는 체결 수신: 서버를 TICK_TRACE_TIMESTAMPS=true 로 실행해야 지연이 측정됩니다.")
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,23 @@ import axios from '../lib/axios';
 
 import "../styles/Home.css";
 
+// 랭킹 delta 메시지를 이전 목록에 적용 (종목코드 기준)
+const applyRankingDelta = (list, delta) => {
+    const removed = new Set(delta.removed || []);
+    const moved = new Map(delta.moved || []);
+    const changed = new Map((delta.changed || []).map((item) => [item.code, item]));
+
+    const ranked = [];
+    list.forEach((item, index) => {
+        if (removed.has(item.code)) return;
+        const next = changed.has(item.code) ? { ...item, ...changed.get(item.code) } : item;
+        ranked.push([moved.has(item.code) ? moved.get(item.code) : index, next]);
+    });
+    (delta.added || []).forEach(([rank, item]) => ranked.push([rank, item]));
+
+    return ranked.sort((a, b) => a[0] - b[0]).map(([, item]) => item);
+};
+
 function Home() {
     const navigate = useNavigate();
     const { user } = useAuth();
@@ -101,9 +118,10 @@ function Home() {
         }
 
         // 웹소켓 연결 URL 생성 (쿼리 파라미터로 옵션 전달)
-        const wsUrl = `ws://localhost:8000/realtime/rankings?rank_type=${rankType}&market_type=${marketType}`;
+        const wsUrl = `ws://localhost:8000/realtime/rankings?rank_type=${rankType}&market_type=${marketType}&protocol=delta`;
         const ws = new WebSocket(wsUrl);
         wsRef.current = ws;
+        let version = null;
 
         ws.onopen = () => {
             console.log(`📡 랭킹 소켓 연결됨: ${marketType} - ${rankType}`);
@@ -115,6 +133,17 @@ function Home() {
                 // 데이터가 배열 형태로 정상적으로 오면 State 업데이트
                 if (Array.isArray(data)) {
                     setStockList(data);
+                } else if (data.type === 'snapshot') {
+                    version = data.version;
+                    setStockList(data.items);
+                } else if (data.type === 'delta') {
+                    // 기준 버전이 다르면 전체 스냅샷 재요청
+                    if (data.base !== version) {
+                        ws.send('snapshot');
+                        return;
+                    }
+                    version = data.version;
+                    setStockList((prev) => applyRankingDelta(prev, data));
                 }
             } catch (e) {
                 console.error("WS 데이터 파싱 에러", e);